@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+run-benchmarks.py - Performance benchmarks for the test tooling in tests/scripts
+
+Generates synthetic result JSON files, scenario YAMLs, transcripts and doc-fetch
+tracking files at a configurable scale, times the scripts against them and compares
+the timings with the committed baselines in baselines.json.
+
+Usage:
+    # Generate a synthetic data set only
+    python run-benchmarks.py generate --scale medium --output /tmp/bench-data
+
+    # Run the benchmarks and fail on regressions against baselines.json
+    python run-benchmarks.py run --scale small
+
+    # Record new baselines for this machine
+    python run-benchmarks.py run --scale small --update-baseline
+"""
+
+import argparse
+import json
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Any
+
+import yaml
+
+# ANSI color codes
+RED = '\033[0;31m'
+GREEN = '\033[0;32m'
+YELLOW = '\033[1;33m'
+BLUE = '\033[0;34m'
+NC = '\033[0m'
+
+BENCHMARKS_DIR = Path(__file__).parent
+TESTS_DIR = BENCHMARKS_DIR.parent
+SCRIPTS_DIR = TESTS_DIR / 'scripts'
+BASELINES_FILE = BENCHMARKS_DIR / 'baselines.json'
+
+# results: result files per model; file_kb: size of each captured workflow file;
+# transcript_mb: size of the shared agent-output.txt; doc_fetches: tracked fetches
+SCALES = {
+    'small': {'models': 2, 'results': 30, 'file_kb': 16, 'transcript_mb': 1, 'doc_fetches': 200},
+    'medium': {'models': 3, 'results': 300, 'file_kb': 256, 'transcript_mb': 10, 'doc_fetches': 2000},
+    'large': {'models': 4, 'results': 1000, 'file_kb': 1024, 'transcript_mb': 100, 'doc_fetches': 20000},
+}
+
+LANGUAGES = {
+    'maven': ('scanner-maven', 'mvn -B verify org.sonarsource.scanner.maven:sonar-maven-plugin:sonar'),
+    'gradle': ('scanner-gradle', './gradlew build sonar'),
+    'dotnet': ('scanner-dotnet', 'dotnet sonarscanner begin /k:bench && dotnet build && dotnet sonarscanner end'),
+    'javascript': ('scanner-cli', 'uses: sonarsource/sonarqube-scan-action@v3'),
+    'python': ('scanner-cli', 'uses: sonarsource/sonarqube-scan-action@v3'),
+}
+
+PLATFORMS = {
+    'github-actions': ('.github/workflows/sonarqube.yml', 'github.com/actions/checkout'),
+    'gitlab-ci': ('.gitlab-ci.yml', 'docs.gitlab.com/ee/ci/yaml'),
+    'azure-devops': ('azure-pipelines.yml', 'learn.microsoft.com/azure/devops/pipelines'),
+    'bitbucket': ('bitbucket-pipelines.yml', 'support.atlassian.com/bitbucket-cloud/docs/pipelines'),
+}
+
+WORKFLOW_TEMPLATE = """name: SonarQube
+on:
+  push:
+    branches: [main, master, 'develop/*', 'feature/*']
+jobs:
+  sonarqube:
+    steps:
+      - uses: actions/checkout@v4
+        with:
+          fetch-depth: 0
+      - uses: actions/setup-java@v4
+      - run: {command}
+        env:
+          SONAR_TOKEN: ${{{{ secrets.SONAR_TOKEN }}}}
+          SONAR_HOST_URL: https://sonarcloud.io
+"""
+
+
+def _padded(text: str, size_bytes: int, filler: str) -> str:
+    """Pad text with comment lines up to roughly size_bytes"""
+    if len(text) >= size_bytes:
+        return text
+    line = f"# {filler}\n"
+    return text + line * ((size_bytes - len(text)) // len(line) + 1)
+
+
+def write_scenarios(data_dir: Path) -> List[Dict[str, str]]:
+    """Write one synthetic scenario per language x platform and return their descriptors"""
+    scenarios = []
+    for language, (scanner_skill, command) in LANGUAGES.items():
+        for platform, (pipeline_file, _) in PLATFORMS.items():
+            name = f"{platform}-cloud"
+            scenario = {
+                'name': f"{language}-{name}",
+                'description': f"Synthetic {language} project on {platform} targeting SonarQube Cloud",
+                'category': 'benchmark',
+                'language': language,
+                'platform': platform,
+                'sonarqube': 'cloud-us',
+                'input': {
+                    'user_responses': [
+                        {'question': 'SonarQube information', 'answer': f"Cloud, bench-{language}, bench-org, US"}
+                    ]
+                },
+                'expected': {
+                    'skills_invoked': ['project-detection', f"platform-{platform}", scanner_skill,
+                                       'pipeline-creation', 'security-practices', 'devops-setup-instructions'],
+                    'documentation_fetches': {'min_fetches': 2, 'max_fetches': 10},
+                    'files_created': [{
+                        'path': pipeline_file,
+                        'must_contain': ['fetch-depth: 0', 'SONAR_TOKEN', 'sonar', 'feature/'],
+                        'must_not_contain': ['squ_', 'sqp_', 'actions/checkout@v3']
+                    }]
+                }
+            }
+            scenario_file = data_dir / 'scenarios' / language / f"{name}.yaml"
+            scenario_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(scenario_file, 'w') as f:
+                yaml.safe_dump(scenario, f, sort_keys=False)
+            scenarios.append({'language': language, 'platform': platform, 'name': name})
+    return scenarios
+
+
+def write_transcript(path: Path, size_mb: int):
+    """Write a synthetic verbose agent transcript of roughly size_mb megabytes"""
+    header = (
+        "🔧 Using skill: project-detection\n"
+        "Which SonarQube instance do you use?\nWhat is your project key?\n"
+        "## Platform Output Contract\n## Scanner Output Contract\n"
+    )
+    block = "".join(f"[tool] read file src/module_{i}.py ({i * 17} bytes)\n" for i in range(200))
+    target = size_mb * 1024 * 1024
+    with open(path, 'w') as f:
+        f.write(header)
+        written = len(header)
+        while written < target:
+            f.write(block)
+            written += len(block)
+
+
+def write_results(data_dir: Path, scenarios: List[Dict[str, str]], scale: Dict[str, int], rng: random.Random):
+    """Write synthetic result JSON files for every model"""
+    transcript = data_dir / 'agent-output.txt'
+    write_transcript(transcript, scale['transcript_mb'])
+
+    for m in range(scale['models']):
+        model = f"bench-model-{m + 1}"
+        model_dir = data_dir / 'results' / model
+        model_dir.mkdir(parents=True, exist_ok=True)
+        for i in range(scale['results']):
+            scenario = scenarios[i % len(scenarios)]
+            language, platform = scenario['language'], scenario['platform']
+            scanner_skill, command = LANGUAGES[language]
+            pipeline_file, platform_doc = PLATFORMS[platform]
+            workflow = _padded(WORKFLOW_TEMPLATE.format(command=command), scale['file_kb'] * 1024,
+                               f"generated step notes for {language} on {platform}")
+            pages = [
+                {'url': f"https://docs.sonarsource.com/sonarqube-cloud/advanced-setup/ci-based-analysis/{scanner_skill}.md"},
+                {'url': f"https://{platform_doc}"},
+            ] + [{'url': f"https://docs.sonarsource.com/page-{rng.randint(1, 40)}.md"} for _ in range(rng.randint(0, 6))]
+            duration = rng.randint(60, 900)
+            result = {
+                'scenario': scenario['name'],
+                'language': language,
+                'model': model,
+                'platform': platform,
+                'sonarqube_type': 'cloud-us',
+                'timestamp': f"2026-{(i % 12) + 1:02d}-{(i % 28) + 1:02d}_02-{i % 60:02d}-00",
+                'status': rng.choice(['success', 'success', 'success', 'failed']),
+                'execution': {
+                    'duration_seconds': duration,
+                    'workspace': str(data_dir / 'results' / model),
+                    'agent_output': str(transcript),
+                    'total_tokens': rng.randint(20000, 200000),
+                    'cost': round(rng.uniform(0.05, 2.5), 4)
+                },
+                'files_created': [
+                    {'path': pipeline_file, 'content': workflow},
+                    {'path': 'sonar-project.properties', 'content': f"sonar.projectKey=bench-{language}\nsonar.sources=.\n"}
+                ],
+                'skills_invoked': ['project-detection', f"platform-{platform}", scanner_skill,
+                                   'pipeline-creation', 'devops-setup-instructions'],
+                'documentation_fetches': {
+                    'total_count': len(pages),
+                    'pages': pages,
+                    'domains': sorted({p['url'].split('/')[2] for p in pages})
+                },
+                'scores': {'total': 0, 'accuracy': 0, 'security': 0, 'efficiency': 0, 'currency': 0, 'usability': 0},
+                'checkpoints': []
+            }
+            with open(model_dir / f"{language}-{scenario['name']}-{i:05d}.json", 'w') as f:
+                json.dump(result, f, indent=2)
+
+
+def write_doc_fetches(data_dir: Path, count: int, rng: random.Random):
+    """Write a track-doc-fetch.py tracking file with count fetches"""
+    fetches = [{
+        'url': f"https://docs.sonarsource.com/page-{rng.randint(1, 500)}.md",
+        'title': f"Page {i}",
+        'timestamp': '2026-10-01T02:00:00Z',
+        'fetch_duration_ms': rng.randint(50, 2000)
+    } for i in range(count)]
+    with open(data_dir / 'doc-fetches.json', 'w') as f:
+        json.dump({'fetches': fetches}, f, indent=2)
+
+
+def generate(data_dir: Path, scale_name: str, seed: int = 42):
+    """Generate a complete synthetic data set"""
+    scale = SCALES[scale_name]
+    rng = random.Random(seed)
+    if data_dir.exists():
+        shutil.rmtree(data_dir)
+    data_dir.mkdir(parents=True)
+
+    shutil.copytree(TESTS_DIR / 'assertions', data_dir / 'assertions')
+    scenarios = write_scenarios(data_dir)
+    write_results(data_dir, scenarios, scale, rng)
+    write_doc_fetches(data_dir, scale['doc_fetches'], rng)
+    print(f"{GREEN}✓{NC} Generated {scale_name} data set in {data_dir} "
+          f"({scale['models'] * scale['results']} results, {scale['transcript_mb']} MB transcript)")
+
+
+def benchmark_commands(data_dir: Path) -> Dict[str, List[str]]:
+    """Commands to time, in execution order"""
+    python = sys.executable
+    models = sorted(p.name for p in (data_dir / 'results').iterdir())
+    first_result = sorted((data_dir / 'results' / models[0]).glob('*.json'))[0]
+    with open(first_result, 'r') as f:
+        first = json.load(f)
+    scenario_file = data_dir / 'scenarios' / first['language'] / f"{first['scenario']}.yaml"
+    out_dir = data_dir / 'out'
+    out_dir.mkdir(exist_ok=True)
+
+    return {
+        'validate-result (single)': [
+            python, str(SCRIPTS_DIR / 'validate-result.py'), '--no-cache',
+            '--scenario', str(scenario_file), '--result', str(first_result),
+            '--assertions-dir', str(data_dir / 'assertions')
+        ],
+        'validate-result (batch)': [
+            python, str(SCRIPTS_DIR / 'validate-result.py'), '--no-cache',
+            '--batch', str(data_dir / 'results'),
+            '--scenarios-dir', str(data_dir / 'scenarios'), '--assertions-dir', str(data_dir / 'assertions')
+        ],
+        'generate-summary': [
+            python, str(SCRIPTS_DIR / 'generate-summary.py'), '--model', models[0],
+            '--results-dir', str(data_dir / 'results' / models[0]), '--output', str(out_dir / 'summary.md')
+        ],
+        'compare-models': [
+            python, str(SCRIPTS_DIR / 'compare-models.py'), '--models', ','.join(models),
+            '--results-dir', str(data_dir / 'results'), '--output', str(out_dir / 'comparison.md')
+        ],
+        'track-doc-fetch (export)': [
+            python, str(SCRIPTS_DIR / 'track-doc-fetch.py'), 'export',
+            '--file', str(data_dir / 'doc-fetches.json'), '--output', str(out_dir / 'doc-summary.json')
+        ],
+    }
+
+
+def time_command(command: List[str], repeat: int) -> float:
+    """Best wall time of repeat runs, in seconds"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        completed = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        elapsed = time.perf_counter() - start
+        if completed.returncode != 0:
+            raise RuntimeError(f"{' '.join(command)} failed:\n{completed.stderr}")
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def load_baselines() -> Dict[str, Any]:
+    """Load committed baselines"""
+    if not BASELINES_FILE.exists():
+        return {}
+    with open(BASELINES_FILE, 'r') as f:
+        return json.load(f)
+
+
+def run(scale_name: str, data_dir: Path, repeat: int, tolerance: float, slack: float, update_baseline: bool) -> int:
+    """Time every benchmark and compare against the baselines"""
+    if not (data_dir / 'results').exists():
+        generate(data_dir, scale_name)
+
+    baselines = load_baselines()
+    scale_baselines = baselines.get(scale_name, {})
+    timings = {}
+    regressions = []
+
+    print(f"\n{BLUE}Benchmarks ({scale_name}, best of {repeat}){NC}\n")
+    print(f"{'Benchmark':<28} {'Time':>9} {'Baseline':>9} {'Ratio':>7}")
+    print("-" * 56)
+    for name, command in benchmark_commands(data_dir).items():
+        elapsed = time_command(command, repeat)
+        timings[name] = round(elapsed, 3)
+        baseline = scale_baselines.get(name)
+        if baseline is None:
+            print(f"{name:<28} {elapsed:>8.3f}s {'-':>9} {'-':>7}")
+            continue
+        ratio = elapsed / baseline if baseline > 0 else 0
+        # Regression only if slower by the relative tolerance and by more than the absolute slack
+        regressed = elapsed > baseline * tolerance and elapsed - baseline > slack
+        color = RED if regressed else GREEN
+        print(f"{name:<28} {elapsed:>8.3f}s {baseline:>8.3f}s {color}{ratio:>6.2f}x{NC}")
+        if regressed:
+            regressions.append(name)
+    print("")
+
+    if update_baseline:
+        baselines[scale_name] = timings
+        with open(BASELINES_FILE, 'w') as f:
+            json.dump(baselines, f, indent=2)
+            f.write('\n')
+        print(f"{GREEN}✓{NC} Baselines updated: {BASELINES_FILE}\n")
+        return 0
+
+    if regressions:
+        print(f"{RED}✗ Regressions (> {tolerance:.2f}x baseline):{NC} {', '.join(regressions)}\n")
+        return 1
+    print(f"{GREEN}✓ No regressions{NC}\n")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the test tooling scripts')
+    subparsers = parser.add_subparsers(dest='command', help='Command to execute')
+
+    generate_parser = subparsers.add_parser('generate', help='Generate a synthetic data set')
+    generate_parser.add_argument('--scale', choices=SCALES, default='small', help='Data set size')
+    generate_parser.add_argument('--output', required=True, help='Output directory (replaced if it exists)')
+    generate_parser.add_argument('--seed', type=int, default=42, help='Random seed')
+
+    run_parser = subparsers.add_parser('run', help='Run benchmarks against baselines')
+    run_parser.add_argument('--scale', choices=SCALES, default='small', help='Data set size')
+    run_parser.add_argument('--data', help='Existing data set directory (generated if missing)')
+    run_parser.add_argument('--repeat', type=int, default=3, help='Runs per benchmark, best time is kept')
+    run_parser.add_argument('--tolerance', type=float, default=1.5, help='Allowed slowdown factor vs baseline')
+    run_parser.add_argument('--slack', type=float, default=0.25, help='Absolute slowdown in seconds always tolerated')
+    run_parser.add_argument('--update-baseline', action='store_true', help='Record timings as the new baseline')
+
+    args = parser.parse_args()
+
+    if not args.command:
+        parser.print_help()
+        sys.exit(1)
+
+    if args.command == 'generate':
+        generate(Path(args.output), args.scale, args.seed)
+        sys.exit(0)
+
+    if args.data:
+        sys.exit(run(args.scale, Path(args.data), args.repeat, args.tolerance, args.slack, args.update_baseline))
+    with tempfile.TemporaryDirectory(prefix='sonar-bench-') as tmp:
+        sys.exit(run(args.scale, Path(tmp) / 'data', args.repeat, args.tolerance, args.slack, args.update_baseline))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+agent-replay.py - Record an agent run and replay it offline as a copilot stand-in
+
+`record` wraps the real agent command inside a test workspace. It passes output
+through unchanged while storing it with per-line timestamps, keeps a copy of the
+session transcript (--share) and the files the agent created, changed or deleted
+(with their write times). `replay` accepts the same arguments as the copilot CLI
+and reproduces a recording in the current directory: it writes the output with the
+original timing (or scaled by --time-scale), applies the workspace changes, writes
+the session transcript and exits with the recorded exit code.
+
+Usage:
+    # Record (run from the test workspace)
+    python agent-replay.py record --recording <dir> -- copilot --agent=SonarArchitect ...
+
+    # Replay at 10x speed
+    python agent-replay.py replay --recording <dir> --time-scale 0.1 -- --agent=SonarArchitect ...
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from workspace_files import iter_workspace_files
+
+OUTPUT_FILE = 'agent-output.txt'
+TIMINGS_FILE = 'output-timings.json'
+SESSION_FILE = 'session.md'
+FILES_DIR = 'files'
+RECORDING_FILE = 'recording.json'
+
+
+def snapshot(workspace: Path) -> Dict[str, Tuple[int, int]]:
+    """Map workspace-relative paths of the agent's files to (size, mtime_ns)"""
+    files = {}
+    for rel_path in iter_workspace_files(workspace):
+        st = os.stat(workspace / rel_path)
+        files[rel_path] = (st.st_size, st.st_mtime_ns)
+    return files
+
+
+def share_path(agent_args: List[str]) -> Optional[Path]:
+    """The --share transcript path from copilot arguments, if any"""
+    for i, arg in enumerate(agent_args):
+        if arg == '--share' and i + 1 < len(agent_args):
+            return Path(agent_args[i + 1])
+        if arg.startswith('--share='):
+            return Path(arg.split('=', 1)[1])
+    return None
+
+
+def record(recording_dir: Path, command: List[str]) -> int:
+    """Run the agent command, passing its output through while recording the run"""
+    workspace = Path.cwd()
+    if recording_dir.exists():
+        shutil.rmtree(recording_dir)
+    recording_dir.mkdir(parents=True)
+
+    before = snapshot(workspace)
+    start = time.time()
+    timings = []
+    out = sys.stdout.buffer
+    with open(recording_dir / OUTPUT_FILE, 'wb') as recorded:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        for line in process.stdout:
+            timings.append([round(time.time() - start, 3), len(line)])
+            recorded.write(line)
+            out.write(line)
+            out.flush()
+        exit_code = process.wait()
+    duration = time.time() - start
+
+    with open(recording_dir / TIMINGS_FILE, 'w') as f:
+        json.dump(timings, f)
+
+    session = share_path(command)
+    if session and session.is_file():
+        shutil.copy2(session, recording_dir / SESSION_FILE)
+
+    after = snapshot(workspace)
+    changed = []
+    for rel_path, (size, mtime_ns) in sorted(after.items()):
+        if before.get(rel_path) == (size, mtime_ns):
+            continue
+        target = recording_dir / FILES_DIR / rel_path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(workspace / rel_path, target)
+        changed.append({'path': rel_path, 'at': round(max(mtime_ns / 1e9 - start, 0.0), 3)})
+    deleted = sorted(set(before) - set(after))
+
+    with open(recording_dir / RECORDING_FILE, 'w') as f:
+        json.dump({
+            'command': command,
+            'exit_code': exit_code,
+            'duration_seconds': round(duration, 3),
+            'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(start)),
+            'session': (recording_dir / SESSION_FILE).exists(),
+            'files_changed': changed,
+            'files_deleted': deleted
+        }, f, indent=2)
+
+    print(f"✓ Recorded {len(timings)} output lines, {len(changed)} changed and {len(deleted)} deleted files "
+          f"to {recording_dir}", file=sys.stderr)
+    return exit_code
+
+
+def replay(recording_dir: Path, agent_args: List[str], time_scale: float) -> int:
+    """Reproduce a recorded run in the current directory"""
+    workspace = Path.cwd()
+    with open(recording_dir / RECORDING_FILE, 'r') as f:
+        recording = json.load(f)
+    with open(recording_dir / TIMINGS_FILE, 'r') as f:
+        timings = json.load(f)
+
+    # Output lines and file writes, merged in recorded order
+    events = [(at, 0, length) for at, length in timings]
+    events += [(change['at'], 1, change['path']) for change in recording['files_changed']]
+    events.sort(key=lambda event: (event[0], event[1]))
+
+    start = time.monotonic()
+    out = sys.stdout.buffer
+    with open(recording_dir / OUTPUT_FILE, 'rb') as recorded:
+        for at, kind, payload in events:
+            delay = at * time_scale - (time.monotonic() - start)
+            if delay > 0:
+                time.sleep(delay)
+            if kind == 0:
+                out.write(recorded.read(payload))
+                out.flush()
+            else:
+                target = workspace / payload
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(recording_dir / FILES_DIR / payload, target)
+
+    for rel_path in recording['files_deleted']:
+        (workspace / rel_path).unlink(missing_ok=True)
+
+    remaining = recording['duration_seconds'] * time_scale - (time.monotonic() - start)
+    if remaining > 0:
+        time.sleep(remaining)
+
+    session = share_path(agent_args)
+    if session and recording['session']:
+        shutil.copyfile(recording_dir / SESSION_FILE, session)
+    return recording['exit_code']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Record an agent run or replay a recording offline')
+    subparsers = parser.add_subparsers(dest='command', help='Command to execute')
+
+    record_parser = subparsers.add_parser('record', help='Run and record an agent command')
+    record_parser.add_argument('--recording', required=True, help='Recording directory (replaced if it exists)')
+    record_parser.add_argument('agent_command', nargs=argparse.REMAINDER, help='-- followed by the agent command')
+
+    replay_parser = subparsers.add_parser('replay', help='Replay a recording as a copilot stand-in')
+    replay_parser.add_argument('--recording', required=True, help='Recording directory')
+    replay_parser.add_argument('--time-scale', type=float, default=1.0,
+                               help='Multiply recorded delays (0 = as fast as possible, default: 1)')
+    replay_parser.add_argument('agent_args', nargs=argparse.REMAINDER, help='-- followed by copilot arguments')
+
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        command = args.agent_command[1:] if args.agent_command[:1] == ['--'] else args.agent_command
+        if not command:
+            parser.error('record needs an agent command after --')
+        sys.exit(record(Path(args.recording), command))
+
+    if args.command == 'replay':
+        recording_dir = Path(args.recording)
+        if not (recording_dir / RECORDING_FILE).is_file():
+            print(f"Error: No recording found in {recording_dir}", file=sys.stderr)
+            sys.exit(1)
+        agent_args = args.agent_args[1:] if args.agent_args[:1] == ['--'] else args.agent_args
+        sys.exit(replay(recording_dir, agent_args, max(args.time_scale, 0.0)))
+
+    parser.print_help()
+    sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+agent-usage.py - Extract token usage, API time and cost from the copilot CLI usage summary
+
+The copilot CLI ends a non-interactive session with a usage summary on its output:
+
+    Total usage est:       1 Premium request
+    Total duration (API):  1m 12.4s
+    Total duration (wall): 1m 40.2s
+    Total code changes:    12 lines added, 0 lines removed
+    Usage by model:
+        claude-sonnet-4      45.2k input, 1.2k output, 30.1k cache read, 0 cache write (Est. 1 Premium request)
+
+Only the tail of agent-output.txt is read. Token counts are priced with the per-million
+token rates in tests/config/model-pricing.json, matched by the model name in the summary
+or else by the model under test. total_tokens counts input and output tokens; cache reads
+and writes are reported and priced separately.
+
+Usage:
+    # Print the usage document
+    python agent-usage.py agent-output.txt --model claude-sonnet-4
+
+    # Print the result fields as shell assignments (used by run-scenario.sh via eval)
+    python agent-usage.py agent-output.txt --model claude-sonnet-4 --shell
+"""
+
+import argparse
+import json
+import os
+import re
+import shlex
+import sys
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+# ANSI color codes
+RED = '\033[0;31m'
+NC = '\033[0m'
+
+DEFAULT_PRICING = Path(__file__).parent.parent / 'config' / 'model-pricing.json'
+# The usage summary is the last thing the CLI prints
+USAGE_TAIL_BYTES = 64 * 1024
+TOKEN_KINDS = ('input', 'output', 'cache_read', 'cache_write')
+
+ANSI_PATTERN = re.compile(r'\x1b\[[0-9;]*[A-Za-z]')
+PREMIUM_PATTERN = re.compile(r'Total usage est:\s*([\d.]+)\s*Premium request', re.IGNORECASE)
+API_DURATION_PATTERN = re.compile(r'Total duration \(API\):\s*(.+)', re.IGNORECASE)
+WALL_DURATION_PATTERN = re.compile(r'Total duration \(wall\):\s*(.+)', re.IGNORECASE)
+DURATION_PART_PATTERN = re.compile(r'([\d.]+)\s*(h|m(?!s)|s|ms)')
+MODEL_LINE_PATTERN = re.compile(r'^\s+(\S+)\s+([\d.]+[kKmM]?) input, ([\d.]+[kKmM]?) output'
+                                r'(?:, ([\d.]+[kKmM]?) cache read)?(?:, ([\d.]+[kKmM]?) cache write)?')
+TOKEN_SUFFIXES = {'': 1, 'k': 1000, 'm': 1000000}
+DURATION_UNITS = {'h': 3600, 'm': 60, 's': 1, 'ms': 0.001}
+
+
+def _tokens(text: Optional[str]) -> int:
+    """Token count as printed by the CLI (420, 15.6k, 1.2m)"""
+    if not text:
+        return 0
+    suffix = text[-1].lower() if text[-1].isalpha() else ''
+    number = text[:-1] if suffix else text
+    return int(round(float(number) * TOKEN_SUFFIXES[suffix]))
+
+
+def _seconds(text: str) -> Optional[float]:
+    """Seconds of a CLI duration (12.4s, 1m 12.4s, 2h 3m 4s)"""
+    parts = DURATION_PART_PATTERN.findall(text)
+    if not parts:
+        return None
+    return round(sum(float(value) * DURATION_UNITS[unit] for value, unit in parts), 3)
+
+
+def _read_tail(output_file: Path) -> str:
+    with open(output_file, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - USAGE_TAIL_BYTES))
+        return ANSI_PATTERN.sub('', f.read().decode('utf-8', errors='replace'))
+
+
+def parse_usage(text: str) -> Optional[Dict[str, Any]]:
+    """Usage summary fields of CLI output, or None if it has no usage summary"""
+    start = text.rfind('Usage by model:')
+    if start < 0:
+        return None
+    models = {}
+    for line in text[start:].splitlines()[1:]:
+        match = MODEL_LINE_PATTERN.match(line)
+        if not match:
+            if models:
+                break
+            continue
+        counts = models.setdefault(match.group(1), dict.fromkeys(TOKEN_KINDS, 0))
+        for kind, value in zip(TOKEN_KINDS, match.groups()[1:]):
+            counts[kind] += _tokens(value)
+    if not models:
+        return None
+
+    summary = text[:start]
+    premium = PREMIUM_PATTERN.findall(summary)
+    api = API_DURATION_PATTERN.findall(summary)
+    wall = WALL_DURATION_PATTERN.findall(summary)
+    return {
+        'models': models,
+        'premium_requests': float(premium[-1]) if premium else None,
+        'api_seconds': _seconds(api[-1]) if api else None,
+        'wall_seconds': _seconds(wall[-1]) if wall else None,
+    }
+
+
+def load_pricing(pricing_file: Path) -> Dict[str, Dict[str, float]]:
+    """Per-million token rates by model name; {} if the pricing file is missing"""
+    try:
+        with open(pricing_file, 'r') as f:
+            return json.load(f).get('models', {})
+    except (OSError, ValueError):
+        return {}
+
+
+def usage_document(usage: Dict[str, Any], pricing: Dict[str, Dict[str, float]], model: str) -> Dict[str, Any]:
+    """Token totals and cost of a parsed usage summary; cost is None if any model is unpriced"""
+    totals = dict.fromkeys(TOKEN_KINDS, 0)
+    cost = 0.0
+    for name, counts in usage['models'].items():
+        rates = pricing.get(name) or pricing.get(model)
+        if rates is None:
+            cost = None
+        elif cost is not None:
+            cost += sum(counts[kind] * rates.get(kind, 0) for kind in TOKEN_KINDS) / 1e6
+        for kind in TOKEN_KINDS:
+            totals[kind] += counts[kind]
+    return {
+        'total_tokens': totals['input'] + totals['output'],
+        'cost': round(cost, 6) if cost is not None else None,
+        'usage': {
+            **{f'{kind}_tokens': totals[kind] for kind in TOKEN_KINDS},
+            'premium_requests': usage['premium_requests'],
+            'api_seconds': usage['api_seconds'],
+            'wall_seconds': usage['wall_seconds'],
+            'models': usage['models'],
+        },
+    }
+
+
+def runner_fields(document: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """total_tokens, cost and usage values for the result file (null without a usage summary)"""
+    if document is None:
+        return {'TOTAL_TOKENS': 'null', 'COST': 'null', 'USAGE_JSON': 'null'}
+    return {
+        'TOTAL_TOKENS': str(document['total_tokens']),
+        'COST': json.dumps(document['cost']),
+        'USAGE_JSON': json.dumps(document['usage'], separators=(',', ':')),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Extract token usage and cost from copilot CLI output')
+    parser.add_argument('output', help='Agent output file (agent-output.txt)')
+    parser.add_argument('--model', default='', help='Model under test, for pricing when the summary names another')
+    parser.add_argument('--pricing', default=str(DEFAULT_PRICING), help=f'Pricing file (default: {DEFAULT_PRICING})')
+    parser.add_argument('--shell', action='store_true', help='Print the result fields as shell assignments')
+
+    args = parser.parse_args()
+
+    output_file = Path(args.output)
+    if not output_file.is_file():
+        print(f"{RED}Error: Agent output not found: {output_file}{NC}", file=sys.stderr)
+        sys.exit(1)
+
+    usage = parse_usage(_read_tail(output_file))
+    document = usage_document(usage, load_pricing(Path(args.pricing)), args.model) if usage else None
+
+    if args.shell:
+        for name, value in runner_fields(document).items():
+            print(f"{name}={shlex.quote(value)}")
+    else:
+        json.dump(document, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == '__main__':
+    main()
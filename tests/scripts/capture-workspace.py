@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+capture-workspace.py - Capture the files in a test workspace as a files_created JSON array
+
+Walks the workspace once, skips git internals, the copied agent setup and test metadata,
+marks binary files instead of inlining them, enforces per-file and total size caps and
+streams the JSON array to the output file.
+
+Usage:
+    python capture-workspace.py <workspace> --output files.json [--max-file-size BYTES] [--max-total-size BYTES]
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Any
+
+from workspace_files import iter_workspace_files
+
+DEFAULT_MAX_FILE_SIZE = 1024 * 1024
+DEFAULT_MAX_TOTAL_SIZE = 20 * 1024 * 1024
+BINARY_SNIFF_SIZE = 8192
+
+
+def is_binary(sniff: bytes) -> bool:
+    """Whether the leading bytes of a file look binary (NUL bytes or invalid UTF-8)"""
+    if b'\0' in sniff:
+        return True
+    try:
+        sniff.decode('utf-8')
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off by the sniff window is still text
+        return e.start < len(sniff) - 3
+    return False
+
+
+def capture_file(path: Path, rel_path: str, max_bytes: int) -> Dict[str, Any]:
+    """Build the files_created entry for one file, reading at most max_bytes of it"""
+    size = path.stat().st_size
+    with open(path, 'rb') as f:
+        sniff = f.read(BINARY_SNIFF_SIZE)
+        if is_binary(sniff):
+            return {'path': rel_path, 'content': '', 'binary': True, 'size': size}
+        data = sniff[:max_bytes]
+        if len(data) == len(sniff) and len(data) < max_bytes:
+            data += f.read(max_bytes - len(data))
+
+    entry = {'path': rel_path, 'content': data.decode('utf-8', errors='replace')}
+    if size > len(data):
+        entry['truncated'] = True
+        entry['size'] = size
+    return entry
+
+
+def capture_workspace(workspace: Path, output_file: Path, max_file_size: int, max_total_size: int) -> Dict[str, int]:
+    """Stream the files_created array for a workspace to output_file atomically"""
+    stats = {'files': 0, 'binary': 0, 'truncated': 0, 'bytes': 0}
+    tmp_output = output_file.with_name(f'.{output_file.name}.{os.getpid()}.tmp')
+
+    with open(tmp_output, 'w') as out:
+        out.write('[')
+        for rel_path in iter_workspace_files(workspace):
+            remaining = max(max_total_size - stats['bytes'], 0)
+            entry = capture_file(workspace / rel_path, rel_path, min(max_file_size, remaining))
+
+            if stats['files']:
+                out.write(',')
+            out.write('\n  ')
+            json.dump(entry, out)
+
+            stats['files'] += 1
+            stats['bytes'] += len(entry['content'].encode('utf-8'))
+            if entry.get('binary'):
+                stats['binary'] += 1
+            elif entry.get('truncated'):
+                stats['truncated'] += 1
+        out.write('\n]\n' if stats['files'] else ']\n')
+
+    os.replace(tmp_output, output_file)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Capture test workspace files as JSON')
+    parser.add_argument('workspace', help='Test workspace directory')
+    parser.add_argument('--output', required=True, help='Output JSON file')
+    parser.add_argument('--max-file-size', type=int, default=DEFAULT_MAX_FILE_SIZE,
+                        help=f'Maximum bytes captured per file (default: {DEFAULT_MAX_FILE_SIZE})')
+    parser.add_argument('--max-total-size', type=int, default=DEFAULT_MAX_TOTAL_SIZE,
+                        help=f'Maximum bytes captured across all files (default: {DEFAULT_MAX_TOTAL_SIZE})')
+
+    args = parser.parse_args()
+
+    workspace = Path(args.workspace)
+    if not workspace.is_dir():
+        print(f"Error: Workspace not found: {workspace}", file=sys.stderr)
+        sys.exit(1)
+
+    stats = capture_workspace(workspace, Path(args.output), args.max_file_size, args.max_total_size)
+    print(f"✓ Captured {stats['files']} files ({stats['bytes']} bytes, "
+          f"{stats['binary']} binary, {stats['truncated']} truncated)")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,15 +4,29 @@ compare-models.py - Compare test results across different LLM models
 
 Usage:
     python compare-models.py --models claude-sonnet-4,gpt-4-turbo,gemini-pro-2
+
+    # Aggregate in the SQLite result store (ingesting new or changed results first)
+    python compare-models.py --models claude-sonnet-4,gpt-4-turbo --db
+
+    # More resamples and a stricter confidence level for the bootstrap comparison
+    python compare-models.py --models claude-sonnet-4,gpt-4-turbo --resamples 10000 --confidence 0.99
+
+Winners are only declared when the bootstrap shows the difference in means is
+significant; otherwise the models that cannot be told apart are listed together.
 """
 
 import argparse
-import json
+import operator
+import random
 import sys
+from array import array
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Any
 
+from result_loader import REPORT_FIELDS, iter_result_files, load_results_projected
+from result_store import DEFAULT_DB, ResultStore, latency_percentiles
+
 # ANSI color codes
 RED = '\033[0;31m'
 GREEN = '\033[0;32m'
@@ -29,13 +43,10 @@ def load_model_results(results_base_dir: Path, model: str) -> Dict[str, Any]:
     if not model_dir.exists():
         return {'model': model, 'results': [], 'exists': False}
     
-    results = []
-    for file in model_dir.glob('*.json'):
-        if file.name != 'summary.md':
-            with open(file, 'r') as f:
-                result = json.load(f)
-                result['file'] = file.name
-                results.append(result)
+    files = list(iter_result_files(model_dir))
+    results = load_results_projected(files, REPORT_FIELDS)
+    for file, result in zip(files, results):
+        result['file'] = str(file.relative_to(model_dir))
     
     return {
         'model': model,
@@ -44,12 +55,115 @@ def load_model_results(results_base_dir: Path, model: str) -> Dict[str, Any]:
     }
 
 
+def load_model_stats_from_store(store: ResultStore, results_base_dir: Path, model: str) -> Dict[str, Any]:
+    """Ingest a model's results into the store and aggregate them there"""
+    model_dir = results_base_dir / model
+    if not model_dir.exists():
+        return {'model': model, 'results': [], 'exists': False}
+    store.ingest_model_dir(model, model_dir)
+    return {
+        'model': model,
+        'results': [],
+        'stats': store.model_stats(model),
+        'columns': {name: array('d', values) for name, values in store.metric_columns(model).items()},
+        'exists': True
+    }
+
+
+SCORE_CATEGORIES = ('total', 'accuracy', 'security', 'efficiency', 'currency', 'usability')
+# Metrics compared with bootstrap intervals: stats key, per-run column, label and unit
+CI_METRICS = (
+    ('pass_rate', 'passed', 'Pass Rate', '%'),
+    ('avg_score', 'total', 'Score', '/100'),
+    ('avg_accuracy', 'accuracy', 'Accuracy', '/40'),
+    ('avg_security', 'security', 'Security', '/20'),
+    ('avg_efficiency', 'efficiency', 'Efficiency', '/15'),
+    ('avg_currency', 'currency', 'Currency', '/15'),
+    ('avg_usability', 'usability', 'Usability', '/10'),
+)
+DEFAULT_RESAMPLES = 2000
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_SEED = 0
+# Resampled values are summed as integers in thousandths
+FIXED_POINT_SCALE = 1000
+
+
+def _aggregate_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """All statistics of a result set, from one pass into array-backed columns.
+
+    Returns the stats and the per-run columns (pass indicator as 100/0 and scores)
+    the bootstrap resamples. Token, cost and latency figures cover only the runs that
+    recorded them (results from before the runner captured usage have none).
+    """
+    total = len(results)
+    passed = 0
+    failed = 0
+    pass_column = array('d')
+    scores = {category: array('d') for category in SCORE_CATEGORIES}
+    tokens = array('d')
+    costs = array('d')
+    priced_score = 0.0
+    durations = array('d')
+    doc_fetches = array('q')
+
+    for r in results:
+        status = r.get('status')
+        if status == 'passed':
+            passed += 1
+        elif status == 'failed':
+            failed += 1
+        pass_column.append(100.0 if status == 'passed' else 0.0)
+        result_scores = r.get('scores', {})
+        for category in SCORE_CATEGORIES:
+            scores[category].append(result_scores.get(category, 0))
+        execution = r.get('execution') or {}
+        if execution.get('total_tokens') is not None:
+            tokens.append(execution['total_tokens'])
+        if execution.get('cost') is not None:
+            costs.append(execution['cost'])
+            priced_score += result_scores.get('total', 0)
+        if execution.get('duration_seconds') is not None:
+            durations.append(execution['duration_seconds'])
+        doc_fetches.append(r.get('documentation_fetches', {}).get('total_count', 0))
+
+    total_tokens = int(sum(tokens))
+    total_cost = sum(costs)
+    total_doc_fetches = sum(doc_fetches)
+    columns = {'passed': pass_column, **scores}
+    return columns, {
+        'total_scenarios': total,
+        'passed': passed,
+        'failed': failed,
+        'pass_rate': passed / total * 100,
+        'avg_score': sum(scores['total']) / total,
+        'avg_accuracy': sum(scores['accuracy']) / total,
+        'avg_security': sum(scores['security']) / total,
+        'avg_efficiency': sum(scores['efficiency']) / total,
+        'avg_currency': sum(scores['currency']) / total,
+        'avg_usability': sum(scores['usability']) / total,
+        'total_tokens': total_tokens,
+        'metered_runs': len(tokens),
+        'avg_tokens': total_tokens / len(tokens) if tokens else 0,
+        'total_cost': total_cost,
+        'priced_runs': len(costs),
+        'avg_cost': total_cost / len(costs) if costs else 0,
+        'score_per_dollar': priced_score / total_cost if total_cost > 0 else None,
+        **latency_percentiles(durations),
+        'total_doc_fetches': total_doc_fetches,
+        'avg_doc_fetches': total_doc_fetches / total
+    }
+
+
 def calculate_model_stats(model_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Calculate statistics for a model"""
+    """Calculate statistics for a model, once; later calls return the cached stats"""
+    if 'stats' in model_data:
+        # Already aggregated (by an earlier call or by the result store)
+        return model_data['stats']
+    
     results = model_data['results']
     
     if not results:
-        return {
+        stats = {
             'total_scenarios': 0,
             'passed': 0,
             'failed': 0,
@@ -61,33 +175,150 @@ def calculate_model_stats(model_data: Dict[str, Any]) -> Dict[str, Any]:
             'avg_currency': 0,
             'avg_usability': 0,
             'total_tokens': 0,
+            'metered_runs': 0,
             'avg_tokens': 0,
-            'total_cost': 0.0
+            'total_cost': 0.0,
+            'priced_runs': 0,
+            'avg_cost': 0.0,
+            'score_per_dollar': None,
+            **latency_percentiles([]),
+            'total_doc_fetches': 0,
+            'avg_doc_fetches': 0
         }
+    else:
+        model_data['columns'], stats = _aggregate_results(results)
     
-    total = len(results)
-    passed = sum(1 for r in results if r.get('status') == 'passed')
-    failed = sum(1 for r in results if r.get('status') == 'failed')
+    model_data['stats'] = stats
+    return stats
+
+
+def _resample_indices(n: int, resamples: int, rng: random.Random):
+    """resamples * n indices in [0, n), drawn as one block of random bytes"""
+    count = n * resamples
+    raw = array('I', rng.getrandbits(32 * count).to_bytes(4 * count, 'little'))
+    return map(n.__rmod__, raw)
+
+
+def bootstrap_means(columns: Dict[str, array], resamples: int, rng: random.Random) -> Dict[str, array]:
+    """Resampled means of every column, all columns resampled with the same indices.
+
+    Each run's values are packed as fixed-point fields of one integer, wide enough that
+    summing n of them cannot carry between fields, so a resample of all metrics is a
+    single gather and a single sum.
+    """
+    names = list(columns)
+    n = len(columns[names[0]])
+    lows = [min(columns[name]) for name in names]
+    fields = [[round((value - low) * FIXED_POINT_SCALE) for value in columns[name]]
+              for name, low in zip(names, lows)]
+    width = max(1, max(max(field) for field in fields) * n).bit_length()
+    packed = [sum(field[i] << (width * k) for k, field in enumerate(fields)) for i in range(n)]
+
+    drawn = list(map(packed.__getitem__, _resample_indices(n, resamples, rng)))
+    sums = [sum(drawn[start:start + n]) for start in range(0, len(drawn), n)]
+    mask = (1 << width) - 1
+    return {name: array('d', (((total >> (width * k)) & mask) / (FIXED_POINT_SCALE * n) + low for total in sums))
+            for k, (name, low) in enumerate(zip(names, lows))}
+
+
+def _interval(means: array, confidence: float) -> tuple:
+    """Percentile interval of resampled means"""
+    ordered = sorted(means)
+    tail = (1 - confidence) / 2
+    return ordered[int(tail * len(ordered))], ordered[min(len(ordered) - 1, int((1 - tail) * len(ordered)))]
+
+
+def _p_value(a: array, b: array) -> float:
+    """Two-sided bootstrap p-value for the difference in means of two models"""
+    not_greater = sum(map(operator.le, a, b))
+    not_less = sum(map(operator.ge, a, b))
+    return min(1.0, 2 * min(not_greater, not_less) / len(a))
+
+
+def compare_significance(models_data: List[Dict[str, Any]], resamples: int = DEFAULT_RESAMPLES,
+                         confidence: float = DEFAULT_CONFIDENCE, seed: int = DEFAULT_SEED) -> Dict[str, Any]:
+    """Bootstrap intervals per model and metric, and the significant leader per metric.
+
+    The model with the highest mean wins a metric only if it beats every other model
+    at the Bonferroni-adjusted level; otherwise 'leaders' holds every model it cannot
+    be told apart from.
+    """
+    rng = random.Random(seed)
+    boot = {}
+    for model_data in models_data:
+        calculate_model_stats(model_data)
+        columns = model_data.get('columns')
+        if columns and len(columns['total']):
+            boot[model_data['model']] = bootstrap_means(columns, resamples, rng)
+
+    intervals = {model: {key: _interval(means[column], confidence) for key, column, _, _ in CI_METRICS}
+                 for model, means in boot.items()}
+    ranked_models = [m for m in models_data if m['model'] in boot]
+    alpha = (1 - confidence) / max(1, len(ranked_models) - 1)
+    leaders = {}
+    for key, column, _, _ in CI_METRICS:
+        ranked = sorted(ranked_models, key=lambda m: -m['stats'][key])
+        if not ranked:
+            leaders[key] = {'winner': None, 'leaders': []}
+            continue
+        top = ranked[0]['model']
+        tied = [top] + [m['model'] for m in ranked[1:]
+                        if _p_value(boot[top][column], boot[m['model']][column]) >= alpha]
+        leaders[key] = {'winner': top if len(tied) == 1 else None, 'leaders': tied}
+    return {'intervals': intervals, 'leaders': leaders, 'resamples': resamples, 'confidence': confidence}
+
+
+def _tie_text(leaders: List[str]) -> str:
+    """Models whose difference is not significant, as prose"""
+    return f"no significant difference between {', '.join(leaders[:-1])} and {leaders[-1]}"
+
+
+def generate_confidence_table(models_data: List[Dict[str, Any]], significance: Dict[str, Any]) -> str:
+    """Bootstrap confidence interval table, one row per model"""
+    lines = []
     
-    scores = [r.get('scores', {}) for r in results]
+    lines.append("| Model | " + " | ".join(label for _, _, label, _ in CI_METRICS) + " |")
+    lines.append("|-------|" + "|".join('-' * (len(label) + 2) for _, _, label, _ in CI_METRICS) + "|")
     
-    return {
-        'total_scenarios': total,
-        'passed': passed,
-        'failed': failed,
-        'pass_rate': (passed / total * 100) if total > 0 else 0,
-        'avg_score': sum(s.get('total', 0) for s in scores) / total if total > 0 else 0,
-        'avg_accuracy': sum(s.get('accuracy', 0) for s in scores) / total if total > 0 else 0,
-        'avg_security': sum(s.get('security', 0) for s in scores) / total if total > 0 else 0,
-        'avg_efficiency': sum(s.get('efficiency', 0) for s in scores) / total if total > 0 else 0,
-        'avg_currency': sum(s.get('currency', 0) for s in scores) / total if total > 0 else 0,
-        'avg_usability': sum(s.get('usability', 0) for s in scores) / total if total > 0 else 0,
-        'total_tokens': sum(r.get('execution', {}).get('total_tokens', 0) for r in results),
-        'avg_tokens': sum(r.get('execution', {}).get('total_tokens', 0) for r in results) / total if total > 0 else 0,
-        'total_cost': sum(r.get('execution', {}).get('cost', 0) for r in results),
-        'total_doc_fetches': sum(r.get('documentation_fetches', {}).get('total_count', 0) for r in results),
-        'avg_doc_fetches': sum(r.get('documentation_fetches', {}).get('total_count', 0) for r in results) / total if total > 0 else 0
-    }
+    for model_data in models_data:
+        model = model_data['model']
+        intervals = significance['intervals'].get(model)
+        if not intervals:
+            continue
+        stats = calculate_model_stats(model_data)
+        cells = [f"{stats[key]:.1f} [{intervals[key][0]:.1f}, {intervals[key][1]:.1f}]"
+                 for key, _, _, _ in CI_METRICS]
+        lines.append(f"| {model} | " + " | ".join(cells) + " |")
+    
+    return '\n'.join(lines)
+
+
+def _format_optional(value, spec: str, prefix: str = '', suffix: str = '') -> str:
+    """A formatted number, or '-' when it is not known"""
+    return '-' if value is None else f"{prefix}{value:{spec}}{suffix}"
+
+
+def generate_efficiency_table(models_data: List[Dict[str, Any]]) -> str:
+    """Latency percentiles, tokens, cost and score per dollar, one row per model"""
+    lines = []
+    
+    lines.append("| Model | Latency p50 | Latency p95 | Latency p99 | Tokens/Scenario | Cost/Scenario | Total Cost | Score per $ |")
+    lines.append("|-------|-------------|-------------|-------------|-----------------|---------------|------------|-------------|")
+    
+    for model_data in models_data:
+        stats = calculate_model_stats(model_data)
+        lines.append(
+            f"| {model_data['model']} | "
+            f"{_format_optional(stats['latency_p50'], '.0f', suffix='s')} | "
+            f"{_format_optional(stats['latency_p95'], '.0f', suffix='s')} | "
+            f"{_format_optional(stats['latency_p99'], '.0f', suffix='s')} | "
+            f"{_format_optional(stats['avg_tokens'] if stats['metered_runs'] else None, ',.0f')} | "
+            f"{_format_optional(stats['avg_cost'] if stats['priced_runs'] else None, '.4f', prefix='$')} | "
+            f"{_format_optional(stats['total_cost'] if stats['priced_runs'] else None, '.2f', prefix='$')} | "
+            f"{_format_optional(stats['score_per_dollar'], ',.0f')} |"
+        )
+    
+    return '\n'.join(lines)
 
 
 def generate_comparison_table(models_data: List[Dict[str, Any]]) -> str:
@@ -119,7 +350,7 @@ def generate_comparison_table(models_data: List[Dict[str, Any]]) -> str:
     return '\n'.join(lines)
 
 
-def _generate_best_in_category_section(all_stats: List[tuple]) -> List[str]:
+def _generate_best_in_category_section(all_stats: List[tuple], significance: Dict[str, Any]) -> List[str]:
     """Helper to generate best in category section"""
     section = []
     section.append("---")
@@ -127,15 +358,20 @@ def _generate_best_in_category_section(all_stats: List[tuple]) -> List[str]:
     section.append("## Best in Category")
     section.append("")
     
-    best_pass_rate = max(all_stats, key=lambda x: x[1]['pass_rate'])
-    best_score = max(all_stats, key=lambda x: x[1]['avg_score'])
-    best_security = max(all_stats, key=lambda x: x[1]['avg_security'])
-    best_efficiency = max(all_stats, key=lambda x: x[1]['avg_efficiency'])
-    
-    section.append(f"- 🏆 **Best Pass Rate:** {best_pass_rate[0]} ({best_pass_rate[1]['pass_rate']:.1f}%)")
-    section.append(f"- 🏆 **Best Average Score:** {best_score[0]} ({best_score[1]['avg_score']:.1f}/100)")
-    section.append(f"- 🔒 **Best Security:** {best_security[0]} ({best_security[1]['avg_security']:.1f}/20)")
-    section.append(f"- ⚡ **Best Efficiency:** {best_efficiency[0]} ({best_efficiency[1]['avg_efficiency']:.1f}/15)")
+    stats_by_model = dict(all_stats)
+    categories = (
+        ('🏆', 'Best Pass Rate', 'pass_rate', '%'),
+        ('🏆', 'Best Average Score', 'avg_score', '/100'),
+        ('🔒', 'Best Security', 'avg_security', '/20'),
+        ('⚡', 'Best Efficiency', 'avg_efficiency', '/15'),
+    )
+    for icon, label, key, unit in categories:
+        leader = significance['leaders'][key]
+        if leader['winner']:
+            value = stats_by_model[leader['winner']][key]
+            section.append(f"- {icon} **{label}:** {leader['winner']} ({value:.1f}{unit})")
+        elif leader['leaders']:
+            section.append(f"- 🤝 **{label}:** {_tie_text(leader['leaders'])}")
     section.append("")
     
     return section
@@ -164,6 +400,16 @@ def _generate_model_performance_section(model: str, stats: Dict[str, Any]) -> Li
         section.append("**Resource Usage:**")
         section.append(f"- Average Tokens: {stats['avg_tokens']:.0f}")
         section.append(f"- Total Cost: ${stats['total_cost']:.2f}")
+        if stats['priced_runs']:
+            section.append(f"- Cost per Scenario: ${stats['avg_cost']:.4f}")
+        if stats['score_per_dollar'] is not None:
+            section.append(f"- Score per Dollar: {stats['score_per_dollar']:,.0f}")
+        section.append("")
+    
+    if stats['latency_p50'] is not None:
+        section.append("**Latency:**")
+        section.append(f"- p50: {stats['latency_p50']:.0f}s, p95: {stats['latency_p95']:.0f}s, "
+                       f"p99: {stats['latency_p99']:.0f}s")
         section.append("")
     
     if stats['avg_doc_fetches'] > 0:
@@ -192,7 +438,7 @@ def _generate_model_performance_section(model: str, stats: Dict[str, Any]) -> Li
     return section
 
 
-def _generate_recommendations_section(all_stats: List[tuple]) -> List[str]:
+def _generate_recommendations_section(all_stats: List[tuple], significance: Dict[str, Any]) -> List[str]:
     """Helper to generate recommendations section"""
     section = []
     section.append("---")
@@ -200,19 +446,29 @@ def _generate_recommendations_section(all_stats: List[tuple]) -> List[str]:
     section.append("## Recommendations")
     section.append("")
     
-    best_overall = max(all_stats, key=lambda x: x[1]['avg_score'])
-    best_cost = min([s for s in all_stats if s[1]['total_cost'] > 0], 
-                    key=lambda x: x[1]['total_cost'], default=None)
+    stats_by_model = dict(all_stats)
+    overall = significance['leaders']['avg_score']
+    best_cost = max([s for s in all_stats if s[1]['score_per_dollar'] is not None],
+                    key=lambda x: x[1]['score_per_dollar'], default=None)
     
     section.append("### Best Overall Model")
-    section.append(f"**{best_overall[0]}**")
-    section.append(f"- Average Score: {best_overall[1]['avg_score']:.1f}/100")
-    section.append(f"- Pass Rate: {best_overall[1]['pass_rate']:.1f}%")
+    if overall['winner']:
+        section.append(f"**{overall['winner']}**")
+        section.append(f"- Average Score: {stats_by_model[overall['winner']]['avg_score']:.1f}/100")
+        section.append(f"- Pass Rate: {stats_by_model[overall['winner']]['pass_rate']:.1f}%")
+    elif overall['leaders']:
+        section.append(f"🤝 No single best model at {significance['confidence']:.0%} confidence: "
+                       f"{_tie_text(overall['leaders'])}.")
+        for model in overall['leaders']:
+            section.append(f"- {model}: Average Score {stats_by_model[model]['avg_score']:.1f}/100, "
+                           f"Pass Rate {stats_by_model[model]['pass_rate']:.1f}%")
     section.append("")
     
     if best_cost:
         section.append("### Most Cost-Effective")
         section.append(f"**{best_cost[0]}**")
+        section.append(f"- Score per Dollar: {best_cost[1]['score_per_dollar']:,.0f}")
+        section.append(f"- Cost per Scenario: ${best_cost[1]['avg_cost']:.4f}")
         section.append(f"- Total Cost: ${best_cost[1]['total_cost']:.2f}")
         section.append(f"- Average Score: {best_cost[1]['avg_score']:.1f}/100")
         section.append("")
@@ -220,7 +476,8 @@ def _generate_recommendations_section(all_stats: List[tuple]) -> List[str]:
     return section
 
 
-def generate_comparison_report(models_data: List[Dict[str, Any]], output_file: Path):
+def generate_comparison_report(models_data: List[Dict[str, Any]], output_file: Path,
+                               significance: Dict[str, Any]):
     """Generate detailed comparison report in markdown"""
     
     report = []
@@ -235,9 +492,28 @@ def generate_comparison_report(models_data: List[Dict[str, Any]], output_file: P
     report.append(generate_comparison_table(models_data))
     report.append("")
     
+    if significance['intervals']:
+        report.append("## Confidence Intervals")
+        report.append("")
+        report.append(f"Mean with {significance['confidence']:.0%} bootstrap interval "
+                      f"({significance['resamples']} resamples). A model is only named best when it is "
+                      f"significantly ahead of every other model.")
+        report.append("")
+        report.append(generate_confidence_table(models_data, significance))
+        report.append("")
+    
+    report.append("## Efficiency")
+    report.append("")
+    report.append("Latency is the wall time of each scenario run. Tokens and cost come from the agent's usage "
+                  "summary, priced with `config/model-pricing.json`; score per dollar is the total score of "
+                  "priced runs divided by their cost. '-' marks models whose runs did not record it.")
+    report.append("")
+    report.append(generate_efficiency_table(models_data))
+    report.append("")
+    
     # Best in category
     all_stats = [(m['model'], calculate_model_stats(m)) for m in models_data]
-    report.extend(_generate_best_in_category_section(all_stats))
+    report.extend(_generate_best_in_category_section(all_stats, significance))
     
     # Performance breakdown
     report.append("---")
@@ -251,14 +527,14 @@ def generate_comparison_report(models_data: List[Dict[str, Any]], output_file: P
         report.extend(_generate_model_performance_section(model, stats))
     
     # Recommendations
-    report.extend(_generate_recommendations_section(all_stats))
+    report.extend(_generate_recommendations_section(all_stats, significance))
     
     # Write report
     with open(output_file, 'w') as f:
         f.write('\n'.join(report))
 
 
-def print_console_comparison(models_data: List[Dict[str, Any]]):
+def print_console_comparison(models_data: List[Dict[str, Any]], significance: Dict[str, Any]):
     """Print comparison summary to console"""
     
     print("\n" + "=" * 100)
@@ -270,7 +546,8 @@ def print_console_comparison(models_data: List[Dict[str, Any]]):
     print("")
     
     # Summary table
-    print(f"{'Model':<20} {'Scenarios':<10} {'Passed':<8} {'Pass Rate':<12} {'Avg Score':<12} {'Doc Fetches':<12}")
+    print(f"{'Model':<20} {'Scenarios':<10} {'Passed':<8} {'Pass Rate':<12} {'Avg Score':<12} {'Doc Fetches':<12} "
+          f"{'p95 Latency':<12} {'Score/$':<10}")
     print("-" * 110)
     
     for model_data in models_data:
@@ -290,16 +567,23 @@ def print_console_comparison(models_data: List[Dict[str, Any]]):
             f"{stats['passed']:<8} "
             f"{status_color}{stats['pass_rate']:>6.1f}%{NC}    "
             f"{stats['avg_score']:>6.1f}/100   "
-            f"{stats['avg_doc_fetches']:>6.1f}"
+            f"{stats['avg_doc_fetches']:>6.1f}       "
+            f"{_format_optional(stats['latency_p95'], '>6.0f', suffix='s'):>7}      "
+            f"{_format_optional(stats['score_per_dollar'], '>8,.0f'):>8}"
         )
     
     print("")
     
-    # Best model
-    all_stats = [(m['model'], calculate_model_stats(m)) for m in models_data]
-    best = max(all_stats, key=lambda x: x[1]['avg_score'])
+    # Best model, if it is significantly ahead
+    stats_by_model = {m['model']: calculate_model_stats(m) for m in models_data}
+    overall = significance['leaders']['avg_score']
     
-    print(f"{GREEN}🏆 Best Overall:{NC} {best[0]} (Score: {best[1]['avg_score']:.1f}/100)")
+    if overall['winner']:
+        print(f"{GREEN}🏆 Best Overall:{NC} {overall['winner']} "
+              f"(Score: {stats_by_model[overall['winner']]['avg_score']:.1f}/100)")
+    elif overall['leaders']:
+        print(f"{YELLOW}🤝 Best Overall:{NC} {_tie_text(overall['leaders'])} "
+              f"({significance['confidence']:.0%} confidence)")
     print("")
     print("=" * 100)
     print("")
@@ -310,10 +594,21 @@ def main():
     parser.add_argument('--models', required=True, help='Comma-separated list of model names')
     parser.add_argument('--results-dir', help='Base results directory')
     parser.add_argument('--output', help='Output comparison report file')
+    parser.add_argument('--db', nargs='?', const=str(DEFAULT_DB), metavar='PATH',
+                        help=f'Aggregate in the SQLite result store (default path: {DEFAULT_DB})')
+    parser.add_argument('--resamples', type=int, default=DEFAULT_RESAMPLES,
+                        help=f'Bootstrap resamples per model (default: {DEFAULT_RESAMPLES})')
+    parser.add_argument('--confidence', type=float, default=DEFAULT_CONFIDENCE,
+                        help=f'Confidence level of intervals and significance tests (default: {DEFAULT_CONFIDENCE})')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED,
+                        help=f'Random seed of the bootstrap, for reproducible reports (default: {DEFAULT_SEED})')
     
     args = parser.parse_args()
     
     models = [m.strip() for m in args.models.split(',')]
+    if args.resamples < 1 or not 0 < args.confidence < 1:
+        print(f"{RED}Error: --resamples must be positive and --confidence between 0 and 1{NC}")
+        sys.exit(1)
     
     # Determine results directory
     if args.results_dir:
@@ -324,24 +619,32 @@ def main():
         results_base_dir = tests_dir / 'results'
     
     # Load results for each model
+    store = ResultStore(Path(args.db)) if args.db else None
     models_data = []
     for model in models:
-        model_data = load_model_results(results_base_dir, model)
+        if store:
+            model_data = load_model_stats_from_store(store, results_base_dir, model)
+        else:
+            model_data = load_model_results(results_base_dir, model)
         if not model_data['exists']:
             print(f"{YELLOW}Warning: No results found for model '{model}'{NC}")
         else:
             models_data.append(model_data)
+    if store:
+        store.close()
     
     if not models_data:
         print(f"{RED}Error: No model results found{NC}")
         sys.exit(1)
     
+    significance = compare_significance(models_data, args.resamples, args.confidence, args.seed)
+    
     # Print console comparison
-    print_console_comparison(models_data)
+    print_console_comparison(models_data, significance)
     
     # Generate markdown report
     output_file = Path(args.output) if args.output else results_base_dir / 'model-comparison.md'
-    generate_comparison_report(models_data, output_file)
+    generate_comparison_report(models_data, output_file, significance)
     
     print(f"{GREEN}✓{NC} Comparison report generated: {output_file}\n")
 
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+compile-scenarios.py - Compile scenario YAML files into the cached scenario manifest
+
+Usage:
+    # Check every scenario against the schema and refresh the manifest
+    python compile-scenarios.py
+
+    # Print shell assignments for one scenario (used by run-scenario.sh via eval)
+    python compile-scenarios.py --shell maven/github-actions-cloud.yaml
+"""
+
+import argparse
+import shlex
+import sys
+from pathlib import Path
+
+from scenario_manifest import DEFAULT_MANIFEST, SCENARIOS_DIR, ScenarioError, ScenarioManifest
+
+# ANSI color codes
+RED = '\033[0;31m'
+GREEN = '\033[0;32m'
+NC = '\033[0m'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compile scenario YAML files into a cached manifest')
+    parser.add_argument('--scenarios-dir', help=f'Scenarios directory (default: {SCENARIOS_DIR})')
+    parser.add_argument('--manifest', help=f'Manifest file (default: {DEFAULT_MANIFEST})')
+    parser.add_argument('--shell', metavar='SCENARIO',
+                        help='Print runner variables for one scenario as shell assignments')
+
+    args = parser.parse_args()
+
+    scenarios_dir = Path(args.scenarios_dir) if args.scenarios_dir else SCENARIOS_DIR
+    manifest = ScenarioManifest(Path(args.manifest) if args.manifest else DEFAULT_MANIFEST, scenarios_dir)
+
+    if args.shell:
+        scenario_file = Path(args.shell)
+        if not scenario_file.is_absolute() and not scenario_file.exists():
+            scenario_file = scenarios_dir / scenario_file
+        try:
+            entry = manifest.get(scenario_file)
+        except (OSError, ScenarioError) as e:
+            print(f"{RED}Error: {e}{NC}", file=sys.stderr)
+            sys.exit(1)
+        for name, value in entry['runner'].items():
+            print(f"{name}={shlex.quote(value)}")
+        sys.exit(0)
+
+    errors = manifest.compile_all()
+    for error in errors:
+        print(f"{RED}✗{NC} {error}")
+    print(f"{GREEN}✓{NC} {len(manifest.entries)} scenarios compiled to {manifest.manifest_file}")
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == '__main__':
+    main()
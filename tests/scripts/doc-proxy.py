@@ -0,0 +1,594 @@
+#!/usr/bin/env python3
+"""
+doc-proxy.py - Local caching HTTP proxy for documentation and version endpoints
+
+Serves docs.sonarsource.com pages, downloads.sonarsource.com version JSON and other
+documentation from a cache directory, with per-URL TTLs and conditional revalidation
+(ETag / Last-Modified) once an entry is stale. Every request is appended to a
+track-doc-fetch.py tracking file with its cache outcome (hit, revalidated, stale,
+miss, offline-miss or error), so scoring still sees each logical fetch.
+
+Requests can use either proxy form (`GET http://host/path`, e.g. via HTTP_PROXY) or
+path form (`GET /https://docs.sonarsource.com/...`). HTTPS requests arrive as CONNECT:
+for documentation hosts (INTERCEPT_HOSTS) the proxy terminates TLS itself with a
+certificate issued by a local CA, so they are cached, tracked and served offline like
+plain requests. Clients trust the CA through SSL_CERT_FILE / NODE_EXTRA_CA_CERTS
+(see `ca --shell`). Other hosts, such as the model API, are tunnelled untouched.
+Without openssl to create the CA, documentation CONNECTs are tunnelled too and
+tracked by host only (offline, they are refused). Offline mode only keeps
+documentation from upstream; other hosts are still tunnelled. HEAD requests are served but not tracked as fetches.
+
+Usage:
+    # Serve (port 0 picks a free port, written to --port-file)
+    python doc-proxy.py serve --port 8765 --tracking-file fetches.json
+
+    # Offline: serve documentation only from the cache (other hosts are still tunnelled)
+    python doc-proxy.py serve --offline --cache-dir seeded-cache/
+
+    # Seed a cache directory ahead of an offline run
+    python doc-proxy.py seed --urls urls.txt --cache-dir seeded-cache/
+
+    # Create the local CA and print the trust variables for the agent
+    python doc-proxy.py ca --shell
+"""
+
+import argparse
+import fcntl
+import hashlib
+import json
+import os
+import re
+import select
+import shlex
+import socket
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterable, List, Any, Optional, Tuple
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / '.cache' / 'doc-proxy'
+# Kept apart from the cache directory, which may be a seeded copy shared between machines
+DEFAULT_CA_DIR = Path(__file__).parent.parent / '.cache' / 'doc-proxy-ca'
+UPSTREAM_TIMEOUT = 30
+
+# HTTPS hosts whose CONNECTs are terminated and cached; everything else is tunnelled
+INTERCEPT_HOSTS = ('docs.sonarsource.com', 'downloads.sonarsource.com', 'raw.githubusercontent.com',
+                   'docs.gitlab.com', 'learn.microsoft.com')
+HOSTNAME_PATTERN = re.compile(r'^[A-Za-z0-9](?:[A-Za-z0-9-]{0,62}\.)*[A-Za-z0-9-]{1,63}$')
+# The CA is name-constrained to the intercepted hosts and short-lived, so a leaked ca.key
+# can neither mint certificates for other hosts nor be used for long
+CA_DAYS = 30
+# A CA this close to expiry is replaced, with every host certificate it issued
+CA_RENEW_SECONDS = 2 * 86400
+LEAF_DAYS = CA_DAYS
+# System trust stores, tried when Python does not report one
+SYSTEM_CA_FILES = ('/etc/ssl/certs/ca-certificates.crt', '/etc/pki/tls/certs/ca-bundle.crt', '/etc/ssl/cert.pem')
+
+# First matching pattern wins: (URL regex, TTL in seconds)
+DEFAULT_TTL_RULES = [
+    (r'^https?://downloads\.sonarsource\.com/.*\.json', 3600),
+    (r'^https?://docs\.sonarsource\.com/.*\.md', 86400),
+    (r'^https?://docs\.sonarsource\.com/', 21600),
+    (r'^https?://(github\.com|raw\.githubusercontent\.com)/', 21600),
+    (r'.*', 3600),
+]
+
+# Response headers kept in the cache and replayed to clients
+CACHED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+TITLE_PATTERN = re.compile(rb'<title[^>]*>([^<]{1,200})</title>|^#\s+(.{1,200})$', re.IGNORECASE | re.MULTILINE)
+
+
+class DocCache:
+    """On-disk response cache: <sha256(url)>.json metadata plus a .body file"""
+
+    def __init__(self, cache_dir: Path, ttl_rules: List[Tuple[str, int]]):
+        self.cache_dir = cache_dir
+        self.ttl_rules = [(re.compile(pattern), ttl) for pattern, ttl in ttl_rules]
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def ttl(self, url: str) -> int:
+        for pattern, ttl in self.ttl_rules:
+            if pattern.search(url):
+                return ttl
+        return 0
+
+    def _paths(self, url: str) -> Tuple[Path, Path]:
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return self.cache_dir / f'{key}.json', self.cache_dir / f'{key}.body'
+
+    def get(self, url: str) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                return meta, f.read()
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, path: Path, data: bytes):
+        tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def put(self, url: str, headers: Dict[str, str], body: bytes):
+        meta_path, body_path = self._paths(url)
+        # Body first: a reader never sees metadata pointing at a missing body
+        self._write(body_path, body)
+        self.touch(url, {'url': url, 'headers': headers, 'size': len(body)})
+
+    def touch(self, url: str, meta: Dict[str, Any]):
+        """Mark an entry as freshly validated"""
+        meta = dict(meta, fetched_at=time.time())
+        self._write(self._paths(url)[0], json.dumps(meta).encode())
+
+    def is_fresh(self, meta: Dict[str, Any]) -> bool:
+        return time.time() - meta.get('fetched_at', 0) < self.ttl(meta['url'])
+
+
+class CertAuthority:
+    """Local CA issuing per-host certificates with the openssl CLI, cached in ca_dir.
+
+    ca.pem is the CA to trust (NODE_EXTRA_CA_CERTS); bundle.pem is the system trust
+    store plus ca.pem, for clients whose CA file replaces the defaults (SSL_CERT_FILE).
+    The CA may only sign for the given hosts (nameConstraints); it is recreated when
+    the host list changes or it nears expiry. All host certificates share one key.
+    Creation is locked, so parallel proxies agree.
+    """
+
+    def __init__(self, ca_dir: Path, hosts: Iterable[str] = INTERCEPT_HOSTS):
+        self.ca_dir = ca_dir
+        self.hosts = sorted({host.lower() for host in hosts})
+        self.cert_file = ca_dir / 'ca.pem'
+        self.hosts_file = ca_dir / 'ca-hosts.txt'
+        self.key_file = ca_dir / 'ca.key'
+        self.leaf_key_file = ca_dir / 'leaf.key'
+        self.bundle_file = ca_dir / 'bundle.pem'
+        self.hosts_dir = ca_dir / 'hosts'
+        self.contexts = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _openssl(*args: str):
+        subprocess.run(['openssl', *args], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+    @contextmanager
+    def _locked(self):
+        self.hosts_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.ca_dir / '.lock', 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+
+    def _write_config(self, work_dir: Path, common_name: str, extensions: str) -> Path:
+        config = work_dir / 'openssl.cnf'
+        config.write_text(f'[req]\ndistinguished_name = dn\nprompt = no\n[dn]\nCN = {common_name}\n[ext]\n{extensions}')
+        return config
+
+    def _is_current(self) -> bool:
+        """Whether a complete CA exists for exactly these hosts and is not about to expire"""
+        if not (self.cert_file.is_file() and self.key_file.is_file() and self.leaf_key_file.is_file()):
+            return False
+        try:
+            if self.hosts_file.read_text().split() != self.hosts:
+                return False
+        except OSError:
+            return False
+        expiring = subprocess.run(['openssl', 'x509', '-noout', '-checkend', str(CA_RENEW_SECONDS),
+                                   '-in', str(self.cert_file)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return expiring.returncode == 0
+
+    def ensure(self) -> 'CertAuthority':
+        """Create the CA and shared host key unless current, and refresh the trust bundle"""
+        with self._locked():
+            if not self._is_current():
+                with tempfile.TemporaryDirectory(dir=self.ca_dir) as work:
+                    work_dir = Path(work)
+                    permitted = ', '.join(f'permitted;DNS:{host}' for host in self.hosts)
+                    config = self._write_config(work_dir, 'Sonar doc-proxy local CA',
+                                                'basicConstraints = critical, CA:TRUE, pathlen:0\n'
+                                                'keyUsage = critical, keyCertSign, cRLSign\n'
+                                                'subjectKeyIdentifier = hash\n'
+                                                f'nameConstraints = critical, {permitted}\n')
+                    self._openssl('req', '-x509', '-new', '-nodes', '-newkey', 'rsa:2048', '-sha256',
+                                  '-days', str(CA_DAYS), '-config', str(config), '-extensions', 'ext',
+                                  '-keyout', str(work_dir / 'ca.key'), '-out', str(work_dir / 'ca.pem'))
+                    self._openssl('genrsa', '-out', str(work_dir / 'leaf.key'), '2048')
+                    for name in ('ca.key', 'leaf.key'):
+                        (work_dir / name).chmod(0o600)
+                    (work_dir / 'ca-hosts.txt').write_text(''.join(f'{host}\n' for host in self.hosts))
+                    # The host list last: it marks a complete CA for these hosts
+                    for name, target in (('ca.key', self.key_file), ('leaf.key', self.leaf_key_file),
+                                         ('ca.pem', self.cert_file), ('ca-hosts.txt', self.hosts_file)):
+                        os.replace(work_dir / name, target)
+                    for stale in self.hosts_dir.glob('*.pem'):
+                        stale.unlink()
+
+            system_ca = b''
+            paths = ssl.get_default_verify_paths()
+            for candidate in (paths.cafile, paths.openssl_cafile) + SYSTEM_CA_FILES:
+                if candidate and os.path.isfile(candidate):
+                    with open(candidate, 'rb') as f:
+                        system_ca = f.read().rstrip() + b'\n'
+                    break
+            tmp_bundle = self.bundle_file.with_name(f'.bundle.pem.{os.getpid()}.tmp')
+            tmp_bundle.write_bytes(system_ca + self.cert_file.read_bytes())
+            os.replace(tmp_bundle, self.bundle_file)
+        return self
+
+    def _issue(self, host: str) -> Path:
+        """Certificate for host, issued on first use"""
+        cert = self.hosts_dir / f'{host}.pem'
+        if cert.is_file():
+            return cert
+        with self._locked(), tempfile.TemporaryDirectory(dir=self.ca_dir) as work:
+            if cert.is_file():
+                return cert
+            work_dir = Path(work)
+            config = self._write_config(work_dir, host,
+                                        'basicConstraints = CA:FALSE\n'
+                                        'keyUsage = critical, digitalSignature, keyEncipherment\n'
+                                        'extendedKeyUsage = serverAuth\n'
+                                        f'subjectAltName = DNS:{host}\n')
+            self._openssl('req', '-new', '-key', str(self.leaf_key_file), '-config', str(config),
+                          '-out', str(work_dir / 'host.csr'))
+            self._openssl('x509', '-req', '-in', str(work_dir / 'host.csr'), '-sha256', '-days', str(LEAF_DAYS),
+                          '-CA', str(self.cert_file), '-CAkey', str(self.key_file),
+                          '-set_serial', str(int.from_bytes(os.urandom(8), 'big')),
+                          '-extfile', str(config), '-extensions', 'ext', '-out', str(work_dir / 'host.pem'))
+            os.replace(work_dir / 'host.pem', cert)
+        return cert
+
+    def context(self, host: str) -> ssl.SSLContext:
+        """Server-side TLS context presenting host's certificate"""
+        with self.lock:
+            if host not in self.contexts:
+                context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+                context.load_cert_chain(str(self._issue(host)), str(self.leaf_key_file))
+                # Requests are parsed as HTTP/1.1; never negotiate h2
+                context.set_alpn_protocols(['http/1.1'])
+                self.contexts[host] = context
+            return self.contexts[host]
+
+
+def fetch_upstream(url: str, meta: Optional[Dict[str, Any]] = None) -> Tuple[int, Dict[str, str], bytes]:
+    """GET url, conditionally if cached metadata is given; returns (status, headers, body)"""
+    request = urllib.request.Request(url, headers={'User-Agent': 'sonar-doc-proxy/1.0'})
+    if meta:
+        if meta['headers'].get('ETag'):
+            request.add_header('If-None-Match', meta['headers']['ETag'])
+        if meta['headers'].get('Last-Modified'):
+            request.add_header('If-Modified-Since', meta['headers']['Last-Modified'])
+    try:
+        with urllib.request.urlopen(request, timeout=UPSTREAM_TIMEOUT) as response:
+            headers = {name: response.headers[name] for name in CACHED_HEADERS if response.headers.get(name)}
+            return response.status, headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, {}, e.read() if e.code != 304 else b''
+
+
+def resolve(cache: DocCache, url: str, offline: bool) -> Tuple[int, Dict[str, str], bytes, str]:
+    """Serve url from cache or upstream; returns (status, headers, body, cache outcome)"""
+    cached = cache.get(url)
+    if cached and (offline or cache.is_fresh(cached[0])):
+        return 200, cached[0]['headers'], cached[1], 'hit'
+    if offline:
+        return 504, {'Content-Type': 'text/plain'}, b'Not in offline cache\n', 'offline-miss'
+
+    try:
+        status, headers, body = fetch_upstream(url, cached[0] if cached else None)
+    except (OSError, urllib.error.URLError) as e:
+        if cached:
+            return 200, cached[0]['headers'], cached[1], 'stale'
+        return 502, {'Content-Type': 'text/plain'}, f'Upstream error: {e}\n'.encode(), 'error'
+
+    if status == 304 and cached:
+        cache.touch(url, cached[0])
+        return 200, cached[0]['headers'], cached[1], 'revalidated'
+    if status == 200:
+        cache.put(url, headers, body)
+    return status, headers, body, 'miss'
+
+
+def page_title(body: bytes) -> str:
+    """Title of an HTML or Markdown page, if it has one near the top"""
+    match = TITLE_PATTERN.search(body[:8192])
+    if not match:
+        return ''
+    return (match.group(1) or match.group(2)).decode('utf-8', errors='replace').strip()
+
+
+class FetchTracker:
+    """Append fetches to a track-doc-fetch.py tracking file, safely across threads and processes"""
+
+    def __init__(self, tracking_file: Optional[Path]):
+        self.tracking_file = tracking_file
+        self.lock = threading.Lock()
+
+    def add(self, url: str, title: str, duration_ms: int, cache_status: str):
+        if not self.tracking_file:
+            return
+        entry = {
+            'url': url,
+            'title': title,
+            'timestamp': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
+            'fetch_duration_ms': duration_ms,
+            'cache': cache_status
+        }
+        lock_file = self.tracking_file.with_name(f'.{self.tracking_file.name}.lock')
+        with self.lock, open(lock_file, 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                with open(self.tracking_file, 'r') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {'fetches': []}
+            data['fetches'].append(entry)
+            tmp_file = self.tracking_file.with_name(f'.{self.tracking_file.name}.{os.getpid()}.tmp')
+            with open(tmp_file, 'w') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_file, self.tracking_file)
+
+
+class ProxyHandler(BaseHTTPRequestHandler):
+    """Caching GET handler; CONNECTs to documentation hosts are terminated, others tunnelled"""
+
+    protocol_version = 'HTTP/1.1'
+    cache: DocCache = None
+    tracker: FetchTracker = None
+    authority: Optional[CertAuthority] = None
+    intercept_hosts = frozenset(INTERCEPT_HOSTS)
+    offline = False
+    quiet = False
+    # https://host[:port] once this connection is a terminated CONNECT tunnel
+    tunnel_origin: Optional[str] = None
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+    def _target_url(self) -> Optional[str]:
+        if self.tunnel_origin and self.path.startswith('/'):
+            return self.tunnel_origin + self.path
+        if self.path.startswith(('http://', 'https://')):
+            return self.path
+        if self.path.startswith(('/http://', '/https://')):
+            return self.path[1:]
+        return None
+
+    def _send(self, status: int, headers: Dict[str, str], body: bytes, cache_status: str):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('X-Cache', cache_status.upper())
+        self.send_header('Date', formatdate(usegmt=True))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def do_GET(self):
+        url = self._target_url()
+        if not url:
+            self._send(400, {'Content-Type': 'text/plain'},
+                       b'Use proxy form (GET http://host/path) or path form (GET /https://host/path)\n', 'none')
+            return
+        start = time.monotonic()
+        status, headers, body, cache_status = resolve(self.cache, url, self.offline)
+        # Tracked before responding, so the fetch is recorded once the agent has the page.
+        # HEAD only probes a URL; it is not a documentation fetch.
+        if self.command == 'GET':
+            self.tracker.add(url, page_title(body) if status == 200 else '',
+                             int((time.monotonic() - start) * 1000), cache_status)
+        self._send(status, headers, body, cache_status)
+
+    do_HEAD = do_GET
+
+    def do_CONNECT(self):
+        host, _, port = self.path.partition(':')
+        port = int(port or 443) if port.isdigit() or not port else 0
+        documentation = host.lower() in self.intercept_hosts and HOSTNAME_PATTERN.match(host) and port
+        if documentation and self.authority:
+            self._intercept(host.lower(), port)
+            return
+        if documentation:
+            if self.offline:
+                # Without a CA the cache cannot serve it, and offline it must not reach upstream
+                self.send_error(504, 'Offline: documentation HTTPS needs the local CA')
+                return
+            # No CA to terminate TLS with: the host is all that can be recorded
+            self.tracker.add(f'https://{host.lower()}/', '', 0, 'tunnel')
+        try:
+            upstream = socket.create_connection((host, port), timeout=UPSTREAM_TIMEOUT)
+        except OSError as e:
+            self.send_error(502, f'Cannot connect to {self.path}: {e}')
+            return
+        self.send_response(200, 'Connection Established')
+        self.end_headers()
+        sockets = [self.connection, upstream]
+        try:
+            while True:
+                readable, _, errored = select.select(sockets, [], sockets, UPSTREAM_TIMEOUT)
+                if errored or not readable:
+                    break
+                for sock in readable:
+                    data = sock.recv(65536)
+                    if not data:
+                        return
+                    (upstream if sock is self.connection else self.connection).sendall(data)
+        finally:
+            upstream.close()
+            self.close_connection = True
+
+    def _intercept(self, host: str, port: int):
+        """Answer the CONNECT, then keep reading requests from the decrypted stream"""
+        try:
+            context = self.authority.context(host)
+        except (OSError, ssl.SSLError, subprocess.CalledProcessError) as e:
+            self.send_error(502, f'Cannot issue a certificate for {host}: {e}')
+            return
+        self.send_response(200, 'Connection Established')
+        self.end_headers()
+        try:
+            tls = context.wrap_socket(self.connection, server_side=True)
+        except (OSError, ssl.SSLError):
+            # Typically a client that does not trust the local CA
+            self.close_connection = True
+            return
+        self.rfile.close()
+        self.wfile.close()
+        self.connection = tls
+        self.rfile = tls.makefile('rb')
+        # handle_one_request() flushes after every response
+        self.wfile = tls.makefile('wb')
+        self.tunnel_origin = f'https://{host}' + (f':{port}' if port != 443 else '')
+        self.close_connection = False
+
+    def finish(self):
+        super().finish()
+        if self.connection is not self.request:
+            # The TLS socket took over the connection; the server only closes the original
+            self.connection.close()
+
+
+def hostname(value: str) -> str:
+    """argparse type for --intercept-host"""
+    if not HOSTNAME_PATTERN.match(value):
+        raise argparse.ArgumentTypeError(f"invalid host name '{value}'")
+    return value.lower()
+
+
+def intercept_hosts(args) -> List[str]:
+    """The documentation hosts to terminate TLS for, which the CA is constrained to"""
+    return list(INTERCEPT_HOSTS) + list(args.intercept_host or [])
+
+
+def load_ttl_rules(ttl_config: Optional[str]) -> List[Tuple[str, int]]:
+    """TTL rules from a JSON file ({"rules": [{"pattern": ..., "ttl_seconds": ...}]}), before the defaults"""
+    if not ttl_config:
+        return DEFAULT_TTL_RULES
+    with open(ttl_config, 'r') as f:
+        rules = json.load(f).get('rules', [])
+    return [(rule['pattern'], int(rule['ttl_seconds'])) for rule in rules] + DEFAULT_TTL_RULES
+
+
+def serve(args):
+    cache = DocCache(Path(args.cache_dir) if args.cache_dir else DEFAULT_CACHE_DIR, load_ttl_rules(args.ttl_config))
+    ProxyHandler.cache = cache
+    ProxyHandler.tracker = FetchTracker(Path(args.tracking_file) if args.tracking_file else None)
+    ProxyHandler.offline = args.offline
+    ProxyHandler.quiet = args.quiet
+    ProxyHandler.intercept_hosts = frozenset(intercept_hosts(args))
+    ProxyHandler.authority = None
+    if not args.no_intercept:
+        try:
+            ProxyHandler.authority = CertAuthority(Path(args.ca_dir) if args.ca_dir else DEFAULT_CA_DIR,
+                                                   ProxyHandler.intercept_hosts).ensure()
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"Warning: Cannot create the local CA ({e}); documentation HTTPS is tunnelled, not cached",
+                  file=sys.stderr)
+
+    server = ThreadingHTTPServer((args.host, args.port), ProxyHandler)
+    server.daemon_threads = True
+    port = server.server_address[1]
+    if args.port_file:
+        Path(args.port_file).write_text(f'{port}\n')
+    mode = 'offline' if args.offline else 'online'
+    if ProxyHandler.authority:
+        mode += f', TLS for {len(ProxyHandler.intercept_hosts)} documentation hosts'
+    print(f"✓ Documentation proxy on http://{args.host}:{port} ({mode}, cache: {cache.cache_dir})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def seed(args):
+    cache = DocCache(Path(args.cache_dir) if args.cache_dir else DEFAULT_CACHE_DIR, load_ttl_rules(args.ttl_config))
+    urls = list(args.url or [])
+    if args.urls:
+        with open(args.urls, 'r') as f:
+            urls += [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    failed = 0
+    for url in urls:
+        status, _, body, cache_status = resolve(cache, url, offline=False)
+        if status == 200:
+            print(f"✓ {cache_status:<11} {url} ({len(body)} bytes)")
+        else:
+            failed += 1
+            print(f"✗ {status:<11} {url}")
+    print(f"\nSeeded {len(urls) - failed}/{len(urls)} URLs into {cache.cache_dir}")
+    sys.exit(1 if failed else 0)
+
+
+def ca(args):
+    ca_dir = Path(args.ca_dir) if args.ca_dir else DEFAULT_CA_DIR
+    try:
+        authority = CertAuthority(ca_dir, intercept_hosts(args)).ensure()
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"Error: Cannot create the local CA in {ca_dir}: {e}", file=sys.stderr)
+        sys.exit(1)
+    if args.shell:
+        print(f"DOC_PROXY_CA={shlex.quote(str(authority.cert_file))}")
+        print(f"DOC_PROXY_CA_BUNDLE={shlex.quote(str(authority.bundle_file))}")
+    else:
+        print(f"✓ Local CA: {authority.cert_file}")
+        print(f"  Trust bundle (system CAs + local CA): {authority.bundle_file}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Caching documentation proxy')
+    subparsers = parser.add_subparsers(dest='command', help='Command to execute')
+
+    serve_parser = subparsers.add_parser('serve', help='Run the proxy')
+    serve_parser.add_argument('--host', default='127.0.0.1', help='Listen address (default: 127.0.0.1)')
+    serve_parser.add_argument('--port', type=int, default=8765, help='Listen port, 0 for any free port (default: 8765)')
+    serve_parser.add_argument('--port-file', help='Write the listening port to this file')
+    serve_parser.add_argument('--tracking-file', help='track-doc-fetch.py tracking file to append fetches to')
+    serve_parser.add_argument('--offline', action='store_true', help='Never contact upstream; serve only cached entries')
+    serve_parser.add_argument('--quiet', action='store_true', help='Do not log requests')
+    serve_parser.add_argument('--no-intercept', action='store_true', help='Tunnel all HTTPS without terminating TLS')
+
+    seed_parser = subparsers.add_parser('seed', help='Fetch URLs into the cache')
+    seed_parser.add_argument('--url', action='append', help='URL to cache (repeatable)')
+    seed_parser.add_argument('--urls', help='File with one URL per line')
+
+    ca_parser = subparsers.add_parser('ca', help='Create the local CA used to terminate documentation HTTPS')
+    ca_parser.add_argument('--shell', action='store_true', help='Print the CA paths as shell assignments')
+
+    for sub in (serve_parser, seed_parser):
+        sub.add_argument('--cache-dir', help=f'Cache directory (default: {DEFAULT_CACHE_DIR})')
+        sub.add_argument('--ttl-config', help='JSON file with extra TTL rules')
+    for sub in (serve_parser, ca_parser):
+        sub.add_argument('--ca-dir', help=f'Local CA directory (default: {DEFAULT_CA_DIR})')
+        # The CA is constrained to the host list, so ca and serve must be given the same hosts
+        sub.add_argument('--intercept-host', action='append', type=hostname,
+                         help='Extra HTTPS host to terminate and cache (repeatable)')
+
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        serve(args)
+    elif args.command == 'seed':
+        seed(args)
+    elif args.command == 'ca':
+        ca(args)
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
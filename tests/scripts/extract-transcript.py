@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+extract-transcript.py - Extract skills, documentation URLs, Output Contracts and questions from a transcript
+
+Reads session.md or agent-output.txt once and writes the structured document built by
+transcript_extractor.py.
+
+Usage:
+    # Write the document
+    python extract-transcript.py session.md --output transcript.json
+
+    # Also print the result fields as shell assignments (used by run-scenario.sh via eval)
+    python extract-transcript.py session.md --output transcript.json --shell
+"""
+
+import argparse
+import json
+import shlex
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+from transcript_extractor import extract_transcript, save_extract
+
+# ANSI color codes
+RED = '\033[0;31m'
+NC = '\033[0m'
+
+
+def runner_fields(document: dict) -> dict:
+    """skills_invoked and documentation_fetches values for the result file"""
+    skills = document['skills']['invoked']
+    timestamp = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    doc_fetches = {
+        'total_count': len(document['urls']),
+        'pages': [{'url': u['url'], 'timestamp': timestamp} for u in document['urls']],
+        'domains': [u['domain'] for u in document['urls']],
+    }
+    return {
+        'SKILLS_JSON': json.dumps(skills, separators=(',', ':')),
+        'SKILLS_COUNT': str(len(skills)),
+        'SKILLS_INVOKED': '\n'.join(skills),
+        'DOC_COUNT': str(doc_fetches['total_count']),
+        'DOC_JSON': json.dumps(doc_fetches, separators=(',', ':')),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Extract structured data from an agent transcript in one pass')
+    parser.add_argument('transcript', help='Transcript file (session.md or agent-output.txt)')
+    parser.add_argument('--output', help='Write the JSON document to this file (default: stdout)')
+    parser.add_argument('--shell', action='store_true',
+                        help='Print skills and documentation fetch fields as shell assignments')
+
+    args = parser.parse_args()
+
+    transcript = Path(args.transcript)
+    document = extract_transcript(transcript)
+    if document is None:
+        print(f"{RED}Error: Transcript not found: {transcript}{NC}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.output:
+        save_extract(document, Path(args.output))
+    elif not args.shell:
+        json.dump(document, sys.stdout, indent=2)
+        print()
+
+    if args.shell:
+        for name, value in runner_fields(document).items():
+            print(f"{name}={shlex.quote(value)}")
+
+
+if __name__ == '__main__':
+    main()
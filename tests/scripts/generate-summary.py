@@ -4,14 +4,37 @@ generate-summary.py - Generate summary report from test results
 
 Usage:
     python generate-summary.py --model <model-name>
+
+    # Query the SQLite result store (ingesting new or changed results first)
+    python generate-summary.py --model <model-name> --db
+
+    # Fold one newly validated result into the persisted summary state and re-render
+    python generate-summary.py --model <model-name> --add-result ../results/<model-name>/.workspace-x-1/result.json
+
+    # Discard the summary state and rebuild it from every result file
+    python generate-summary.py --model <model-name> --rebuild
+
+Without --db the report renders from running totals persisted in
+<results-dir>/.summary-state.json. Each run re-reads only results that are new or
+changed since the state was written (by size and mtime, sidecar included), and
+--add-result touches just the given files, so a summary after every scenario costs
+the same however many results the model has. Updates are appended to
+.summary-state.log, one line per changed result, and folded into the JSON snapshot
+only once the log outgrows it.
 """
 
 import argparse
+import fcntl
 import json
+import os
 import sys
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+
+from result_loader import (is_result_file, iter_result_files, load_result_fields, load_results_projected,
+                           report_status, result_signature)
+from result_store import DEFAULT_DB, SCORE_COLUMNS, ResultStore
 
 # ANSI color codes
 RED = '\033[0;31m'
@@ -20,52 +43,261 @@ YELLOW = '\033[1;33m'
 BLUE = '\033[0;34m'
 NC = '\033[0m'
 
+SUMMARY_STATE_FILE = '.summary-state.json'
+SUMMARY_LOCK_FILE = '.summary-state.lock'
+# Row changes since the snapshot, one JSON line each, replayed on load
+SUMMARY_LOG_FILE = '.summary-state.log'
+# The log is compacted into the snapshot once it has more lines than this or than there are results
+SUMMARY_LOG_MIN_ENTRIES = 256
+# 2: totals count every status other than passed/failed as pending
+SUMMARY_STATE_VERSION = 2
+# Result fields the summary renders
+SUMMARY_FIELDS = ('scenario', 'language', 'status', 'scores', 'documentation_fetches', 'validation')
+
 
-def load_results(results_dir: Path) -> List[Dict[str, Any]]:
-    """Load all JSON result files from results directory"""
+def categorize_from_store(store: ResultStore, model: str) -> Dict[str, Any]:
+    """Build the categorized view from result store queries instead of result files"""
+    stats = store.summary_stats(model)
     results = []
-    for file in results_dir.glob('*.json'):
-        with open(file, 'r') as f:
-            result = json.load(f)
-            result['file'] = file.name
-            results.append(result)
-    return results
+    for run in sorted(store.score_rows(model), key=lambda run: Path(run['file'])):
+        scores = {column: run[column] for column in SCORE_COLUMNS if run[column] is not None}
+        if run['score_total'] is not None:
+            scores['total'] = run['score_total']
+        result = {
+            'language': run['language'] or 'unknown',
+            'scenario': run['scenario'],
+            'status': run['status'],
+            'file': run['file'],
+            'documentation_fetches': {'total_count': run['doc_fetch_count'] or 0},
+            'validation': {'failures': run['failures']}
+        }
+        if scores:
+            result['scores'] = scores
+        results.append(result)
+    
+    by_language = store.language_breakdown(model)
+    for data in by_language.values():
+        data['scenarios'] = []
+    return {
+        'by_language': by_language,
+        'by_status': {key: stats[key] for key in ('passed', 'failed', 'pending')},
+        'all_results': results,
+        'stats': stats
+    }
 
 
-def categorize_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Categorize results by language and status"""
-    categorized = {
-        'by_language': {},
-        'by_status': {'passed': 0, 'failed': 0, 'pending': 0},
-        'all_results': results
-    }
-    
-    for result in results:
-        language = result.get('language', 'unknown')
-        status = result.get('status', 'pending')
-        
-        # By language
-        if language not in categorized['by_language']:
-            categorized['by_language'][language] = {
+def _summary_row(result: Dict[str, Any]) -> Dict[str, Any]:
+    """The parts of a result the summary renders, small enough to keep for every run"""
+    row = {key: result[key] for key in ('scenario', 'language', 'status', 'scores') if key in result}
+    if 'documentation_fetches' in result:
+        row['documentation_fetches'] = {'total_count': result['documentation_fetches'].get('total_count', 0)}
+    if 'validation' in result:
+        row['validation'] = {'failures': result['validation'].get('failures', [])}
+    return row
+
+
+class SummaryState:
+    """Running summary totals of one results directory, persisted between runs.
+
+    Holds the counts by language and status, score and doc-fetch sums, and a small
+    row per result for the per-scenario sections. Adding, replacing or removing a
+    result adjusts the totals by that result's contribution alone, and saving appends
+    only the changed rows to the log; the snapshot is rewritten when the log grows
+    longer than the number of results, so an update costs O(1) amortized. Use as a
+    context manager: the state is locked (flock) while in use and saved on exit, so
+    parallel scenario runs can update it safely.
+    """
+
+    def __init__(self, results_dir: Path, rebuild: bool = False):
+        self.results_dir = results_dir
+        self.path = results_dir / SUMMARY_STATE_FILE
+        self.log_path = results_dir / SUMMARY_LOG_FILE
+        self.rebuild = rebuild
+        self.lock_file = None
+        self.dirty = False
+        self.loaded = False
+        self.files = {}
+        self.totals = {}
+        # Lines in the log file, and changes of this session not yet written to it
+        self.log_entries = 0
+        self.changes = []
+
+    def __enter__(self):
+        self.lock_file = open(self.results_dir / SUMMARY_LOCK_FILE, 'w')
+        fcntl.flock(self.lock_file, fcntl.LOCK_EX)
+        self._load()
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            if self.dirty:
+                self._save()
+        finally:
+            fcntl.flock(self.lock_file, fcntl.LOCK_UN)
+            self.lock_file.close()
+
+    def _load(self):
+        state = {}
+        if not self.rebuild:
+            try:
+                with open(self.path, 'r') as f:
+                    state = json.load(f)
+            except (OSError, ValueError):
+                state = {}
+        if state.get('version') == SUMMARY_STATE_VERSION:
+            self.files = state['files']
+            self.totals = state['totals']
+            self.loaded = True
+            self._replay_log()
+        else:
+            self.files = {}
+            self.totals = {
                 'total': 0,
-                'passed': 0,
-                'failed': 0,
-                'pending': 0,
-                'scenarios': []
+                'by_status': {'passed': 0, 'failed': 0, 'pending': 0},
+                'by_language': {},
+                'score_sum': 0,
+                'score_count': 0,
+                'doc_fetch_sum': 0,
+                'doc_fetch_count': 0
             }
+            self.dirty = True
+
+    def _replay_log(self):
+        """Apply the row changes logged since the snapshot was written"""
+        try:
+            with open(self.log_path, 'r') as f:
+                for line in f:
+                    try:
+                        change = json.loads(line)
+                    except ValueError:
+                        # A line cut short by an interrupted append, and anything after it
+                        break
+                    self._set(change['file'], change['entry'])
+                    self.log_entries += 1
+        except OSError:
+            pass
+
+    def _save(self):
+        if self.loaded and self.log_entries + len(self.changes) <= max(SUMMARY_LOG_MIN_ENTRIES, len(self.files)):
+            with open(self.log_path, 'a') as f:
+                f.write(''.join(json.dumps({'file': file, 'entry': entry}) + '\n' for file, entry in self.changes))
+            return
+        tmp_path = self.path.with_name(f'{self.path.name}.{os.getpid()}.tmp')
+        with open(tmp_path, 'w') as f:
+            # dumps() encodes in C; dump() to a file streams through the pure-Python encoder
+            f.write(json.dumps({'version': SUMMARY_STATE_VERSION, 'totals': self.totals, 'files': self.files}))
+        os.replace(tmp_path, self.path)
+        # Replaying a change is idempotent, so a log left behind by a crash here is harmless
+        open(self.log_path, 'w').close()
+
+    def _apply(self, row: Dict[str, Any], sign: int):
+        """Add (sign 1) or take away (sign -1) one result's contribution to the totals"""
+        totals = self.totals
+        language = row.get('language', 'unknown')
+        status = report_status(row.get('status'))
+        by_language = totals['by_language'].setdefault(
+            language, {'total': 0, 'passed': 0, 'failed': 0, 'pending': 0})
+        by_language['total'] += sign
+        by_language[status] += sign
+        if by_language['total'] == 0:
+            del totals['by_language'][language]
+        totals['by_status'][status] += sign
+        totals['total'] += sign
         
-        categorized['by_language'][language]['total'] += 1
-        categorized['by_language'][language][status] += 1
-        categorized['by_language'][language]['scenarios'].append(result)
+        if 'scores' in row and 'total' in row['scores']:
+            totals['score_sum'] += sign * row['scores']['total']
+            totals['score_count'] += sign
+        doc_fetches = row.get('documentation_fetches', {}).get('total_count', 0)
+        if doc_fetches > 0:
+            totals['doc_fetch_sum'] += sign * doc_fetches
+            totals['doc_fetch_count'] += sign
+
+    def _set(self, file: str, entry: Optional[Dict[str, Any]]):
+        """Replace (or with None, drop) the entry of one result, adjusting the totals"""
+        old = self.files.pop(file, None)
+        if old:
+            self._apply(old['row'], -1)
+        if entry:
+            self._apply(entry['row'], 1)
+            self.files[file] = entry
+
+    def _change(self, file: str, entry: Optional[Dict[str, Any]]):
+        self._set(file, entry)
+        self.changes.append((file, entry))
+        self.dirty = True
+
+    def _store(self, file: str, signature: str, result: Dict[str, Any]):
+        self._change(file, {'signature': signature, 'row': _summary_row(result)})
+
+    def remove(self, file: str):
+        """Drop a result (path relative to the results directory) from the totals"""
+        if file in self.files:
+            self._change(file, None)
+
+    def add_result(self, result_file: Path):
+        """Fold one result file into the state; a deleted file is removed from it"""
+        file = os.path.relpath(result_file, self.results_dir)
+        if not result_file.exists():
+            self.remove(file)
+            return
+        signature = result_signature(result_file)
+        entry = self.files.get(file)
+        if entry and entry['signature'] == signature:
+            return
+        self._store(file, signature, load_result_fields(result_file, SUMMARY_FIELDS))
+
+    def sync(self):
+        """Bring the state up to date with the results directory, reading only new or changed results"""
+        changed = []
+        present = set()
+        for result_file in iter_result_files(self.results_dir):
+            file = str(result_file.relative_to(self.results_dir))
+            present.add(file)
+            signature = result_signature(result_file)
+            entry = self.files.get(file)
+            if not entry or entry['signature'] != signature:
+                changed.append((file, signature, result_file))
+        for file in [file for file in self.files if file not in present]:
+            self.remove(file)
+        results = load_results_projected([result_file for _, _, result_file in changed], SUMMARY_FIELDS)
+        for (file, signature, _), result in zip(changed, results):
+            self._store(file, signature, result)
+
+    def categorize(self) -> Dict[str, Any]:
+        """The categorized view the report renders, built from the persisted totals"""
+        totals = self.totals
+        results = []
+        # Same order as iter_result_files() (Path ordering compares components)
+        for file in sorted(self.files, key=lambda file: file.split(os.sep)):
+            result = dict(self.files[file]['row'])
+            result['file'] = file
+            results.append(result)
         
-        # By status
-        categorized['by_status'][status] += 1
-    
-    return categorized
+        total_scenarios = totals['total']
+        by_status = {key: totals['by_status'].get(key, 0) for key in ('passed', 'failed', 'pending')}
+        stats = {
+            'total_scenarios': total_scenarios,
+            **by_status,
+            'pass_rate': (by_status['passed'] / total_scenarios * 100) if total_scenarios > 0 else 0,
+            'avg_score': (totals['score_sum'] / totals['score_count']) if totals['score_count'] > 0 else 0,
+            'avg_doc_fetches': ((totals['doc_fetch_sum'] / totals['doc_fetch_count'])
+                                if totals['doc_fetch_count'] > 0 else 0)
+        }
+        by_language = {language: {**counts, 'scenarios': []} for language, counts in totals['by_language'].items()}
+        return {
+            'by_language': by_language,
+            'by_status': by_status,
+            'all_results': results,
+            'stats': stats
+        }
 
 
 def _calculate_summary_stats(categorized: Dict[str, Any]) -> Dict[str, Any]:
     """Helper to calculate summary statistics"""
+    if 'stats' in categorized:
+        # Already aggregated by the result store
+        return categorized['stats']
+    
     total_scenarios = len(categorized['all_results'])
     passed = categorized['by_status']['passed']
     failed = categorized['by_status']['failed']
@@ -276,14 +508,42 @@ def generate_console_summary(model: str, categorized: Dict[str, Any]):
     print("\n" + "=" * 77 + "\n")
 
 
+def write_reports(model: str, categorized: Dict[str, Any], results_dir: Path, output: str, quiet: bool):
+    """Print the console summary and write the markdown report"""
+    if not categorized['all_results']:
+        print(f"{YELLOW}Warning: No results found in {results_dir}{NC}")
+        sys.exit(0)
+    
+    # Generate console summary
+    if not quiet:
+        generate_console_summary(model, categorized)
+    
+    # Generate markdown report
+    output_file = Path(output) if output else results_dir / 'summary.md'
+    generate_markdown_report(model, categorized, output_file)
+    
+    if not quiet:
+        print(f"{GREEN}✓{NC} Summary report generated: {output_file}\n")
+
+
 def main():
     parser = argparse.ArgumentParser(description='Generate test summary report')
     parser.add_argument('--model', required=True, help='Model name')
     parser.add_argument('--results-dir', help='Path to results directory')
     parser.add_argument('--output', help='Output markdown file path')
+    parser.add_argument('--db', nargs='?', const=str(DEFAULT_DB), metavar='PATH',
+                        help=f'Report from the SQLite result store (default path: {DEFAULT_DB})')
+    parser.add_argument('--add-result', action='append', metavar='PATH',
+                        help='Fold only this result file into the summary state (repeatable)')
+    parser.add_argument('--rebuild', action='store_true',
+                        help=f'Discard {SUMMARY_STATE_FILE} and rebuild it from every result file')
+    parser.add_argument('--quiet', action='store_true', help='Only write the markdown report')
     
     args = parser.parse_args()
     
+    if args.db and (args.add_result or args.rebuild):
+        parser.error('--add-result and --rebuild update the summary state and cannot be combined with --db')
+    
     # Determine results directory
     if args.results_dir:
         results_dir = Path(args.results_dir)
@@ -296,24 +556,29 @@ def main():
         print(f"{RED}Error: Results directory not found: {results_dir}{NC}")
         sys.exit(1)
     
-    # Load results
-    results = load_results(results_dir)
-    
-    if not results:
-        print(f"{YELLOW}Warning: No results found in {results_dir}{NC}")
-        sys.exit(0)
-    
-    # Categorize results
-    categorized = categorize_results(results)
-    
-    # Generate console summary
-    generate_console_summary(args.model, categorized)
-    
-    # Generate markdown report
-    output_file = Path(args.output) if args.output else results_dir / 'summary.md'
-    generate_markdown_report(args.model, categorized, output_file)
-    
-    print(f"{GREEN}✓{NC} Summary report generated: {output_file}\n")
+    if args.db:
+        # Ingest new or changed results, then aggregate in SQLite
+        with ResultStore(Path(args.db)) as store:
+            store.ingest_model_dir(args.model, results_dir)
+            categorized = categorize_from_store(store, args.model)
+        write_reports(args.model, categorized, results_dir, args.output, args.quiet)
+        return
+    
+    # Update the persisted totals, and render while still holding the state lock so
+    # concurrent runs write their reports in the order they updated the state
+    with SummaryState(results_dir, rebuild=args.rebuild) as state:
+        if args.add_result and state.loaded:
+            for path in args.add_result:
+                result_file = Path(path)
+                outside = os.path.relpath(result_file, results_dir).startswith(os.pardir)
+                if outside or (result_file.exists() and not is_result_file(result_file)):
+                    print(f"{RED}Error: Not a result file in {results_dir}: {result_file}{NC}")
+                    sys.exit(1)
+                state.add_result(result_file)
+        else:
+            # Every result file: no --add-result, or no usable state to add to yet
+            state.sync()
+        write_reports(args.model, state.categorize(), results_dir, args.output, args.quiet)
 
 
 if __name__ == '__main__':
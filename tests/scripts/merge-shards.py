@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+merge-shards.py - Merge the results of sharded suite runs into one results directory
+
+Each input is a results root written by `run-all-scenarios.sh --shard i/n` on one
+machine (a directory of <model>/ result directories). Result workspaces, their
+validation sidecars and the per-scenario logs are copied into <output>/<model>/, so
+generate-summary.py and compare-models.py can read the merged set with --results-dir.
+The workspace, agent_output and transcript_extract paths a result records point at
+the shard machine; they are rewritten to the merged workspace, so validate-result.py
+and skill-profile.py find the copied files instead of silently missing them.
+The .shard.json assignment each shard records is checked for missing shards, missing
+results and scenarios that ran on more than one shard.
+
+Usage:
+    python merge-shards.py --output ../merged shard-1/ shard-2/ shard-3/
+    python generate-summary.py --model claude-sonnet-4 --results-dir ../merged/claude-sonnet-4
+    python compare-models.py --models claude-sonnet-4,gpt-4-turbo --results-dir ../merged
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+from pathlib import Path
+from typing import Dict, List, Any
+
+from result_loader import (WORKSPACE_PREFIX, iter_result_files, load_result_fields, load_validation_sidecar,
+                           sidecar_path, write_validation_sidecar)
+from transcript_extractor import load_extract, save_extract
+
+# ANSI color codes
+RED = '\033[0;31m'
+GREEN = '\033[0;32m'
+YELLOW = '\033[1;33m'
+BLUE = '\033[0;34m'
+NC = '\033[0m'
+
+SHARD_FILE_NAME = '.shard.json'
+# Git internals of a workspace are not needed to report on or re-validate a result
+WORKSPACE_IGNORE = shutil.ignore_patterns('.git')
+# Absolute paths into the run's workspace recorded under execution
+WORKSPACE_PATH_FIELDS = ('workspace', 'agent_output', 'transcript_extract')
+
+
+def _free_path(path: Path) -> Path:
+    """path, or path with a numeric suffix if it is already taken"""
+    candidate = path
+    counter = 2
+    while candidate.exists():
+        candidate = path.with_name(f'{path.stem}-{counter}{path.suffix}')
+        counter += 1
+    return candidate
+
+
+def _relocated(path: str, old_root: str, new_root: str) -> str:
+    """path moved from under old_root to under new_root, or unchanged if it is elsewhere"""
+    normalized = os.path.normpath(path)
+    if normalized == old_root or normalized.startswith(old_root + os.sep):
+        return new_root + normalized[len(old_root):]
+    return path
+
+
+def relocate_workspace_result(source_result: Path, target_result: Path):
+    """Point the execution paths of a copied workspace result at its new workspace.
+
+    Rewriting the result invalidates the copied sidecar, so a sidecar that was current
+    for the source result is re-stamped for the rewritten one.
+    """
+    with open(target_result, 'r') as f:
+        result = json.load(f)
+    execution = result.get('execution') or {}
+    if not execution.get('workspace'):
+        return
+    old_root = os.path.normpath(execution['workspace'])
+    new_root = str(target_result.parent.resolve())
+    relocated = {field: _relocated(execution[field], old_root, new_root)
+                 for field in WORKSPACE_PATH_FIELDS if isinstance(execution.get(field), str) and execution[field]}
+    if all(execution[field] == path for field, path in relocated.items()):
+        return
+    execution.update(relocated)
+
+    validation = load_validation_sidecar(source_result)
+    tmp_result = target_result.with_name(f'.{target_result.name}.{os.getpid()}.tmp')
+    with open(tmp_result, 'w') as f:
+        f.write(json.dumps(result, indent=2))
+    os.replace(tmp_result, target_result)
+    if validation and 'validation' in validation:
+        write_validation_sidecar(target_result, validation['validation'])
+
+    extract_file = Path(execution.get('transcript_extract') or '')
+    document = load_extract(extract_file) if extract_file.name else None
+    if document and document.get('source'):
+        document['source'] = _relocated(document['source'], old_root, new_root)
+        save_extract(document, extract_file)
+
+
+def load_shard_file(model_dir: Path) -> Dict[str, Any]:
+    """The shard assignment recorded by run-all-scenarios.sh, or {} if there is none"""
+    try:
+        with open(model_dir / SHARD_FILE_NAME, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def merge_model_dir(model_dir: Path, output_dir: Path) -> List[str]:
+    """Copy the results and logs of one shard's model directory; returns the merged scenario keys"""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    scenarios = []
+    for result_file in iter_result_files(model_dir):
+        try:
+            result = load_result_fields(result_file, ('language', 'scenario'))
+        except (OSError, ValueError):
+            print(f"{YELLOW}Warning: Skipping unreadable result {result_file}{NC}", file=sys.stderr)
+            continue
+        scenarios.append(f"{result.get('language')}/{result.get('scenario')}")
+        if result_file.parent.name.startswith(WORKSPACE_PREFIX):
+            target_dir = _free_path(output_dir / result_file.parent.name)
+            shutil.copytree(result_file.parent, target_dir, ignore=WORKSPACE_IGNORE, symlinks=True)
+            relocate_workspace_result(result_file, target_dir / result_file.name)
+        else:
+            target = _free_path(output_dir / result_file.name)
+            shutil.copy2(result_file, target)
+            if sidecar_path(result_file).exists():
+                shutil.copy2(sidecar_path(result_file), sidecar_path(target))
+
+    logs_dir = model_dir / 'logs'
+    if logs_dir.is_dir():
+        (output_dir / 'logs').mkdir(exist_ok=True)
+        for log_file in sorted(logs_dir.glob('*.log')):
+            shutil.copy2(log_file, _free_path(output_dir / 'logs' / log_file.name))
+    return scenarios
+
+
+def check_shards(model: str, shards: List[Dict[str, Any]], merged: Dict[str, List[str]]) -> List[str]:
+    """Problems with a model's shard set: missing shards, missing results, duplicated scenarios"""
+    problems = []
+    planned = [shard for shard in shards if shard]
+    if planned:
+        counts = sorted({shard.get('shards') for shard in planned}, key=str)
+        if len(counts) > 1:
+            problems.append(f"{model}: shards come from different splits ({', '.join(map(str, counts))})")
+        else:
+            present = {shard.get('shard') for shard in planned}
+            missing = [str(i) for i in range(1, counts[0] + 1) if i not in present]
+            if missing:
+                problems.append(f"{model}: missing shard(s) {', '.join(missing)} of {counts[0]}")
+
+    owners = {}
+    for source, scenarios in merged.items():
+        for scenario in set(scenarios):
+            owners.setdefault(scenario, []).append(source)
+    for scenario, sources in sorted(owners.items()):
+        if len(sources) > 1:
+            problems.append(f"{model}: {scenario} has results from several shards ({', '.join(sources)})")
+
+    for shard in planned:
+        for scenario in shard.get('scenarios', []):
+            if scenario not in owners:
+                problems.append(f"{model}: no result for {scenario} (shard {shard.get('shard')}/{shard.get('shards')})")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Merge sharded results into one results directory')
+    parser.add_argument('shards', nargs='+', help='Results root directory of each shard')
+    parser.add_argument('--output', required=True, help='Merged results root directory (must be empty or new)')
+    parser.add_argument('--models', help='Comma-separated models to merge (default: all)')
+    parser.add_argument('--strict', action='store_true',
+                        help='Exit with an error if shards or results are missing or duplicated')
+
+    args = parser.parse_args()
+
+    output_root = Path(args.output)
+    if output_root.exists() and any(output_root.iterdir()):
+        print(f"{RED}Error: Output directory is not empty: {output_root}{NC}", file=sys.stderr)
+        sys.exit(1)
+
+    shard_roots = [Path(path) for path in args.shards]
+    for shard_root in shard_roots:
+        if not shard_root.is_dir():
+            print(f"{RED}Error: Shard results directory not found: {shard_root}{NC}", file=sys.stderr)
+            sys.exit(1)
+
+    selected = [m.strip() for m in args.models.split(',')] if args.models else None
+    models = sorted({d.name for root in shard_roots for d in root.iterdir()
+                     if d.is_dir() and (selected is None or d.name in selected)})
+    if not models:
+        print(f"{YELLOW}Warning: No model results found in the shard directories{NC}")
+        sys.exit(0)
+
+    problems = []
+    for model in models:
+        shards = []
+        merged = {}
+        for shard_root in shard_roots:
+            model_dir = shard_root / model
+            if not model_dir.is_dir():
+                continue
+            shard = load_shard_file(model_dir)
+            shards.append(shard)
+            label = f"{shard['shard']}/{shard['shards']}" if shard else str(shard_root)
+            if label in merged:
+                label = f'{label} ({shard_root})'
+            merged[label] = merge_model_dir(model_dir, output_root / model)
+        problems.extend(check_shards(model, shards, merged))
+        total = sum(len(scenarios) for scenarios in merged.values())
+        print(f"{GREEN}✓{NC} {model}: {total} results from {len(merged)} shard(s)")
+
+    for problem in problems:
+        print(f"{YELLOW}Warning: {problem}{NC}")
+
+    print(f"\n{BLUE}Merged results:{NC} {output_root}")
+    if problems and args.strict:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+provision-workspace.py - Create a test workspace from a cached, git-initialized template
+
+A template holding `git init`, the project fixture and the agents tree (under
+.github/agents/) is prepared once per (fixture, agents) revision in
+tests/.cache/workspaces. Run workspaces are materialized from it without full copies:
+every file is cloned copy-on-write where the filesystem supports it (reflinks on
+Linux, clonefile on macOS), falling back to a plain copy. Nothing is hardlinked, so
+an agent editing its own workspace can never change the template or other runs.
+Materializing holds a shared lock on the cache and pruning an exclusive one, so a
+template is never removed while a run is being created from it. The content hash of the agents tree is stored in .git/agents-revision so
+each run can record which agent and skills revision it exercised.
+
+Usage:
+    python provision-workspace.py --workspace <dir> [--fixture <dir>] [--agents <dir>]
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import errno
+import fcntl
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from contextlib import contextmanager
+from typing import List, Optional
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / '.cache' / 'workspaces'
+DEFAULT_CACHE_TEMPLATES = 16
+AGENTS_DIR = Path('.github') / 'agents'
+REVISION_FILE = Path('.git') / 'agents-revision'
+CACHE_LOCK_FILE = '.lock'
+# Bumped when the template layout changes (2: agents copied writable, no longer hardlinked)
+TEMPLATE_LAYOUT = 2
+FICLONE = 0x40049409
+
+
+def _tree_entries(root: Path) -> List[Path]:
+    """Relative paths of all files under root, in a stable order"""
+    entries = []
+    for dirpath, dirs, files in os.walk(root):
+        dirs.sort()
+        for name in sorted(files):
+            entries.append(Path(dirpath, name).relative_to(root))
+    return entries
+
+
+def _fixture_entries(fixture_dir: Path) -> List[Path]:
+    """Fixture files to copy; top-level dotfiles are skipped like `cp -r fixture/*` did"""
+    return [path for path in _tree_entries(fixture_dir) if not path.parts[0].startswith('.')]
+
+
+def template_key(fixture_dir: Optional[Path], agents_dir: Optional[Path]) -> str:
+    """Key a template by the paths, sizes and mtimes of its fixture and agents files"""
+    digest = hashlib.sha256(f'layout:{TEMPLATE_LAYOUT}\0'.encode())
+    for label, root, entries in (('fixture', fixture_dir, _fixture_entries),
+                                 ('agents', agents_dir, _tree_entries)):
+        digest.update(f'{label}:{root}\0'.encode())
+        if not root or not root.is_dir():
+            continue
+        for rel_path in entries(root):
+            st = (root / rel_path).stat()
+            digest.update(f'{rel_path}\0{st.st_size}\0{st.st_mtime_ns}\0'.encode())
+    return digest.hexdigest()[:32]
+
+
+def agents_revision(agents_dir: Optional[Path]) -> str:
+    """Short hash of the agents tree's paths and contents; identical checkouts share it"""
+    if not agents_dir or not agents_dir.is_dir():
+        return ''
+    digest = hashlib.sha256()
+    for rel_path in _tree_entries(agents_dir):
+        digest.update(f'{rel_path}\0'.encode())
+        with open(agents_dir / rel_path, 'rb') as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()[:12]
+
+
+def write_revision(template_dir: Path, agents_dir: Optional[Path]):
+    """Record the agents revision in a template's git directory"""
+    tmp_file = template_dir / REVISION_FILE.with_name(f'.agents-revision.{os.getpid()}.tmp')
+    tmp_file.write_text(agents_revision(agents_dir) + '\n')
+    os.replace(tmp_file, template_dir / REVISION_FILE)
+
+
+def build_template(template_dir: Path, fixture_dir: Optional[Path], agents_dir: Optional[Path]):
+    """Prepare a template directory, publishing it atomically"""
+    template_dir.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=f'.{template_dir.name}.', dir=template_dir.parent))
+    try:
+        subprocess.run(['git', '-C', str(staging), 'init', '--quiet'], check=True)
+        if fixture_dir and fixture_dir.is_dir():
+            for rel_path in _fixture_entries(fixture_dir):
+                (staging / rel_path).parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(fixture_dir / rel_path, staging / rel_path)
+        if agents_dir and agents_dir.is_dir():
+            for rel_path in _tree_entries(agents_dir):
+                target = staging / AGENTS_DIR / rel_path
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(agents_dir / rel_path, target)
+        write_revision(staging, agents_dir)
+        try:
+            os.rename(staging, template_dir)
+        except OSError as e:
+            # Another run published the same template first
+            if e.errno not in (errno.EEXIST, errno.ENOTEMPTY):
+                raise
+            shutil.rmtree(staging, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+
+@contextmanager
+def cache_lock(cache_dir: Path, exclusive: bool):
+    """flock the template cache: shared while materializing, exclusive while pruning"""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    with open(cache_dir / CACHE_LOCK_FILE, 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def prune_templates(cache_dir: Path, keep: int):
+    """Remove the least recently used templates beyond keep; call with the cache locked exclusively"""
+    templates = []
+    for path in cache_dir.iterdir():
+        if path.is_dir() and not path.name.startswith('.'):
+            templates.append((path.stat().st_mtime, path))
+    templates.sort(reverse=True)
+    for _, stale in templates[keep:]:
+        shutil.rmtree(stale, ignore_errors=True)
+
+
+_libc = None
+
+
+def _clonefile(src: Path, dst: Path) -> bool:
+    """Copy-on-write clone of src to dst; False if the filesystem cannot do it"""
+    global _libc
+    if sys.platform == 'darwin':
+        if _libc is None:
+            _libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        return _libc.clonefile(os.fsencode(src), os.fsencode(dst), 0) == 0
+
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        except OSError:
+            return False
+    shutil.copystat(src, dst)
+    return True
+
+
+def materialize(template_dir: Path, workspace: Path) -> dict:
+    """Create a run workspace from a template"""
+    counts = {'cloned': 0, 'copied': 0}
+    reflinks = True
+    workspace.mkdir(parents=True, exist_ok=True)
+    for dirpath, dirs, files in os.walk(template_dir):
+        rel_dir = Path(dirpath).relative_to(template_dir)
+        (workspace / rel_dir).mkdir(exist_ok=True)
+        for name in files:
+            src = Path(dirpath, name)
+            dst = workspace / rel_dir / name
+            if reflinks and _clonefile(src, dst):
+                counts['cloned'] += 1
+                continue
+            # Stop trying once the filesystem has refused a clone
+            reflinks = False
+            shutil.copy2(src, dst)
+            counts['copied'] += 1
+    return counts
+
+
+def provision(workspace: Path, fixture_dir: Optional[Path], agents_dir: Optional[Path],
+              cache_dir: Path = DEFAULT_CACHE_DIR, keep: int = DEFAULT_CACHE_TEMPLATES) -> dict:
+    """Materialize a workspace, building its template first if needed"""
+    template_dir = cache_dir / template_key(fixture_dir, agents_dir)
+    with cache_lock(cache_dir, exclusive=False):
+        built = not template_dir.is_dir()
+        if built:
+            build_template(template_dir, fixture_dir, agents_dir)
+        elif not (template_dir / REVISION_FILE).is_file():
+            # Template cached before revisions were recorded
+            write_revision(template_dir, agents_dir)
+        os.utime(template_dir)
+        counts = materialize(template_dir, workspace)
+    if built:
+        with cache_lock(cache_dir, exclusive=True):
+            prune_templates(cache_dir, keep)
+    counts['template'] = str(template_dir)
+    counts['built'] = built
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Provision a test workspace from a cached template')
+    parser.add_argument('--workspace', required=True, help='Workspace directory to create')
+    parser.add_argument('--fixture', help='Project fixture directory')
+    parser.add_argument('--agents', help='Agents directory, provided as .github/agents/')
+    parser.add_argument('--cache-dir', help=f'Template cache directory (default: {DEFAULT_CACHE_DIR})')
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_TEMPLATES,
+                        help=f'Maximum templates kept (default: {DEFAULT_CACHE_TEMPLATES})')
+
+    args = parser.parse_args()
+
+    fixture_dir = Path(args.fixture).resolve() if args.fixture else None
+    agents_dir = Path(args.agents).resolve() if args.agents else None
+    cache_dir = Path(args.cache_dir) if args.cache_dir else DEFAULT_CACHE_DIR
+
+    counts = provision(Path(args.workspace), fixture_dir, agents_dir, cache_dir, args.cache_size)
+    source = 'new template' if counts['built'] else 'cached template'
+    print(f"✓ Provisioned workspace from {source} ({counts['cloned']} cloned, "
+          f"{counts['copied']} copied)")
+
+
+if __name__ == '__main__':
+    main()
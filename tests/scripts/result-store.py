@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+result-store.py - Ingest test results into the SQLite result store
+
+Usage:
+    # Ingest every model under tests/results (only new or changed results are read)
+    python result-store.py ingest
+
+    # Ingest selected models into a specific database
+    python result-store.py ingest --models claude-sonnet-4,gpt-4-turbo --db results.db
+
+    # Show stored runs per model
+    python result-store.py stats
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from result_store import DEFAULT_DB, ResultStore
+
+# ANSI color codes
+GREEN = '\033[0;32m'
+BLUE = '\033[0;34m'
+NC = '\033[0m'
+
+RESULTS_ROOT = Path(__file__).parent.parent / 'results'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Manage the SQLite result store')
+    parser.add_argument('--db', default=str(DEFAULT_DB), help=f'Database file (default: {DEFAULT_DB})')
+    subparsers = parser.add_subparsers(dest='command', help='Command to execute')
+
+    ingest_parser = subparsers.add_parser('ingest', help='Ingest new or changed result files')
+    ingest_parser.add_argument('--results-dir', help=f'Base results directory (default: {RESULTS_ROOT})')
+    ingest_parser.add_argument('--models', help='Comma-separated models to ingest (default: all)')
+
+    subparsers.add_parser('stats', help='Show stored runs per model')
+
+    args = parser.parse_args()
+
+    if not args.command:
+        parser.print_help()
+        sys.exit(1)
+
+    with ResultStore(Path(args.db)) as store:
+        if args.command == 'ingest':
+            results_root = Path(args.results_dir) if args.results_dir else RESULTS_ROOT
+            models = [m.strip() for m in args.models.split(',')] if args.models else None
+            for model, counts in store.ingest(results_root, models).items():
+                print(f"{GREEN}✓{NC} {model}: {counts['added']} added, {counts['updated']} updated, "
+                      f"{counts['unchanged']} unchanged, {counts['removed']} removed")
+        elif args.command == 'stats':
+            print(f"{BLUE}Result store:{NC} {args.db}")
+            for model, runs in store.counts():
+                print(f"  {model:30} {runs} runs")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+result_loader.py - Shared helpers for locating and reading test result files
+
+validate-result.py records its output in a small sidecar next to each result
+(<name>.validation.json) instead of rewriting the result, whose inlined
+files_created contents can be large. load_result() merges the sidecar back in.
+
+Reports only need a few small top-level fields, so load_results_projected() reads
+just those: each file is read in fixed-size chunks, the top-level object is scanned
+key by key, and only the values of the requested fields are decoded. Skipped values
+(such as the captured file bodies) are stepped over and dropped chunk by chunk, so
+memory use is bounded by the projected fields rather than by the file size.
+
+Usage:
+    from result_loader import iter_result_files, load_result
+    from result_loader import REPORT_FIELDS, load_results_projected
+"""
+
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Any, Optional
+
+SIDECAR_SUFFIX = '.validation.json'
+WORKSPACE_PREFIX = '.workspace-'
+
+# Top-level result fields the summary and comparison reports read
+REPORT_FIELDS = ('scenario', 'language', 'model', 'platform', 'sonarqube_type', 'timestamp', 'status',
+                 'execution', 'documentation_fetches', 'scores', 'validation')
+PROJECTION_WORKERS = min(8, os.cpu_count() or 1)
+# Statuses reports count as passed or failed; anything else (missing, or an unvalidated
+# 'success' or 'timeout') is pending
+FINAL_STATUSES = ('passed', 'failed')
+
+PROJECTION_CHUNK_SIZE = 1 << 20
+
+_WHITESPACE = re.compile(rb'[ \t\r\n]*')
+_STRUCTURAL = re.compile(rb'["\[\]{}]')
+_SCALAR = re.compile(rb'[^,}\]\s]*')
+
+
+def sidecar_path(result_file: Path) -> Path:
+    """Path of the validation sidecar for a result file"""
+    return result_file.with_name(result_file.stem + SIDECAR_SUFFIX)
+
+
+def report_status(status: Optional[str]) -> str:
+    """A result's status as reports count it: passed, failed or pending"""
+    return status if status in FINAL_STATUSES else 'pending'
+
+
+def result_signature(result_file: Path) -> str:
+    """Size and mtime of a result and its sidecar; any rewrite of either changes it"""
+    parts = []
+    for path in (result_file, sidecar_path(result_file)):
+        try:
+            st = path.stat()
+            parts.append(f'{st.st_size}:{st.st_mtime_ns}')
+        except OSError:
+            parts.append('-')
+    return '|'.join(parts)
+
+
+def is_result_file(path: Path) -> bool:
+    """Whether a JSON path is a result (not a sidecar, hidden state file or file captured in a workspace)"""
+    if path.suffix != '.json' or path.name.endswith(SIDECAR_SUFFIX) or path.name.startswith('.'):
+        return False
+    if any(part.startswith(WORKSPACE_PREFIX) for part in path.parent.parts):
+        # Inside a test workspace only result.json is a result
+        return path.name == 'result.json' and path.parent.name.startswith(WORKSPACE_PREFIX)
+    return True
+
+
+def iter_result_files(results_dir: Path, recursive: bool = False) -> Iterator[Path]:
+    """Yield result files in a model's results directory, including workspace result.json files"""
+    if recursive:
+        candidates = results_dir.rglob('*.json')
+    else:
+        candidates = list(results_dir.glob('*.json')) + list(results_dir.glob(f'{WORKSPACE_PREFIX}*/result.json'))
+    for path in sorted(candidates):
+        if path.is_file() and is_result_file(path):
+            yield path
+
+
+def write_validation_sidecar(result_file: Path, validation_result: Dict[str, Any]):
+    """Atomically write validation output next to the result file.
+
+    An identical sidecar is left untouched, so a re-score that changes nothing (such as
+    a validation cache hit) keeps result_signature() and every incremental consumer's
+    view of the result unchanged.
+    """
+    sidecar = sidecar_path(result_file)
+    st = result_file.stat()
+    content = json.dumps({
+        'result_size': st.st_size,
+        'result_mtime_ns': st.st_mtime_ns,
+        'validation': validation_result,
+        'scores': validation_result['scores'],
+        'status': validation_result['status'].lower()
+    }, indent=2)
+    try:
+        with open(sidecar, 'r') as f:
+            if f.read() == content:
+                return
+    except (OSError, UnicodeDecodeError):
+        pass
+    tmp_sidecar = sidecar.with_name(f'.{sidecar.name}.{os.getpid()}.tmp')
+    with open(tmp_sidecar, 'w') as f:
+        f.write(content)
+    os.replace(tmp_sidecar, sidecar)
+
+
+def load_validation_sidecar(result_file: Path) -> Optional[Dict[str, Any]]:
+    """Load the validation sidecar of a result, ignoring it if the result was rewritten since"""
+    try:
+        with open(sidecar_path(result_file), 'r') as f:
+            validation = json.load(f)
+        # A re-run can write a result of the same size, so the mtime must match too
+        st = result_file.stat()
+        if (validation.pop('result_size', None), validation.pop('result_mtime_ns', None)) != (st.st_size, st.st_mtime_ns):
+            return None
+    except (OSError, ValueError):
+        return None
+    return validation
+
+
+def load_result(result_file: Path) -> Dict[str, Any]:
+    """Load a result file with its validation sidecar merged in"""
+    with open(result_file, 'r') as f:
+        result = json.load(f)
+    validation = load_validation_sidecar(result_file)
+    if validation:
+        result.update(validation)
+    return result
+
+
+class _ProjectingReader:
+    """Chunked scanner over one JSON document that decodes only selected top-level fields"""
+
+    def __init__(self, f):
+        self.f = f
+        self.buf = b''
+        self.pos = 0
+        # Start of a value being kept for decoding; everything before it can be dropped
+        self.mark = None
+
+    def _more(self) -> bool:
+        """Read the next chunk, dropping consumed bytes; False at end of file"""
+        chunk = self.f.read(PROJECTION_CHUNK_SIZE)
+        if not chunk:
+            return False
+        drop = self.pos if self.mark is None else min(self.pos, self.mark)
+        self.buf = self.buf[drop:] + chunk
+        self.pos -= drop
+        if self.mark is not None:
+            self.mark -= drop
+        return True
+
+    def _peek(self) -> bytes:
+        """Next non-whitespace byte (not consumed), or b'' at end of file"""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) or not self._more():
+                return self.buf[self.pos:self.pos + 1]
+
+    def _expect(self, char: bytes):
+        if self._peek() != char:
+            raise ValueError(f'Expected {char.decode()!r} in result JSON')
+        self.pos += 1
+
+    def _skip_string(self):
+        """Step over the string starting at pos"""
+        self.pos += 1
+        while True:
+            end = self.buf.find(b'"', self.pos)
+            if end < 0:
+                # Keep a trailing run of backslashes, it decides whether the next quote is escaped
+                tail = len(self.buf)
+                while tail > self.pos and self.buf[tail - 1] == 0x5c:
+                    tail -= 1
+                self.pos = tail
+                if not self._more():
+                    raise ValueError('Unterminated string in result JSON')
+                continue
+            backslashes = 0
+            while end - 1 - backslashes >= 0 and self.buf[end - 1 - backslashes] == 0x5c:
+                backslashes += 1
+            self.pos = end + 1
+            if backslashes % 2 == 0:
+                return
+
+    def _skip_value(self):
+        """Step over the value starting at the next non-whitespace byte"""
+        first = self._peek()
+        if first == b'"':
+            self._skip_string()
+        elif first in (b'{', b'['):
+            depth = 0
+            while True:
+                match = _STRUCTURAL.search(self.buf, self.pos)
+                if not match:
+                    self.pos = len(self.buf)
+                    if not self._more():
+                        raise ValueError('Unterminated container in result JSON')
+                    continue
+                self.pos = match.start()
+                char = self.buf[self.pos]
+                if char == 0x22:
+                    self._skip_string()
+                    continue
+                self.pos += 1
+                depth += 1 if char in (0x5b, 0x7b) else -1
+                if depth == 0:
+                    return
+        elif first:
+            while True:
+                end = _SCALAR.match(self.buf, self.pos).end()
+                if end < len(self.buf) or not self._more():
+                    break
+            if end == self.pos:
+                raise ValueError('Malformed value in result JSON')
+            self.pos = end
+        else:
+            raise ValueError('Unexpected end of result JSON')
+
+    def _decode_value(self) -> Any:
+        """Decode the value starting at the next non-whitespace byte"""
+        self._peek()
+        self.mark = self.pos
+        self._skip_value()
+        value = json.loads(self.buf[self.mark:self.pos])
+        self.mark = None
+        return value
+
+    def project(self, fields: frozenset) -> Dict[str, Any]:
+        projected = {}
+        self._expect(b'{')
+        if self._peek() == b'}':
+            return projected
+        while True:
+            if self._peek() != b'"':
+                raise ValueError('Expected a key in result JSON')
+            key = self._decode_value()
+            self._expect(b':')
+            if key in fields:
+                projected[key] = self._decode_value()
+            else:
+                self._skip_value()
+            separator = self._peek()
+            self.pos += 1
+            if separator == b'}':
+                return projected
+            if separator != b',':
+                raise ValueError("Expected ',' or '}' in result JSON")
+
+
+def load_result_fields(result_file: Path, fields: Iterable[str]) -> Dict[str, Any]:
+    """Load only the given top-level fields of a result, with its validation sidecar merged in"""
+    with open(result_file, 'rb') as f:
+        result = _ProjectingReader(f).project(frozenset(fields))
+    validation = load_validation_sidecar(result_file)
+    if validation:
+        result.update((key, value) for key, value in validation.items() if key in fields)
+    return result
+
+
+def load_results_projected(result_files: Iterable[Path], fields: Iterable[str] = REPORT_FIELDS,
+                           workers: int = PROJECTION_WORKERS) -> List[Dict[str, Any]]:
+    """load_result_fields() for many files on a thread pool, in the given order"""
+    fields = frozenset(fields)
+    result_files = list(result_files)
+    if workers <= 1 or len(result_files) <= 1:
+        return [load_result_fields(path, fields) for path in result_files]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda path: load_result_fields(path, fields), result_files))
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+result_store.py - SQLite store of test results for reporting
+
+Result files (with their validation sidecars) are ingested into an embedded SQLite
+database with one row per run plus its checkpoints, failures and documentation
+fetches, indexed on model, language, platform, scenario and timestamp. Ingest is
+incremental: a result is only re-read when it or its sidecar changed on disk, and
+rows of deleted results are dropped. Reports then query aggregates instead of
+parsing every result file.
+
+Usage:
+    from result_store import ResultStore
+    with ResultStore() as store:
+        store.ingest_model_dir('claude-sonnet-4', results_dir / 'claude-sonnet-4')
+        stats = store.model_stats('claude-sonnet-4')
+"""
+
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+from result_loader import REPORT_FIELDS, iter_result_files, load_result_fields, report_status, result_signature
+
+DEFAULT_DB = Path(__file__).parent.parent / '.cache' / 'results.db'
+SCHEMA_VERSION = 1
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    file TEXT NOT NULL,
+    model TEXT NOT NULL,
+    language TEXT,
+    scenario TEXT,
+    platform TEXT,
+    sonarqube_type TEXT,
+    timestamp TEXT,
+    status TEXT,
+    score_total NUMERIC,
+    accuracy NUMERIC,
+    security NUMERIC,
+    efficiency NUMERIC,
+    currency NUMERIC,
+    usability NUMERIC,
+    duration_seconds NUMERIC,
+    timed_out INTEGER NOT NULL DEFAULT 0,
+    total_tokens INTEGER,
+    cost NUMERIC,
+    doc_fetch_count INTEGER,
+    source_signature TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_model ON runs (model);
+CREATE INDEX IF NOT EXISTS runs_language ON runs (model, language);
+CREATE INDEX IF NOT EXISTS runs_platform ON runs (model, platform);
+CREATE INDEX IF NOT EXISTS runs_scenario ON runs (language, scenario);
+CREATE INDEX IF NOT EXISTS runs_timestamp ON runs (model, timestamp);
+
+CREATE TABLE IF NOT EXISTS checkpoints (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT,
+    status TEXT,
+    message TEXT,
+    score NUMERIC
+);
+CREATE INDEX IF NOT EXISTS checkpoints_run ON checkpoints (run_id);
+CREATE INDEX IF NOT EXISTS checkpoints_name ON checkpoints (name, status);
+
+CREATE TABLE IF NOT EXISTS failures (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    message TEXT
+);
+CREATE INDEX IF NOT EXISTS failures_run ON failures (run_id);
+
+CREATE TABLE IF NOT EXISTS doc_fetches (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    url TEXT,
+    domain TEXT,
+    timestamp TEXT
+);
+CREATE INDEX IF NOT EXISTS doc_fetches_run ON doc_fetches (run_id);
+CREATE INDEX IF NOT EXISTS doc_fetches_domain ON doc_fetches (domain);
+'''
+
+SCORE_COLUMNS = ('accuracy', 'security', 'efficiency', 'currency', 'usability')
+LATENCY_PERCENTILES = (50, 95, 99)
+# Result fields stored; the captured files_created contents are never read
+STORE_FIELDS = REPORT_FIELDS + ('checkpoints',)
+
+
+def latency_percentiles(durations: List[float]) -> Dict[str, Optional[float]]:
+    """latency_p50/p95/p99 of run durations (linear interpolation), None without durations"""
+    ordered = sorted(durations)
+    percentiles = {}
+    for percentile in LATENCY_PERCENTILES:
+        value = None
+        if ordered:
+            rank = (len(ordered) - 1) * percentile / 100
+            low = int(rank)
+            high = min(low + 1, len(ordered) - 1)
+            value = ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+        percentiles[f'latency_p{percentile}'] = value
+    return percentiles
+
+
+def _number(value: Any) -> Optional[float]:
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+class ResultStore:
+    """Embedded SQLite store of runs, checkpoints, failures and documentation fetches"""
+
+    def __init__(self, db_path: Path = DEFAULT_DB):
+        self.db_path = db_path
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(db_path), timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        # Same passed/failed/pending rule as the JSON summary path
+        self.conn.create_function('report_status', 1, report_status)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA foreign_keys=ON')
+        if self.conn.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+            self._reset()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def _reset(self):
+        """Create the schema, dropping tables of an older schema version"""
+        with self.conn:
+            for table in ('doc_fetches', 'failures', 'checkpoints', 'runs'):
+                self.conn.execute(f'DROP TABLE IF EXISTS {table}')
+            self.conn.executescript(SCHEMA)
+            self.conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
+    # Ingest
+
+    def ingest_model_dir(self, model: str, model_dir: Path) -> Dict[str, int]:
+        """Bring a model's rows in line with its results directory"""
+        counts = {'added': 0, 'updated': 0, 'unchanged': 0, 'removed': 0}
+        known = {row['path']: (row['id'], row['source_signature']) for row in self.conn.execute(
+            'SELECT id, path, source_signature FROM runs WHERE model = ?', (model,))}
+        seen = set()
+        with self.conn:
+            for result_file in iter_result_files(model_dir):
+                path = str(result_file.resolve())
+                seen.add(path)
+                signature = result_signature(result_file)
+                existing = known.get(path)
+                if existing and existing[1] == signature:
+                    counts['unchanged'] += 1
+                    continue
+                try:
+                    result = load_result_fields(result_file, STORE_FIELDS)
+                except (OSError, ValueError):
+                    continue
+                if existing:
+                    self.conn.execute('DELETE FROM runs WHERE id = ?', (existing[0],))
+                self._insert_run(path, str(result_file.relative_to(model_dir)), model, result, signature)
+                counts['updated' if existing else 'added'] += 1
+            for path, (run_id, _) in known.items():
+                if path not in seen:
+                    self.conn.execute('DELETE FROM runs WHERE id = ?', (run_id,))
+                    counts['removed'] += 1
+        return counts
+
+    def ingest(self, results_root: Path, models: Optional[List[str]] = None) -> Dict[str, Dict[str, int]]:
+        """Ingest the given models (default: every model directory under results_root)"""
+        if models is None:
+            models = sorted(p.name for p in results_root.iterdir() if p.is_dir()) if results_root.is_dir() else []
+        return {model: self.ingest_model_dir(model, results_root / model) for model in models}
+
+    def _insert_run(self, path: str, file: str, model: str, result: Dict[str, Any], signature: str):
+        scores = result.get('scores') or {}
+        execution = result.get('execution') or {}
+        doc_fetches = result.get('documentation_fetches') or {}
+        validation = result.get('validation') or {}
+        cursor = self.conn.execute(
+            '''INSERT INTO runs (path, file, model, language, scenario, platform, sonarqube_type, timestamp,
+                                 status, score_total, accuracy, security, efficiency, currency, usability,
+                                 duration_seconds, timed_out, total_tokens, cost, doc_fetch_count, source_signature)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+            (path, file, model, result.get('language'), result.get('scenario'), result.get('platform'),
+             result.get('sonarqube_type'), result.get('timestamp'), result.get('status'),
+             _number(scores.get('total')), *(_number(scores.get(column)) for column in SCORE_COLUMNS),
+             _number(execution.get('duration_seconds')), 1 if execution.get('timed_out') else 0,
+             _number(execution.get('total_tokens')), _number(execution.get('cost')),
+             _number(doc_fetches.get('total_count')), signature))
+        run_id = cursor.lastrowid
+
+        checkpoints = validation.get('checkpoints') or result.get('checkpoints') or []
+        self.conn.executemany(
+            'INSERT INTO checkpoints (run_id, position, name, status, message, score) VALUES (?, ?, ?, ?, ?, ?)',
+            [(run_id, i, c.get('name'), c.get('status'), str(c.get('message', '')), _number(c.get('score')))
+             for i, c in enumerate(checkpoints) if isinstance(c, dict)])
+        self.conn.executemany(
+            'INSERT INTO failures (run_id, position, message) VALUES (?, ?, ?)',
+            [(run_id, i, str(message)) for i, message in enumerate(validation.get('failures') or [])])
+        pages = doc_fetches.get('pages') or []
+        domains = doc_fetches.get('domains') or []
+        self.conn.executemany(
+            'INSERT INTO doc_fetches (run_id, position, url, domain, timestamp) VALUES (?, ?, ?, ?, ?)',
+            [(run_id, i, page.get('url'), domains[i] if i < len(domains) else None, page.get('timestamp'))
+             for i, page in enumerate(pages) if isinstance(page, dict)])
+
+    # Queries
+
+    def model_stats(self, model: str) -> Dict[str, Any]:
+        """compare-models.py statistics for one model in a single aggregate query"""
+        row = self.conn.execute(
+            f'''SELECT COUNT(*) AS total_scenarios,
+                       COALESCE(SUM(status = 'passed'), 0) AS passed,
+                       COALESCE(SUM(status = 'failed'), 0) AS failed,
+                       COALESCE(AVG(COALESCE(score_total, 0)), 0) AS avg_score,
+                       {', '.join(f"COALESCE(AVG(COALESCE({c}, 0)), 0) AS avg_{c}" for c in SCORE_COLUMNS)},
+                       COALESCE(SUM(total_tokens), 0) AS total_tokens,
+                       COUNT(total_tokens) AS metered_runs,
+                       COALESCE(AVG(total_tokens), 0) AS avg_tokens,
+                       COALESCE(SUM(cost), 0) AS total_cost,
+                       COUNT(cost) AS priced_runs,
+                       COALESCE(AVG(cost), 0) AS avg_cost,
+                       COALESCE(SUM(CASE WHEN cost IS NOT NULL THEN COALESCE(score_total, 0) END), 0) AS priced_score,
+                       COALESCE(SUM(doc_fetch_count), 0) AS total_doc_fetches,
+                       COALESCE(AVG(COALESCE(doc_fetch_count, 0)), 0) AS avg_doc_fetches
+                FROM runs WHERE model = ?''', (model,)).fetchone()
+        stats = dict(row)
+        total = stats['total_scenarios']
+        stats['pass_rate'] = (stats['passed'] / total * 100) if total > 0 else 0
+        stats['total_tokens'] = int(stats['total_tokens'])
+        priced_score = stats.pop('priced_score')
+        stats['score_per_dollar'] = priced_score / stats['total_cost'] if stats['total_cost'] > 0 else None
+        stats.update(latency_percentiles([row['duration_seconds'] for row in self.conn.execute(
+            'SELECT duration_seconds FROM runs WHERE model = ? AND duration_seconds IS NOT NULL', (model,))]))
+        return stats
+
+    def summary_stats(self, model: str) -> Dict[str, Any]:
+        """generate-summary.py overall statistics for one model"""
+        row = self.conn.execute(
+            '''SELECT COUNT(*) AS total_scenarios,
+                      COALESCE(SUM(status = 'passed'), 0) AS passed,
+                      COALESCE(SUM(status = 'failed'), 0) AS failed,
+                      COALESCE(SUM(report_status(status) = 'pending'), 0) AS pending,
+                      COALESCE(AVG(score_total), 0) AS avg_score,
+                      COALESCE(AVG(CASE WHEN doc_fetch_count > 0 THEN doc_fetch_count END), 0) AS avg_doc_fetches
+               FROM runs WHERE model = ?''', (model,)).fetchone()
+        stats = dict(row)
+        total = stats['total_scenarios']
+        stats['pass_rate'] = (stats['passed'] / total * 100) if total > 0 else 0
+        return stats
+
+    def language_breakdown(self, model: str) -> Dict[str, Dict[str, int]]:
+        """Run counts per language and status"""
+        breakdown = {}
+        for row in self.conn.execute(
+                '''SELECT COALESCE(language, 'unknown') AS language, COUNT(*) AS total,
+                          SUM(status = 'passed') AS passed, SUM(status = 'failed') AS failed,
+                          SUM(report_status(status) = 'pending') AS pending
+                   FROM runs WHERE model = ? GROUP BY 1''', (model,)):
+            breakdown[row['language']] = {key: row[key] for key in ('total', 'passed', 'failed', 'pending')}
+        return breakdown
+
+    def score_rows(self, model: str) -> List[Dict[str, Any]]:
+        """Per-run scores, documentation fetch counts and failures, in result file order"""
+        runs = [dict(row) for row in self.conn.execute(
+            f'''SELECT id, file, language, scenario, status, score_total, {', '.join(SCORE_COLUMNS)}, doc_fetch_count
+                FROM runs WHERE model = ? ORDER BY file''', (model,))]
+        failures = {}
+        for row in self.conn.execute(
+                '''SELECT f.run_id, f.message FROM failures f JOIN runs r ON r.id = f.run_id
+                   WHERE r.model = ? AND r.status = 'failed' ORDER BY f.run_id, f.position''', (model,)):
+            failures.setdefault(row['run_id'], []).append(row['message'])
+        for run in runs:
+            run['failures'] = failures.get(run['id'], [])
+        return runs
+
+    def metric_columns(self, model: str) -> Dict[str, List[float]]:
+        """Per-run pass indicator (100 or 0) and score columns, in result file order"""
+        columns = {'passed': [], 'total': [], **{column: [] for column in SCORE_COLUMNS}}
+        for row in self.conn.execute(
+                f'''SELECT status = 'passed' AS passed, COALESCE(score_total, 0) AS total,
+                          {', '.join(f"COALESCE({c}, 0) AS {c}" for c in SCORE_COLUMNS)}
+                   FROM runs WHERE model = ? ORDER BY file, id''', (model,)):
+            columns['passed'].append(100.0 if row['passed'] else 0.0)
+            for name in ('total',) + SCORE_COLUMNS:
+                columns[name].append(float(row[name]))
+        return columns
+
+    def counts(self) -> List[Tuple[str, int]]:
+        """Number of runs per model"""
+        return [(row['model'], row['runs']) for row in self.conn.execute(
+            'SELECT model, COUNT(*) AS runs FROM runs GROUP BY model ORDER BY model')]
+
@@ -1,7 +1,9 @@
 #!/usr/bin/env bash
 
 # run-all-scenarios.sh - Execute all test scenarios or filtered subset
-# Usage: ./run-all-scenarios.sh [--model <model>] [--language <lang>] [--platform <platform>]
+# Usage: ./run-all-scenarios.sh [--model <model>] [--language <lang>] [--platform <platform>] [--parallel] [--jobs <n>]
+#                               [--scenario-timeout <seconds>] [--suite-timeout <seconds>]
+#                               [--shard <i>/<n>] [--history <results-dir>]
 
 set -euo pipefail
 
@@ -13,6 +15,13 @@ MODEL="${MODEL:-claude-sonnet-4}"
 FILTER_LANGUAGE=""
 FILTER_PLATFORM=""
 PARALLEL=false
+JOBS=""
+DEFAULT_JOBS=4
+SCENARIO_TIMEOUT=""
+SUITE_TIMEOUT=""
+SHARD=""
+HISTORY_DIR=""
+SCENARIO_ARGS=()
 
 # Colors
 RED='\033[0;31m'
@@ -40,6 +49,35 @@ while [[ $# -gt 0 ]]; do
       PARALLEL=true
       shift
       ;;
+    --jobs|-j)
+      JOBS="$2"
+      PARALLEL=true
+      shift 2
+      ;;
+    --scenario-timeout)
+      SCENARIO_TIMEOUT="$2"
+      shift 2
+      ;;
+    --suite-timeout)
+      SUITE_TIMEOUT="$2"
+      shift 2
+      ;;
+    --shard)
+      SHARD="$2"
+      shift 2
+      ;;
+    --history)
+      HISTORY_DIR="$2"
+      shift 2
+      ;;
+    --record|--replay|--time-scale)
+      SCENARIO_ARGS+=("$1" "$2")
+      shift 2
+      ;;
+    --doc-proxy|--doc-offline)
+      SCENARIO_ARGS+=("$1")
+      shift
+      ;;
     --help|-h)
       echo "Usage: $0 [OPTIONS]"
       echo ""
@@ -47,12 +85,26 @@ while [[ $# -gt 0 ]]; do
       echo "  --model <name>      LLM model to use (default: claude-sonnet-4)"
       echo "  --language <lang>   Filter by language (maven, gradle, dotnet, javascript, python)"
       echo "  --platform <plat>   Filter by platform string in filename"
-      echo "  --parallel          Run scenarios in parallel (experimental)"
+      echo "  --parallel          Run scenarios in parallel ($DEFAULT_JOBS at a time unless --jobs is given)"
+      echo "  --jobs <n>          Maximum scenarios running at once (implies --parallel)"
+      echo "  --scenario-timeout <s>  Stop a scenario's agent after this many seconds"
+      echo "  --suite-timeout <s>     Stop the suite after this many seconds; unstarted scenarios are skipped"
+      echo "  --shard <i>/<n>     Run only shard i of n (scenarios split evenly by recorded duration)"
+      echo "  --history <dir>     Results root used for duration estimates (default: tests/results)"
+      echo "  --record <dir>      Record every agent run under <dir> (see run-scenario.sh)"
+      echo "  --replay <dir>      Replay recorded runs from <dir> instead of calling copilot"
+      echo "  --time-scale <f>    Scale replayed timing (0 = no delays)"
+      echo "  --doc-proxy         Serve agent HTTP fetches through the caching documentation proxy"
+      echo "  --doc-offline       Serve documentation only from the proxy cache (no network)"
       echo ""
       echo "Examples:"
       echo "  $0 --model claude-sonnet-4"
       echo "  $0 --language maven --model gpt-4-turbo"
       echo "  $0 --language javascript --platform github"
+      echo "  $0 --model claude-sonnet-4 --parallel --jobs 8"
+      echo "  $0 --jobs 4 --scenario-timeout 900 --suite-timeout 3600"
+      echo "  $0 --replay ../recordings --time-scale 0 --jobs 32"
+      echo "  $0 --shard 2/4 --history ../previous-results --jobs 4"
       exit 0
       ;;
     *)
@@ -62,6 +114,26 @@ while [[ $# -gt 0 ]]; do
   esac
 done
 
+if [[ "$PARALLEL" == "true" ]]; then
+  JOBS="${JOBS:-$DEFAULT_JOBS}"
+else
+  JOBS=1
+fi
+if ! [[ "$JOBS" =~ ^[1-9][0-9]*$ ]]; then
+  echo -e "${RED}Error: --jobs must be a positive integer${NC}" >&2
+  exit 1
+fi
+if [[ -n "$SHARD" ]] && ! [[ "$SHARD" =~ ^[1-9][0-9]*/[1-9][0-9]*$ ]]; then
+  echo -e "${RED}Error: --shard must look like <i>/<n>, e.g. 2/4${NC}" >&2
+  exit 1
+fi
+for timeout in "$SCENARIO_TIMEOUT" "$SUITE_TIMEOUT"; do
+  if [[ -n "$timeout" ]] && ! [[ "$timeout" =~ ^[1-9][0-9]*$ ]]; then
+    echo -e "${RED}Error: timeouts must be a positive number of seconds${NC}" >&2
+    exit 1
+  fi
+done
+
 # Find all scenario files
 SCENARIOS_DIR="$TESTS_DIR/scenarios"
 SCENARIO_FILES=()
@@ -94,6 +166,38 @@ if [[ $TOTAL_SCENARIOS -eq 0 ]]; then
   exit 1
 fi
 
+# Longest-first by recorded duration, so slow scenarios do not start last and leave
+# the other workers idle; discovery order is kept if there is no usable schedule
+SCHEDULE_ARGS=(--model "$MODEL")
+if [[ -n "$HISTORY_DIR" ]]; then
+  SCHEDULE_ARGS+=(--results-dir "$HISTORY_DIR")
+fi
+if [[ -n "$SHARD" ]]; then
+  # The shard's assignment is recorded next to its results for merge-shards.py
+  SCHEDULE_ARGS+=(--shard "$SHARD" --shard-file "$TESTS_DIR/results/$MODEL/.shard.json")
+fi
+SCENARIO_ESTIMATES=()
+if SCHEDULE=$(python3 "$SCRIPT_DIR/schedule-scenarios.py" "${SCHEDULE_ARGS[@]}" "${SCENARIO_FILES[@]}"); then
+  SCENARIO_FILES=()
+  SCENARIO_ESTIMATES=()
+  while IFS=$'\t' read -r estimate file; do
+    if [[ -n "$file" ]]; then
+      SCENARIO_ESTIMATES+=("$estimate")
+      SCENARIO_FILES+=("$file")
+    fi
+  done <<< "$SCHEDULE"
+elif [[ -n "$SHARD" ]]; then
+  # Running every scenario on every shard would duplicate work, so fail instead
+  echo -e "${RED}Error: Could not compute shard $SHARD${NC}" >&2
+  exit 1
+fi
+
+TOTAL_SCENARIOS=${#SCENARIO_FILES[@]}
+if [[ $TOTAL_SCENARIOS -eq 0 ]]; then
+  echo -e "${YELLOW}Shard $SHARD has no scenarios${NC}"
+  exit 0
+fi
+
 # Print header
 echo ""
 echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
@@ -108,30 +212,137 @@ fi
 if [[ -n "$FILTER_PLATFORM" ]]; then
   echo -e "${BLUE}Platform Filter:${NC} $FILTER_PLATFORM"
 fi
+if [[ -n "$SHARD" ]]; then
+  echo -e "${BLUE}Shard:${NC} $SHARD"
+fi
+if [[ -n "$SCENARIO_TIMEOUT" ]]; then
+  echo -e "${BLUE}Scenario Timeout:${NC} ${SCENARIO_TIMEOUT}s"
+fi
+if [[ -n "$SUITE_TIMEOUT" ]]; then
+  echo -e "${BLUE}Suite Timeout:${NC} ${SUITE_TIMEOUT}s"
+fi
 echo ""
 echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
 echo ""
 
-# Run scenarios
+# Per-scenario logs (run-scenario.sh output) live next to the results
+LOGS_DIR="$TESTS_DIR/results/$MODEL/logs"
+mkdir -p "$LOGS_DIR"
+
+# Run scenarios through a bounded pool of worker slots. Each worker is a separate
+# run-scenario.sh process with its own workspace (.workspace-<scenario>-<pid>), and
+# results are collected as soon as each worker exits.
 PASSED=0
 FAILED=0
-CURRENT=0
-
-for scenario in "${SCENARIO_FILES[@]}"; do
-  CURRENT=$((CURRENT + 1))
-  REL_PATH="${scenario#$SCENARIOS_DIR/}"
-  
-  echo -e "${YELLOW}[$CURRENT/$TOTAL_SCENARIOS]${NC} Running: $REL_PATH"
-  
-  if "$SCRIPT_DIR/run-scenario.sh" "$REL_PATH" --model "$MODEL" > /dev/null 2>&1; then
-    echo -e "  ${GREEN}✓ PASSED${NC}"
+TIMED_OUT=0
+SKIPPED=0
+SKIPPED_NAMES=()
+LAUNCHED=0
+FINISHED=0
+RUNNING=0
+SLOT_PID=()
+SLOT_NAME=()
+SLOT_LOG=()
+SLOT_START=()
+for ((slot = 0; slot < JOBS; slot++)); do
+  SLOT_PID[$slot]=""
+done
+SUITE_START=$(date +%s)
+
+stop_workers() {
+  for ((slot = 0; slot < JOBS; slot++)); do
+    if [[ -n "${SLOT_PID[$slot]}" ]]; then
+      kill "${SLOT_PID[$slot]}" 2>/dev/null || true
+    fi
+  done
+  echo -e "\n${RED}Interrupted, stopped running scenarios${NC}"
+  exit 130
+}
+trap stop_workers INT TERM
+
+collect_worker() {
+  local slot=$1
+  local pid="${SLOT_PID[$slot]}"
+  local elapsed
+  FINISHED=$((FINISHED + 1))
+  RUNNING=$((RUNNING - 1))
+  local status=0
+  wait "$pid" || status=$?
+  elapsed=$(($(date +%s) - SLOT_START[$slot]))
+  if [[ $status -eq 0 ]]; then
+    echo -e "${YELLOW}[$FINISHED/$TOTAL_SCENARIOS]${NC} ${GREEN}✓ PASSED${NC} ${SLOT_NAME[$slot]} (${elapsed}s)"
     PASSED=$((PASSED + 1))
+  elif [[ $status -eq 124 ]]; then
+    echo -e "${YELLOW}[$FINISHED/$TOTAL_SCENARIOS]${NC} ${RED}⏱ TIMED OUT${NC} ${SLOT_NAME[$slot]} (${elapsed}s, log: ${SLOT_LOG[$slot]})"
+    TIMED_OUT=$((TIMED_OUT + 1))
   else
-    echo -e "  ${RED}✗ FAILED${NC}"
+    echo -e "${YELLOW}[$FINISHED/$TOTAL_SCENARIOS]${NC} ${RED}✗ FAILED${NC} ${SLOT_NAME[$slot]} (${elapsed}s, log: ${SLOT_LOG[$slot]})"
     FAILED=$((FAILED + 1))
   fi
+  SLOT_PID[$slot]=""
+}
+
+if [[ $JOBS -gt 1 ]]; then
+  echo -e "${BLUE}Workers:${NC} $JOBS"
   echo ""
+fi
+
+while [[ $FINISHED -lt $TOTAL_SCENARIOS ]]; do
+  # Fill free slots
+  for ((slot = 0; slot < JOBS; slot++)); do
+    if [[ -z "${SLOT_PID[$slot]}" && $LAUNCHED -lt $TOTAL_SCENARIOS ]]; then
+      scenario="${SCENARIO_FILES[$LAUNCHED]}"
+      REL_PATH="${scenario#$SCENARIOS_DIR/}"
+      LOG_FILE="$LOGS_DIR/$(echo "${REL_PATH%.yaml}" | tr '/' '-').log"
+      LAUNCHED=$((LAUNCHED + 1))
+
+      # A scenario gets its own timeout, cut short by whatever is left of the suite's
+      RUN_TIMEOUT="$SCENARIO_TIMEOUT"
+      if [[ -n "$SUITE_TIMEOUT" ]]; then
+        REMAINING=$((SUITE_START + SUITE_TIMEOUT - $(date +%s)))
+        if [[ $REMAINING -le 0 ]]; then
+          FINISHED=$((FINISHED + 1))
+          SKIPPED=$((SKIPPED + 1))
+          SKIPPED_NAMES+=("$REL_PATH")
+          echo -e "${YELLOW}[$FINISHED/$TOTAL_SCENARIOS]${NC} ${YELLOW}⊘ SKIPPED${NC} $REL_PATH (suite timeout reached)"
+          continue
+        fi
+        if [[ -z "$RUN_TIMEOUT" || $REMAINING -lt $RUN_TIMEOUT ]]; then
+          RUN_TIMEOUT=$REMAINING
+        fi
+      fi
+      RUN_ARGS=(--model "$MODEL")
+      if [[ -n "$RUN_TIMEOUT" ]]; then
+        RUN_ARGS+=(--timeout "$RUN_TIMEOUT")
+      fi
+
+      RUNNING=$((RUNNING + 1))
+      if [[ ${#SCENARIO_ESTIMATES[@]} -gt 0 ]]; then
+        echo -e "${BLUE}[start]${NC} $REL_PATH (~${SCENARIO_ESTIMATES[$((LAUNCHED - 1))]}s)"
+      else
+        echo -e "${BLUE}[start]${NC} $REL_PATH"
+      fi
+      "$SCRIPT_DIR/run-scenario.sh" "$REL_PATH" "${RUN_ARGS[@]}" ${SCENARIO_ARGS[@]+"${SCENARIO_ARGS[@]}"} > "$LOG_FILE" 2>&1 &
+      SLOT_PID[$slot]=$!
+      SLOT_NAME[$slot]="$REL_PATH"
+      SLOT_LOG[$slot]="$LOG_FILE"
+      SLOT_START[$slot]=$(date +%s)
+    fi
+  done
+
+  # Collect finished workers (bash 3.2 has no wait -n, so poll)
+  COLLECTED=false
+  for ((slot = 0; slot < JOBS; slot++)); do
+    if [[ -n "${SLOT_PID[$slot]}" ]] && ! kill -0 "${SLOT_PID[$slot]}" 2>/dev/null; then
+      collect_worker "$slot"
+      COLLECTED=true
+    fi
+  done
+  if [[ "$COLLECTED" == "false" && $RUNNING -gt 0 ]]; then
+    sleep 1
+  fi
 done
+trap - INT TERM
 
 # Summary
 echo ""
@@ -142,20 +353,31 @@ echo ""
 echo -e "Total Scenarios: $TOTAL_SCENARIOS"
 echo -e "${GREEN}Passed: $PASSED${NC}"
 echo -e "${RED}Failed: $FAILED${NC}"
-
-if [[ $FAILED -eq 0 ]]; then
-  echo -e "\n${GREEN}✓ All tests passed!${NC}"
-  echo ""
-else
-  echo -e "\n${RED}✗ Some tests failed${NC}"
-  echo ""
-  exit 1
+if [[ $TIMED_OUT -gt 0 ]]; then
+  echo -e "${RED}Timed out: $TIMED_OUT${NC}"
 fi
+if [[ $SKIPPED -gt 0 ]]; then
+  echo -e "${YELLOW}Skipped: $SKIPPED${NC} (suite timeout)"
+  for name in "${SKIPPED_NAMES[@]}"; do
+    echo "  - $name"
+  done
+fi
+echo -e "Logs: $LOGS_DIR/"
 
-# Generate summary report
+# Generate the summary report, also for partial runs
+echo ""
 echo "Generating summary report..."
-"$SCRIPT_DIR/generate-summary.py" --model "$MODEL"
+python3 "$SCRIPT_DIR/generate-summary.py" --model "$MODEL" || true
 
 echo ""
 echo "Results saved to: $TESTS_DIR/results/$MODEL/"
 echo ""
+
+if [[ $FAILED -eq 0 && $TIMED_OUT -eq 0 && $SKIPPED -eq 0 ]]; then
+  echo -e "${GREEN}✓ All tests passed!${NC}"
+  echo ""
+else
+  echo -e "${RED}✗ Some tests failed, timed out or were skipped${NC}"
+  echo ""
+  exit 1
+fi
@@ -1,7 +1,7 @@
 #!/usr/bin/env bash
 
 # run-scenario.sh - Execute a single test scenario
-# Usage: ./run-scenario.sh <scenario-file> --model <model-name> [--verbose]
+# Usage: ./run-scenario.sh <scenario-file> --model <model-name> [--verbose] [--timeout <seconds>] [--record <dir> | --replay <dir>] [--doc-proxy | --doc-offline]
 
 set -euo pipefail
 
@@ -13,6 +13,11 @@ WORKSPACE_ROOT="$(dirname "$TESTS_DIR")"
 MODEL="${MODEL:-claude-sonnet-4}"
 VERBOSE=false
 SCENARIO_FILE=""
+RECORD_DIR=""
+REPLAY_DIR=""
+TIME_SCALE=1
+DOC_PROXY=""
+TIMEOUT=""
 TIMESTAMP=$(date +"%Y-%m-%d_%H-%M-%S")
 
 # Colors for output
@@ -37,16 +42,47 @@ while [[ $# -gt 0 ]]; do
       VERBOSE=true
       shift
       ;;
+    --record)
+      RECORD_DIR="$2"
+      shift 2
+      ;;
+    --replay)
+      REPLAY_DIR="$2"
+      shift 2
+      ;;
+    --time-scale)
+      TIME_SCALE="$2"
+      shift 2
+      ;;
+    --timeout)
+      TIMEOUT="$2"
+      shift 2
+      ;;
+    --doc-proxy)
+      DOC_PROXY="online"
+      shift
+      ;;
+    --doc-offline)
+      DOC_PROXY="offline"
+      shift
+      ;;
     --help|-h)
-      echo "Usage: $0 <scenario-file> --model <model-name> [--verbose]"
+      echo "Usage: $0 <scenario-file> --model <model-name> [--verbose] [--timeout <seconds>] [--record <dir> | --replay <dir>] [--doc-proxy | --doc-offline]"
       echo ""
       echo "Arguments:"
       echo "  scenario-file    Path to scenario YAML file (relative to tests/scenarios/)"
       echo "  --model          LLM model to use (default: claude-sonnet-4)"
       echo "  --verbose        Enable verbose output"
+      echo "  --timeout <s>    Stop the agent once the scenario has run this many seconds (exit code 124)"
+      echo "  --record <dir>   Record the agent run to <dir>/<language>/<scenario>/"
+      echo "  --replay <dir>   Replay <dir>/<language>/<scenario>/ instead of calling copilot (offline)"
+      echo "  --time-scale <f> Scale replayed timing (0 = no delays, default: 1)"
+      echo "  --doc-proxy      Route agent HTTP through the caching documentation proxy"
+      echo "  --doc-offline    Like --doc-proxy, but serve documentation only from the cache (other hosts still pass)"
       echo ""
       echo "Example:"
       echo "  $0 maven/github-actions-cloud.yaml --model claude-sonnet-4"
+      echo "  $0 maven/github-actions-cloud.yaml --replay ../recordings --time-scale 0"
       exit 0
       ;;
     *)
@@ -58,6 +94,11 @@ while [[ $# -gt 0 ]]; do
   esac
 done
 
+if [[ -n "$TIMEOUT" ]] && ! [[ "$TIMEOUT" =~ ^[1-9][0-9]*$ ]]; then
+  echo -e "${RED}Error: --timeout must be a positive number of seconds${NC}" >&2
+  exit 1
+fi
+
 # Validate scenario file
 if [[ -z "$SCENARIO_FILE" ]]; then
   echo -e "${RED}Error: No scenario file specified${NC}" >&2
@@ -79,6 +120,21 @@ fi
 SCENARIO_NAME=$(basename "$SCENARIO_FILE" .yaml)
 LANGUAGE=$(basename "$(dirname "$SCENARIO_FILE")")
 
+# Agent command: the copilot CLI, optionally wrapped by the recorder or replaced by a recording
+AGENT_CMD=(copilot)
+if [[ -n "$REPLAY_DIR" ]]; then
+  REPLAY_DIR="$(cd "$REPLAY_DIR" && pwd)/$LANGUAGE/$SCENARIO_NAME"
+  if [[ ! -f "$REPLAY_DIR/recording.json" ]]; then
+    echo -e "${RED}Error: No recording found: $REPLAY_DIR${NC}" >&2
+    exit 1
+  fi
+  AGENT_CMD=(python3 "$SCRIPT_DIR/agent-replay.py" replay --recording "$REPLAY_DIR" --time-scale "$TIME_SCALE" --)
+elif [[ -n "$RECORD_DIR" ]]; then
+  mkdir -p "$RECORD_DIR"
+  RECORD_DIR="$(cd "$RECORD_DIR" && pwd)/$LANGUAGE/$SCENARIO_NAME"
+  AGENT_CMD=(python3 "$SCRIPT_DIR/agent-replay.py" record --recording "$RECORD_DIR" -- copilot)
+fi
+
 # Create results directory
 RESULTS_DIR="$TESTS_DIR/results/$MODEL"
 mkdir -p "$RESULTS_DIR"
@@ -97,93 +153,67 @@ echo -e "${BLUE}Model:${NC} $MODEL"
 echo -e "${BLUE}Timestamp:${NC} $TIMESTAMP"
 echo ""
 
+# Milliseconds since the epoch, for phase timings (whole seconds before bash 5)
+now_ms() {
+    if [[ -n "${EPOCHREALTIME:-}" ]]; then
+        local now="${EPOCHREALTIME/[.,]/}"
+        echo $((now / 1000))
+    else
+        echo $(($(date +%s) * 1000))
+    fi
+}
+
+# Seconds between two now_ms timestamps, as a JSON number
+phase_seconds() {
+    local ms=$(($2 - $1))
+    printf '%d.%03d' $((ms / 1000)) $((ms % 1000))
+}
+
 # Start test execution
 START_TIME=$(date +%s)
+SETUP_START_MS=$(now_ms)
 echo -e "${YELLOW}[$(date +"$TIME_FORMAT")]${NC} Starting test scenario..."
 
 # Parse scenario file to build prompt
 echo -e "${YELLOW}[$(date +"$TIME_FORMAT")]${NC} Loading scenario definition..."
 
-# Extract key information from YAML
-PLATFORM=$(grep "^platform:" "$SCENARIO_FILE" | awk '{print $2}' | tr -d '"')
-SONARQUBE_TYPE=$(grep "^sonarqube:" "$SCENARIO_FILE" | awk '{print $2}' | tr -d '"')
-DESCRIPTION=$(grep "^description:" "$SCENARIO_FILE" | cut -d':' -f2- | sed 's/^ *//' | tr -d '"')
-
-if [[ -z "$PLATFORM" || -z "$SONARQUBE_TYPE" ]]; then
+# Scenario fields and the agent prompt come from the compiled scenario manifest
+# (parsed and schema-checked once, re-parsed only when the YAML changes)
+if ! SCENARIO_VARS=$(python3 "$SCRIPT_DIR/compile-scenarios.py" --shell "$SCENARIO_FILE"); then
     echo -e "${RED}Error: Failed to parse scenario file${NC}" >&2
-    echo "Platform: $PLATFORM, SonarQube: $SONARQUBE_TYPE"
     exit 1
 fi
+eval "$SCENARIO_VARS"
 
 # Create temporary workspace for test
 TEST_WORKSPACE="$RESULTS_DIR/.workspace-${SCENARIO_NAME}-$$"
-mkdir -p "$TEST_WORKSPACE"
-git -C "$TEST_WORKSPACE" init --quiet
-echo -e "${YELLOW}[$(date +"$TIME_FORMAT")]${NC} Created test workspace: $TEST_WORKSPACE"
 
 # All run artifacts live inside the workspace so each run is self-contained
 RESULT_FILE="$TEST_WORKSPACE/result.json"
 AGENT_OUTPUT="$TEST_WORKSPACE/agent-output.txt"
 AGENT_SHARE="$TEST_WORKSPACE/session.md"
 
-# Copy project fixture if it exists
+# Project fixture for the language, if one exists
 FIXTURE_DIR="$TESTS_DIR/fixtures/projects/${LANGUAGE}-simple"
 if [[ ! -d "$FIXTURE_DIR" ]]; then
     FIXTURE_DIR=$(ls -d "$TESTS_DIR/fixtures/projects/${LANGUAGE}"-* 2>/dev/null | head -1)
 fi
+
+# Provision the git-initialized workspace with the fixture and agents/ as .github/agents/
+# from a cached template (copy-on-write clones where supported)
+PROVISION_ARGS=(--workspace "$TEST_WORKSPACE")
 if [[ -d "$FIXTURE_DIR" ]]; then
-    cp -r "$FIXTURE_DIR"/* "$TEST_WORKSPACE/"
-    echo -e "${YELLOW}[$(date +"$TIME_FORMAT")]${NC} Copied project fixture for $LANGUAGE"
+    PROVISION_ARGS+=(--fixture "$FIXTURE_DIR")
 fi
-
-# Copy agents and skills into the expected .github/agents/ location for the copilot CLI
 if [[ -d "$WORKSPACE_ROOT/agents" ]]; then
-    mkdir -p "$TEST_WORKSPACE/.github/agents"
-    cp -r "$WORKSPACE_ROOT/agents/." "$TEST_WORKSPACE/.github/agents/"
-    echo -e "${YELLOW}[$(date +"$TIME_FORMAT")]${NC} Copied agent and skills to workspace"
+    PROVISION_ARGS+=(--agents "$WORKSPACE_ROOT/agents")
 fi
+python3 "$SCRIPT_DIR/provision-workspace.py" "${PROVISION_ARGS[@]}"
+# Content hash of the agents tree, so trend-report.py can tie score changes to agent edits
+AGENT_REVISION=$(cat "$TEST_WORKSPACE/.git/agents-revision" 2>/dev/null || true)
+echo -e "${YELLOW}[$(date +"$TIME_FORMAT")]${NC} Created test workspace: $TEST_WORKSPACE"
 
-# Build prompt for agent - include expected responses directly
-AGENT_PROMPT="Setup SonarQube analysis for a $LANGUAGE project using $PLATFORM. "
-AGENT_PROMPT+="Target: $SONARQUBE_TYPE. "
-AGENT_PROMPT+="$DESCRIPTION "
-
-# Parse user_responses from scenario and include in prompt
 echo -e "${YELLOW}[$(date +"$TIME_FORMAT")]${NC} Preparing test configuration..."
-USER_RESPONSES=$(grep -A 100 "user_responses:" "$SCENARIO_FILE" | grep "answer:" | sed 's/.*answer: *//' | tr -d '"')
-RESPONSE_COUNT=$(echo "$USER_RESPONSES" | grep -c . || echo "0")
-
-# Build prompt for agent - phrase as user request, not commands
-# This allows the agent to use its persona and skills properly
-PROJECT_KEY=""
-ORG_KEY=""
-SERVER_URL=""
-REGION=""
-
-if echo "$USER_RESPONSES" | grep -qi "cloud"; then
-    # Parse Cloud response: "Cloud, project-key, org-key, US/EU"
-    CLOUD_INFO=$(echo "$USER_RESPONSES" | grep -i "cloud")
-    PROJECT_KEY=$(echo "$CLOUD_INFO" | cut -d',' -f2 | tr -d ' ')
-    ORG_KEY=$(echo "$CLOUD_INFO" | cut -d',' -f3 | tr -d ' ')
-    REGION=$(echo "$CLOUD_INFO" | cut -d',' -f4 | tr -d ' ')
-    
-    AGENT_PROMPT="I need to set up SonarQube analysis for my $LANGUAGE project. "
-    AGENT_PROMPT+="I'm using SonarQube Cloud (${REGION} region) with organization '$ORG_KEY' and project key '$PROJECT_KEY'. "
-    AGENT_PROMPT+="My CI/CD platform is $PLATFORM."
-elif echo "$USER_RESPONSES" | grep -qi "server"; then
-    # Parse Server response: "Server, https://url, project-key"
-    SERVER_INFO=$(echo "$USER_RESPONSES" | grep -i "server")
-    SERVER_URL=$(echo "$SERVER_INFO" | cut -d',' -f2 | tr -d ' ')
-    PROJECT_KEY=$(echo "$SERVER_INFO" | cut -d',' -f3 | tr -d ' ')
-    
-    AGENT_PROMPT="I need to set up SonarQube analysis for my $LANGUAGE project. "
-    AGENT_PROMPT+="I'm using SonarQube Server at $SERVER_URL with project key '$PROJECT_KEY'. "
-    AGENT_PROMPT+="My CI/CD platform is $PLATFORM."
-else
-    # Fallback if no responses found
-    AGENT_PROMPT="I need to set up SonarQube analysis for my $LANGUAGE project using $PLATFORM. "
-    AGENT_PROMPT+="Target: $SONARQUBE_TYPE."
-fi
 
 if [[ "$VERBOSE" == "true" ]]; then
     echo -e "${BLUE}Configuration:${NC}"
@@ -193,6 +223,53 @@ if [[ "$VERBOSE" == "true" ]]; then
     [[ -n "$REGION" ]] && echo "  Region: $REGION"
 fi
 
+# Optionally route the agent's HTTP traffic through the caching documentation proxy;
+# every fetch it serves is tracked with its cache outcome in the workspace
+DOC_TRACKING="$TEST_WORKSPACE/doc-fetches.json"
+DOC_PROXY_PID=""
+stop_doc_proxy() {
+    if [[ -n "$DOC_PROXY_PID" ]]; then
+        kill "$DOC_PROXY_PID" 2>/dev/null || true
+        wait "$DOC_PROXY_PID" 2>/dev/null || true
+        DOC_PROXY_PID=""
+    fi
+}
+if [[ -n "$DOC_PROXY" ]]; then
+    # Local CA the proxy terminates documentation HTTPS with (tunnelled only without openssl)
+    DOC_PROXY_CA=""
+    DOC_PROXY_CA_BUNDLE=""
+    if DOC_CA_FIELDS=$(python3 "$SCRIPT_DIR/doc-proxy.py" ca --shell 2>/dev/null); then
+        eval "$DOC_CA_FIELDS"
+    else
+        echo -e "${YELLOW}Warning: Cannot create the documentation proxy CA; HTTPS documentation is not cached${NC}" >&2
+    fi
+    DOC_PROXY_ARGS=(--port 0 --port-file "$TEST_WORKSPACE/.doc-proxy.port" --tracking-file "$DOC_TRACKING" --quiet)
+    if [[ "$DOC_PROXY" == "offline" ]]; then
+        DOC_PROXY_ARGS+=(--offline)
+    fi
+    python3 "$SCRIPT_DIR/doc-proxy.py" serve "${DOC_PROXY_ARGS[@]}" > /dev/null 2>&1 &
+    DOC_PROXY_PID=$!
+    trap stop_doc_proxy EXIT
+    for _ in 1 2 3 4 5 6 7 8 9 10; do
+        [[ -s "$TEST_WORKSPACE/.doc-proxy.port" ]] && break
+        sleep 0.5
+    done
+    if [[ ! -s "$TEST_WORKSPACE/.doc-proxy.port" ]]; then
+        echo -e "${RED}Error: Documentation proxy did not start${NC}" >&2
+        exit 1
+    fi
+    DOC_PROXY_URL="http://127.0.0.1:$(cat "$TEST_WORKSPACE/.doc-proxy.port")"
+    rm -f "$TEST_WORKSPACE/.doc-proxy.port"
+    AGENT_CMD=(env "HTTP_PROXY=$DOC_PROXY_URL" "HTTPS_PROXY=$DOC_PROXY_URL"
+               "http_proxy=$DOC_PROXY_URL" "https_proxy=$DOC_PROXY_URL" "${AGENT_CMD[@]}")
+    if [[ -n "$DOC_PROXY_CA" ]]; then
+        # Node (copilot) adds the CA to its defaults; OpenSSL-based tools replace theirs, so get the bundle
+        AGENT_CMD=(env "NODE_EXTRA_CA_CERTS=$DOC_PROXY_CA" "SSL_CERT_FILE=$DOC_PROXY_CA_BUNDLE"
+                   "REQUESTS_CA_BUNDLE=$DOC_PROXY_CA_BUNDLE" "CURL_CA_BUNDLE=$DOC_PROXY_CA_BUNDLE" "${AGENT_CMD[@]}")
+    fi
+    echo -e "${YELLOW}[$(date +"$TIME_FORMAT")]${NC} Documentation proxy ($DOC_PROXY) on $DOC_PROXY_URL"
+fi
+
 echo -e "${YELLOW}[$(date +"$TIME_FORMAT")]${NC} Invoking SonarArchitect agent..."
 if [[ "$VERBOSE" == "true" ]]; then
     echo -e "${BLUE}Full prompt:${NC}"
@@ -205,7 +282,7 @@ cd "$TEST_WORKSPACE"
 
 echo -e "${BLUE}Executing command:${NC}"
 echo "  cd $TEST_WORKSPACE"
-echo "  copilot --agent=SonarArchitect \\"
+echo "  ${AGENT_CMD[*]} --agent=SonarArchitect \\"
 echo "          --prompt \"$AGENT_PROMPT\" \\"
 echo "          --allow-all-tools \\"
 echo "          --no-ask-user \\"
@@ -214,6 +291,19 @@ echo "          --add-dir . \\"
 echo "          --add-dir \"$WORKSPACE_ROOT\""
 echo ""
 
+# The agent runs in the background so a deadline can stop it. It leads its own process
+# group, so the whole tree (copilot, its shells, curl, build tools, or copilot under the
+# recorder) is signalled together and nothing keeps writing while the workspace is captured
+stop_agent() {
+    local _
+    kill -TERM -- -"$AGENT_PID" 2>/dev/null || true
+    for _ in 1 2 3 4 5; do
+        kill -0 -- -"$AGENT_PID" 2>/dev/null || return 0
+        sleep 1
+    done
+    kill -KILL -- -"$AGENT_PID" 2>/dev/null || true
+}
+
 # Use non-interactive mode with auto-approval
 # --agent: Use custom agent (loads from .github/agents/SonarArchitect.agent.md in current dir)
 # --allow-all-tools: Allow tools to run without confirmation
@@ -222,143 +312,103 @@ echo ""
 # --add-dir .: Grant explicit access to current directory (test workspace)
 # --add-dir WORKSPACE_ROOT: Grant access to original workspace (for reading docs, etc.)
 # The agent now has direct access to skills/ directory in its working context
-if copilot --agent=SonarArchitect \
+AGENT_START_MS=$(now_ms)
+# Job control gives the background job its own process group (PGID = AGENT_PID);
+# it also leaves stdin attached, hence the explicit /dev/null
+set -m
+"${AGENT_CMD[@]}" --agent=SonarArchitect \
           --prompt "$AGENT_PROMPT" \
           --allow-all-tools \
           --no-ask-user \
           --share "$AGENT_SHARE" \
           --add-dir . \
           --add-dir "$WORKSPACE_ROOT" \
-          > "$AGENT_OUTPUT" 2>&1; then
+          < /dev/null > "$AGENT_OUTPUT" 2>&1 &
+AGENT_PID=$!
+set +m
+trap 'stop_agent; exit 130' INT TERM
+
+TIMED_OUT=false
+if [[ -n "$TIMEOUT" ]]; then
+    # The deadline counts from the scenario start, so the whole run fits the budget
+    DEADLINE=$((START_TIME + TIMEOUT))
+    while kill -0 "$AGENT_PID" 2>/dev/null; do
+        if [[ $(date +%s) -ge $DEADLINE ]]; then
+            TIMED_OUT=true
+            stop_agent
+            break
+        fi
+        sleep 1
+    done
+fi
+
+AGENT_EXIT=0
+wait "$AGENT_PID" || AGENT_EXIT=$?
+# Background processes the agent left in its group must not write during the capture
+stop_agent
+if [[ "$TIMED_OUT" == "true" ]]; then
+    AGENT_STATUS="timeout"
+    echo -e "${RED}✗${NC} Agent stopped after the ${TIMEOUT}s timeout"
+elif [[ $AGENT_EXIT -eq 0 ]]; then
     AGENT_STATUS="success"
     echo -e "${GREEN}✓${NC} Agent execution completed"
 else
     AGENT_STATUS="failed"
     echo -e "${RED}✗${NC} Agent execution failed"
 fi
+trap - INT TERM
 
 END_TIME=$(date +%s)
+AGENT_END_MS=$(now_ms)
 DURATION=$((END_TIME - START_TIME))
+stop_doc_proxy
 
 # Return to original directory
 cd "$WORKSPACE_ROOT"
 
 # Capture created files
 echo -e "${YELLOW}[$(date +"$TIME_FORMAT")]${NC} Capturing created files..."
-# Capture all workspace files (excluding git internals, agent setup, and test metadata files)
-FILES_CREATED=$(find "$TEST_WORKSPACE" -type f \
-  | grep -v "\.github/agents" \
-  | grep -v "/\.git/" \
-  | grep -v "/result\.json$" \
-  | grep -v "/agent-output\.txt$" \
-  | grep -v "/session\.md$")
-
-# Build files_created array for result JSON
-FILES_JSON="[]"
-if [[ -n "$FILES_CREATED" ]]; then
-    FILES_JSON="["
-    FIRST=true
-    while IFS= read -r file; do
-        if [[ -f "$file" && ! -z "$file" ]]; then
-            REL_PATH="${file#$TEST_WORKSPACE/}"
-            # Skip agent setup and test metadata files
-            if [[ "$REL_PATH" =~ ^\.github/agents ]] || \
-               [[ "$REL_PATH" == "result.json" ]] || \
-               [[ "$REL_PATH" == "agent-output.txt" ]] || \
-               [[ "$REL_PATH" == "session.md" ]]; then
-                continue
-            fi
-            CONTENT=$(cat "$file" | jq -Rs '.')
-            
-            if [[ "$FIRST" == "true" ]]; then
-                FIRST=false
-            else
-                FILES_JSON+=","
-            fi
-            
-            FILES_JSON+="{\"path\":\"$REL_PATH\",\"content\":$CONTENT}"
-        fi
-    done <<< "$FILES_CREATED"
-    FILES_JSON+="]"
-fi
-
-# Extract skill invocations from agent output and session file
-echo -e "${YELLOW}[$(date +"$TIME_FORMAT")]${NC} Tracking skill invocations..."
-# Try session file first (more complete), fall back to agent-output.txt
-# Primary source: explicit skill announcements (🔧 Using skill: <name>)
-# Fallback: bold file paths (**path**) which are actual Read tool calls, not Glob directory listings
+# One pass over the workspace (excluding git internals, agent setup, and test metadata files);
+# binaries are flagged rather than inlined and per-file/total size caps apply
+CAPTURE_FILE=$(mktemp "${TMPDIR:-/tmp}/capture-${SCENARIO_NAME}.XXXXXX")
+python3 "$SCRIPT_DIR/capture-workspace.py" "$TEST_WORKSPACE" --output "$CAPTURE_FILE"
+FILES_JSON=$(cat "$CAPTURE_FILE")
+rm -f "$CAPTURE_FILE"
+CAPTURE_END_MS=$(now_ms)
+
+# Extract skill invocations, documentation fetches, Output Contracts and questions
+echo -e "${YELLOW}[$(date +"$TIME_FORMAT")]${NC} Extracting transcript..."
+# Session file first (more complete), falling back to agent-output.txt; read once into
+# transcript.json, which validate-result.py consumes as well
+TRANSCRIPT="$AGENT_OUTPUT"
 if [[ -f "$AGENT_SHARE" ]]; then
-    SKILLS_FROM_ANNOUNCEMENTS=$(grep -oE "Using skill: [a-z-]+" "$AGENT_SHARE" | sed 's/Using skill: //' || true)
-    SKILLS_FROM_FILES=$(grep -oE '\*\*[^*]*skills/[a-z-]+\.md\*\*' "$AGENT_SHARE" | grep -oE 'skills/[a-z-]+\.md' | sed 's|skills/||; s|\.md||' || true)
-    SKILLS_INVOKED=$(echo -e "$SKILLS_FROM_ANNOUNCEMENTS\n$SKILLS_FROM_FILES" | sort -u | grep -v '^$' || true)
-else
-    SKILLS_FROM_ANNOUNCEMENTS=$(grep -oE "Using skill: [a-z-]+" "$AGENT_OUTPUT" | sed 's/Using skill: //' || true)
-    SKILLS_FROM_FILES=$(grep -oE '\*\*[^*]*skills/[a-z-]+\.md\*\*' "$AGENT_OUTPUT" | grep -oE 'skills/[a-z-]+\.md' | sed 's|skills/||; s|\.md||' || true)
-    SKILLS_INVOKED=$(echo -e "$SKILLS_FROM_ANNOUNCEMENTS\n$SKILLS_FROM_FILES" | sort -u | grep -v '^$' || true)
+    TRANSCRIPT="$AGENT_SHARE"
 fi
-SKILLS_COUNT=$(echo "$SKILLS_INVOKED" | grep -c . || echo "0")
-
-# Build skills_invoked array for result JSON
-SKILLS_JSON="[]"
-if [[ "$SKILLS_COUNT" -gt 0 ]]; then
-    SKILLS_JSON="["
-    FIRST=true
-    while IFS= read -r skill; do
-        if [[ -n "$skill" ]]; then
-            if [[ "$FIRST" == "true" ]]; then
-                FIRST=false
-            else
-                SKILLS_JSON+=","
-            fi
-            SKILLS_JSON+="\"$skill\""
-        fi
-    done <<< "$SKILLS_INVOKED"
-    SKILLS_JSON+="]"
+TRANSCRIPT_EXTRACT="$TEST_WORKSPACE/transcript.json"
+if ! TRANSCRIPT_VARS=$(python3 "$SCRIPT_DIR/extract-transcript.py" "$TRANSCRIPT" --output "$TRANSCRIPT_EXTRACT" --shell); then
+    TRANSCRIPT_VARS="SKILLS_JSON='[]' SKILLS_COUNT=0 SKILLS_INVOKED='' DOC_COUNT=0 DOC_JSON='{\"total_count\":0,\"pages\":[],\"domains\":[]}'"
+fi
+eval "$TRANSCRIPT_VARS"
+
+# Token usage and cost from the usage summary the CLI prints last (null if it printed none)
+if ! USAGE_VARS=$(python3 "$SCRIPT_DIR/agent-usage.py" "$AGENT_OUTPUT" --model "$MODEL" --shell); then
+    USAGE_VARS="TOTAL_TOKENS=null COST=null USAGE_JSON=null"
 fi
+eval "$USAGE_VARS"
+EXTRACT_END_MS=$(now_ms)
 
 if [[ "$VERBOSE" == "true" ]]; then
     echo -e "${BLUE}Skills invoked ($SKILLS_COUNT):${NC}"
     echo "$SKILLS_INVOKED" | sed 's/^/  - /'
+    echo -e "${BLUE}Documentation fetches:${NC} $DOC_COUNT"
 fi
 
-# Extract documentation fetches from agent output and session file
-# Look for patterns like "Fetched: https://docs.sonarsource.com/..."
-# Try session file first for more complete data, fall back to agent-output.txt
-if [[ -f "$AGENT_SHARE" ]]; then
-    DOC_FETCHES=$(grep -oE 'https?://[^ "<>)]+' "$AGENT_SHARE" | grep -E '(docs\.sonarsource|github\.com|docs\.gitlab|learn\.microsoft|docs\.azure)' 2>/dev/null || true)
-else
-    DOC_FETCHES=$(grep -oE 'https?://[^ "<>)]+' "$AGENT_OUTPUT" | grep -E '(docs\.sonarsource|github\.com|docs\.gitlab|learn\.microsoft|docs\.azure)' 2>/dev/null || true)
-fi
-if [[ -z "$DOC_FETCHES" ]]; then
-    DOC_COUNT="0"
-else
-    DOC_COUNT=$(echo "$DOC_FETCHES" | wc -l | tr -d ' ')
-fi
-
-# Build documentation_fetches JSON
-DOC_JSON='{"total_count":'$DOC_COUNT',"pages":[],"domains":[]}'
-if [[ "$DOC_COUNT" -gt 0 ]]; then
-    DOC_PAGES="["
-    DOC_DOMAINS="["
-    FIRST=true
-    while IFS= read -r url; do
-        if [[ -n "$url" ]]; then
-            DOMAIN=$(echo "$url" | awk -F[/:] '{print $4}')
-            
-            if [[ "$FIRST" == "true" ]]; then
-                FIRST=false
-            else
-                DOC_PAGES+=","
-                DOC_DOMAINS+=","
-            fi
-            
-            DOC_PAGES+="{\"url\":\"$url\",\"timestamp\":\"$(date -u +"%Y-%m-%dT%H:%M:%SZ")\"}"
-            DOC_DOMAINS+="\"$DOMAIN\""
-        fi
-    done <<< "$DOC_FETCHES"
-    DOC_PAGES+="]"
-    DOC_DOMAINS+="]"
-    DOC_JSON='{"total_count":'$DOC_COUNT',"pages":'$DOC_PAGES',"domains":'$DOC_DOMAINS'}'
+# Cache hits and misses reported by the documentation proxy
+if [[ -n "$DOC_PROXY" ]]; then
+    DOC_CACHE=$(python3 "$SCRIPT_DIR/track-doc-fetch.py" summary --json --file "$DOC_TRACKING" 2>/dev/null \
+        | python3 -c 'import json, sys; s = json.load(sys.stdin); print(json.dumps({"hits": s["cache_hits"], "misses": s["cache_misses"], "proxied_count": s["total_count"]}))' \
+        || echo '{}')
+    DOC_JSON="${DOC_JSON%\}},\"cache\":$DOC_CACHE}"
 fi
 
 # Create result file
@@ -370,13 +420,25 @@ cat > "$RESULT_FILE" <<EOF
   "platform": "$PLATFORM",
   "sonarqube_type": "$SONARQUBE_TYPE",
   "timestamp": "$TIMESTAMP",
+  "agent_revision": "$AGENT_REVISION",
   "status": "$AGENT_STATUS",
   "execution": {
     "start_time": "$(date -r $START_TIME -u +"%Y-%m-%dT%H:%M:%SZ")",
     "end_time": "$(date -r $END_TIME -u +"%Y-%m-%dT%H:%M:%SZ")",
     "duration_seconds": $DURATION,
+    "timed_out": $TIMED_OUT,
     "workspace": "$TEST_WORKSPACE",
-    "agent_output": "$AGENT_OUTPUT"
+    "agent_output": "$AGENT_OUTPUT",
+    "transcript_extract": "$TRANSCRIPT_EXTRACT",
+    "phases": {
+      "setup_seconds": $(phase_seconds "$SETUP_START_MS" "$AGENT_START_MS"),
+      "agent_seconds": $(phase_seconds "$AGENT_START_MS" "$AGENT_END_MS"),
+      "capture_seconds": $(phase_seconds "$AGENT_END_MS" "$CAPTURE_END_MS"),
+      "extract_seconds": $(phase_seconds "$CAPTURE_END_MS" "$EXTRACT_END_MS")
+    },
+    "total_tokens": $TOTAL_TOKENS,
+    "cost": $COST,
+    "usage": $USAGE_JSON
   },
   "files_created": $FILES_JSON,
   "skills_invoked": $SKILLS_JSON,
@@ -409,6 +471,10 @@ else
     echo ""
     echo -e "${RED}✗${NC} Validation failed"
 fi
+
+# Fold the result into the model's persisted summary totals and refresh summary.md
+python3 "$SCRIPT_DIR/generate-summary.py" --model "$MODEL" --results-dir "$RESULTS_DIR" \
+    --add-result "$RESULT_FILE" --quiet || true
 echo -e "${BLUE}Session transcript:${NC} $AGENT_SHARE"
 echo ""
 echo "$SEPARATOR"
@@ -418,3 +484,7 @@ echo -e "${BLUE}Result file:${NC} $RESULT_FILE"
 echo -e "${BLUE}Duration:${NC} ${DURATION}s"
 echo "$SEPARATOR"
 echo ""
+
+if [[ "$TIMED_OUT" == "true" ]]; then
+  exit 124
+fi
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+scenario_manifest.py - Compiled, schema-checked scenario definitions
+
+Every tests/scenarios/<language>/<name>.yaml is parsed once, checked against
+SCENARIO_SCHEMA and stored with its runner fields and prebuilt agent prompt in
+tests/.cache/scenario-manifest.json. Entries are keyed by the YAML file's mtime and
+size, so a scenario is only re-parsed after it changes.
+
+Usage:
+    from scenario_manifest import ScenarioManifest
+    entry = ScenarioManifest().get(scenario_file)
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+import yaml
+
+SCENARIOS_DIR = Path(__file__).parent.parent / 'scenarios'
+DEFAULT_MANIFEST = Path(__file__).parent.parent / '.cache' / 'scenario-manifest.json'
+MANIFEST_VERSION = 1
+
+# key -> (type, required); nested dicts are checked recursively, lists by item type
+SCENARIO_SCHEMA = {
+    'name': (str, True),
+    'description': (str, True),
+    'category': (str, False),
+    'language': (str, True),
+    'platform': (str, True),
+    'sonarqube': (str, True),
+    'input': ({
+        'project_structure': ([str], False),
+        'user_responses': ([{
+            'question': (str, True),
+            'answer': (str, True),
+        }], False),
+    }, False),
+    'expected': ({
+        'skills_invoked': ([str], False),
+        'decisions': ([dict], False),
+        'documentation_fetches': ({
+            'expected_domains': ([str], False),
+            'expected_pages': ([{
+                'pattern': (str, True),
+                'description': (str, False),
+                'score': (int, False),
+            }], False),
+            'min_fetches': (int, False),
+            'max_fetches': (int, False),
+        }, False),
+        'files_created': ([{
+            'path': (str, True),
+            'must_contain': ([str], False),
+            'must_not_contain': ([str], False),
+        }], False),
+        'validation': ([dict], False),
+    }, True),
+    'assertions': ([str], False),
+    'scoring': (dict, False),
+}
+
+
+class ScenarioError(Exception):
+    """A scenario file that cannot be parsed or does not match the schema"""
+
+
+def _type_name(expected) -> str:
+    if isinstance(expected, dict):
+        return 'mapping'
+    if isinstance(expected, list):
+        return 'list'
+    return {str: 'string', int: 'integer', dict: 'mapping'}.get(expected, expected.__name__)
+
+
+def _check_value(value: Any, expected, where: str, errors: List[str]):
+    """Check one value against a schema type, collecting errors"""
+    if isinstance(expected, dict):
+        if not isinstance(value, dict):
+            errors.append(f"{where}: expected mapping, got {type(value).__name__}")
+            return
+        _check_mapping(value, expected, where, errors)
+    elif isinstance(expected, list):
+        if not isinstance(value, list):
+            errors.append(f"{where}: expected list, got {type(value).__name__}")
+            return
+        for i, item in enumerate(value):
+            _check_value(item, expected[0], f"{where}[{i}]", errors)
+    elif not isinstance(value, expected) or (expected is int and isinstance(value, bool)):
+        errors.append(f"{where}: expected {_type_name(expected)}, got {type(value).__name__}")
+
+
+def _check_mapping(data: Dict[str, Any], schema: Dict[str, tuple], where: str, errors: List[str]):
+    for key, (expected, required) in schema.items():
+        path = f"{where}.{key}" if where else key
+        if key not in data or data[key] is None:
+            if required:
+                errors.append(f"{path}: required")
+            continue
+        _check_value(data[key], expected, path, errors)
+
+
+def validate_scenario(scenario: Any) -> List[str]:
+    """Return schema violations for a parsed scenario (empty if valid)"""
+    if not isinstance(scenario, dict):
+        return ['scenario must be a mapping']
+    errors = []
+    _check_mapping(scenario, SCENARIO_SCHEMA, '', errors)
+    return errors
+
+
+def _field(line: str, index: int) -> str:
+    """Comma-separated field with spaces removed, matching `cut -d',' -f<n> | tr -d ' '`"""
+    parts = line.split(',')
+    if len(parts) == 1:
+        return line.replace(' ', '')
+    return parts[index - 1].replace(' ', '') if index <= len(parts) else ''
+
+
+def build_runner_fields(scenario: Dict[str, Any], language: str) -> Dict[str, str]:
+    """Fields run-scenario.sh needs, including the agent prompt phrased as a user request"""
+    platform = scenario['platform']
+    sonarqube_type = scenario['sonarqube']
+    responses = [r['answer'] for r in scenario.get('input', {}).get('user_responses') or []]
+    fields = {
+        'PLATFORM': platform,
+        'SONARQUBE_TYPE': sonarqube_type,
+        'DESCRIPTION': scenario['description'],
+        'RESPONSE_COUNT': str(len(responses)),
+        'PROJECT_KEY': '',
+        'ORG_KEY': '',
+        'SERVER_URL': '',
+        'REGION': '',
+    }
+
+    cloud = [r for r in responses if 'cloud' in r.lower()]
+    server = [r for r in responses if 'server' in r.lower()]
+    if cloud:
+        # Cloud response: "Cloud, project-key, org-key, US/EU"
+        fields['PROJECT_KEY'] = _field(cloud[0], 2)
+        fields['ORG_KEY'] = _field(cloud[0], 3)
+        fields['REGION'] = _field(cloud[0], 4)
+        prompt = (f"I need to set up SonarQube analysis for my {language} project. "
+                  f"I'm using SonarQube Cloud ({fields['REGION']} region) with organization "
+                  f"'{fields['ORG_KEY']}' and project key '{fields['PROJECT_KEY']}'. "
+                  f"My CI/CD platform is {platform}.")
+    elif server:
+        # Server response: "Server, https://url, project-key"
+        fields['SERVER_URL'] = _field(server[0], 2)
+        fields['PROJECT_KEY'] = _field(server[0], 3)
+        prompt = (f"I need to set up SonarQube analysis for my {language} project. "
+                  f"I'm using SonarQube Server at {fields['SERVER_URL']} with project key "
+                  f"'{fields['PROJECT_KEY']}'. My CI/CD platform is {platform}.")
+    else:
+        prompt = (f"I need to set up SonarQube analysis for my {language} project using {platform}. "
+                  f"Target: {sonarqube_type}.")
+    fields['AGENT_PROMPT'] = prompt
+    return fields
+
+
+def compile_scenario(scenario_file: Path) -> Dict[str, Any]:
+    """Parse and check one scenario file into a manifest entry"""
+    try:
+        with open(scenario_file, 'r') as f:
+            scenario = yaml.safe_load(f)
+    except yaml.YAMLError as e:
+        raise ScenarioError(f"{scenario_file}: invalid YAML: {e}")
+    errors = validate_scenario(scenario)
+    if errors:
+        raise ScenarioError(f"{scenario_file}: " + '; '.join(errors))
+
+    st = scenario_file.stat()
+    language = scenario_file.parent.name
+    return {
+        'mtime_ns': st.st_mtime_ns,
+        'size': st.st_size,
+        'language': language,
+        'name': scenario_file.stem,
+        'runner': build_runner_fields(scenario, language),
+        'scenario': scenario,
+    }
+
+
+class ScenarioManifest:
+    """mtime-keyed manifest of compiled scenarios"""
+
+    def __init__(self, manifest_file: Path = DEFAULT_MANIFEST, scenarios_dir: Path = SCENARIOS_DIR):
+        self.manifest_file = manifest_file
+        self.scenarios_dir = scenarios_dir.resolve()
+        self.entries = self._load()
+        self.dirty = False
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.manifest_file, 'r') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get('version') != MANIFEST_VERSION:
+            return {}
+        return manifest.get('scenarios', {})
+
+    def key(self, scenario_file: Path) -> Optional[str]:
+        """Manifest key (path relative to the scenarios dir), None for files outside it"""
+        try:
+            return scenario_file.resolve().relative_to(self.scenarios_dir).as_posix()
+        except ValueError:
+            return None
+
+    def get(self, scenario_file: Path, save: bool = True) -> Dict[str, Any]:
+        """Compiled entry for a scenario, recompiling it if the file changed"""
+        key = self.key(scenario_file)
+        if key is None:
+            return compile_scenario(scenario_file)
+        st = scenario_file.stat()
+        entry = self.entries.get(key)
+        if entry and entry['mtime_ns'] == st.st_mtime_ns and entry['size'] == st.st_size:
+            return entry
+        entry = compile_scenario(scenario_file)
+        self.entries[key] = entry
+        self.dirty = True
+        if save:
+            self.save()
+        return entry
+
+    def compile_all(self) -> List[str]:
+        """Bring every scenario up to date; returns the errors of invalid scenarios"""
+        errors = []
+        seen = set()
+        for scenario_file in sorted(self.scenarios_dir.glob('*/*.yaml')):
+            key = self.key(scenario_file)
+            seen.add(key)
+            try:
+                self.get(scenario_file, save=False)
+            except ScenarioError as e:
+                errors.append(str(e))
+                if self.entries.pop(key, None) is not None:
+                    self.dirty = True
+        for stale_key in set(self.entries) - seen:
+            del self.entries[stale_key]
+            self.dirty = True
+        self.save()
+        return errors
+
+    def save(self):
+        """Write the manifest atomically if it changed"""
+        if not self.dirty:
+            return
+        self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.manifest_file.with_name(f'.{self.manifest_file.name}.{os.getpid()}.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump({'version': MANIFEST_VERSION, 'scenarios': self.entries}, f, default=str)
+        os.replace(tmp_file, self.manifest_file)
+        self.dirty = False
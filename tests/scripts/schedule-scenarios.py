@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+schedule-scenarios.py - Order scenarios longest-first from their recorded run durations
+
+Estimates each scenario's duration from the execution.duration_seconds of its most
+recent results (the same model first, then any model) and prints the scenarios
+longest-first, so a worker pool starts the slow runs early instead of finishing on
+them. Scenarios without history are estimated at the longest known duration and so
+are scheduled first.
+
+With --shard i/n the scenarios are split into n shards of similar total duration
+(longest-processing-time first: each scenario goes to the least loaded shard) and
+only shard i is printed. Scenarios are ordered by estimate and then by name, so every
+machine that sees the same results history computes the same partition.
+
+Usage:
+    python schedule-scenarios.py --model claude-sonnet-4 <scenario-file>...
+
+    # Second of three shards, recording the plan for merge-shards.py
+    python schedule-scenarios.py --model claude-sonnet-4 --shard 2/3 --shard-file .shard.json <scenario-file>...
+
+Output: one "<estimated seconds><TAB><scenario-file>" line per scenario.
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from statistics import median
+from typing import Dict, List, Tuple
+
+from result_loader import iter_result_files, load_result_fields
+
+RESULTS_ROOT = Path(__file__).parent.parent / 'results'
+# Recent runs considered per scenario, and the estimate used without any history
+HISTORY_RUNS = 5
+DEFAULT_ESTIMATE = 600
+DURATION_FIELDS = ('language', 'scenario', 'timestamp', 'execution')
+
+
+def scenario_key(scenario_file: Path) -> str:
+    """<language>/<scenario> key shared by scenario files and results"""
+    return f'{scenario_file.parent.name}/{scenario_file.stem}'
+
+
+def load_durations(results_dir: Path) -> Dict[str, List[Tuple[str, float]]]:
+    """(timestamp, duration_seconds) of every run in a results directory, by scenario key"""
+    durations = {}
+    if not results_dir.is_dir():
+        return durations
+    for result_file in iter_result_files(results_dir):
+        try:
+            result = load_result_fields(result_file, DURATION_FIELDS)
+        except (OSError, ValueError):
+            continue
+        duration = result.get('execution', {}).get('duration_seconds')
+        if not isinstance(duration, (int, float)) or not result.get('language') or not result.get('scenario'):
+            continue
+        key = f"{result['language']}/{result['scenario']}"
+        durations.setdefault(key, []).append((str(result.get('timestamp', '')), float(duration)))
+    return durations
+
+
+def estimate_durations(keys: List[str], model: str, results_root: Path = RESULTS_ROOT) -> Dict[str, float]:
+    """Median of the most recent runs per scenario; the model's own history wins over other models'"""
+    model_history = load_durations(results_root / model)
+    other_history = {}
+    if results_root.is_dir():
+        for model_dir in sorted(results_root.iterdir()):
+            if model_dir.is_dir() and model_dir.name != model:
+                for key, runs in load_durations(model_dir).items():
+                    other_history.setdefault(key, []).extend(runs)
+
+    estimates = {}
+    for key in keys:
+        runs = model_history.get(key) or other_history.get(key)
+        if runs:
+            recent = sorted(runs)[-HISTORY_RUNS:]
+            estimates[key] = median(duration for _, duration in recent)
+    unknown = max(estimates.values(), default=DEFAULT_ESTIMATE)
+    for key in keys:
+        estimates.setdefault(key, unknown)
+    return estimates
+
+
+def schedule(scenario_files: List[Path], estimates: Dict[str, float]) -> List[Tuple[float, Path]]:
+    """Scenarios longest-first; ties keep their given order"""
+    planned = [(estimates[scenario_key(path)], path) for path in scenario_files]
+    return sorted(planned, key=lambda item: -item[0])
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """Parse a 1-based "i/n" shard spec"""
+    try:
+        index, count = (int(part) for part in spec.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid shard '{spec}', expected i/n")
+    if count < 1 or not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"invalid shard '{spec}', need 1 <= i <= n")
+    return index, count
+
+
+def shard(planned: List[Tuple[float, Path]], index: int, count: int) -> List[Tuple[float, Path]]:
+    """Scenarios of shard index (1-based) out of count, balanced by estimated duration"""
+    ordered = sorted(planned, key=lambda item: (-item[0], scenario_key(item[1])))
+    loads = [0.0] * count
+    shards = [[] for _ in range(count)]
+    for estimate, path in ordered:
+        # Least loaded shard; ties go to the lowest index
+        target = min(range(count), key=lambda i: (loads[i], i))
+        loads[target] += estimate
+        shards[target].append((estimate, path))
+    return shards[index - 1]
+
+
+def write_shard_file(shard_file: Path, model: str, index: int, count: int, planned: List[Tuple[float, Path]]):
+    """Record which scenarios a shard was assigned, for merge-shards.py"""
+    shard_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = shard_file.with_name(f'.{shard_file.name}.{os.getpid()}.tmp')
+    with open(tmp_file, 'w') as f:
+        json.dump({
+            'model': model,
+            'shard': index,
+            'shards': count,
+            'planned_at': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'estimated_seconds': round(sum(estimate for estimate, _ in planned)),
+            'scenarios': [scenario_key(path) for _, path in planned],
+        }, f, indent=2)
+    os.replace(tmp_file, shard_file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Order scenarios longest-first by recorded duration')
+    parser.add_argument('scenarios', nargs='+', help='Scenario YAML files')
+    parser.add_argument('--model', required=True, help='Model whose history is preferred')
+    parser.add_argument('--results-dir', help=f'Results root directory (default: {RESULTS_ROOT})')
+    parser.add_argument('--shard', type=parse_shard, metavar='I/N', help='Only print shard I of N (1-based)')
+    parser.add_argument('--shard-file', help='Write the shard assignment to this JSON file')
+
+    args = parser.parse_args()
+
+    if args.shard_file and not args.shard:
+        print('Error: --shard-file requires --shard', file=sys.stderr)
+        sys.exit(1)
+
+    results_root = Path(args.results_dir) if args.results_dir else RESULTS_ROOT
+    scenario_files = [Path(path) for path in args.scenarios]
+    estimates = estimate_durations([scenario_key(path) for path in scenario_files], args.model, results_root)
+
+    planned = schedule(scenario_files, estimates)
+    if args.shard:
+        index, count = args.shard
+        planned = shard(planned, index, count)
+        if args.shard_file:
+            write_shard_file(Path(args.shard_file), args.model, index, count, planned)
+
+    for estimate, path in planned:
+        print(f"{round(estimate)}\t{path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+skill-profile.py - Per-skill wall time and token breakdown of agent sessions
+
+Each run's session transcript is cut at its `🔧 Using skill:` announcements and timed
+with the session's timestamps (see skill_timeline() in transcript_extractor.py), so
+every skill in the chain (project-detection → prerequisites-gathering → platform-* →
+scanner-* → pipeline-creation → devops-setup-instructions) gets the wall time spent
+in it. Tokens are estimated by splitting the run's execution.total_tokens by each
+skill's share of the transcript. Time before the first announcement is reported as
+(agent).
+
+Runs are aggregated per model into a latency table, sorted by total time so the skill
+worth slimming first comes first, and optionally into collapsed stacks
+(`model;skill milliseconds` per line) for flamegraph.pl, speedscope or inferno.
+
+Usage:
+    # Per-skill latency table for every model
+    python skill-profile.py
+
+    # Markdown report and collapsed stacks for a flamegraph
+    python skill-profile.py --models claude-sonnet-4 --output skills.md --collapsed skills.folded
+    flamegraph.pl skills.folded > skills.svg
+
+    # Split the stacks by scenario (model;language/scenario;skill)
+    python skill-profile.py --collapsed skills.folded --by-scenario
+"""
+
+import argparse
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+from result_loader import WORKSPACE_PREFIX, iter_result_files, load_results_projected
+from result_store import latency_percentiles
+from transcript_extractor import extract_transcript, load_extract, skill_timeline
+
+# ANSI color codes
+RED = '\033[0;31m'
+GREEN = '\033[0;32m'
+YELLOW = '\033[1;33m'
+BLUE = '\033[0;34m'
+NC = '\033[0m'
+
+RESULTS_ROOT = Path(__file__).parent.parent / 'results'
+PROFILE_FIELDS = ('language', 'scenario', 'execution')
+
+
+def load_session_document(result_file: Path, execution: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """The extracted transcript of a run, re-extracted if the saved one predates timestamps"""
+    # Files next to the result first: merged or copied workspaces keep their old absolute paths
+    local = result_file.parent if result_file.parent.name.startswith(WORKSPACE_PREFIX) else None
+    extracts = [local / 'transcript.json'] if local else []
+    if execution.get('transcript_extract'):
+        extracts.append(Path(execution['transcript_extract']))
+    transcripts = []
+    for extract_file in extracts:
+        document = load_extract(extract_file)
+        if document is not None and 'timestamps' in document:
+            return document
+        if document is not None:
+            transcripts.append(Path(document.get('source', '')))
+
+    if local:
+        transcripts += [local / 'session.md', local / 'agent-output.txt']
+    if execution.get('workspace'):
+        transcripts.append(Path(execution['workspace']) / 'session.md')
+    if execution.get('agent_output'):
+        transcripts.append(Path(execution['agent_output']))
+    for transcript in transcripts:
+        document = extract_transcript(transcript)
+        if document is not None:
+            return document
+    return None
+
+
+def profile_model(model_dir: Path, by_scenario: bool = False) -> Dict[str, Any]:
+    """Skill timelines of every run of one model, aggregated per skill"""
+    files = list(iter_result_files(model_dir))
+    runs = []
+    untimed = 0
+    for result_file, result in zip(files, load_results_projected(files, PROFILE_FIELDS)):
+        execution = result.get('execution') or {}
+        document = load_session_document(result_file, execution)
+        timeline = skill_timeline(document, execution.get('total_tokens')) if document else None
+        if timeline is None:
+            untimed += 1
+            continue
+        runs.append({'scenario': f"{result.get('language')}/{result.get('scenario')}", 'timeline': timeline})
+
+    skills = {}
+    stacks = {}
+    for run in runs:
+        per_run = {}
+        for segment in run['timeline']['segments']:
+            entry = per_run.setdefault(segment['skill'], {'seconds': 0.0, 'tokens': None, 'invocations': 0})
+            entry['seconds'] += segment['seconds']
+            entry['invocations'] += 1
+            if segment['tokens'] is not None:
+                entry['tokens'] = (entry['tokens'] or 0) + segment['tokens']
+            frames = [model_dir.name] + ([run['scenario']] if by_scenario else []) + [segment['skill']]
+            stack = ';'.join(frames)
+            stacks[stack] = stacks.get(stack, 0) + int(round(segment['seconds'] * 1000))
+        for skill, entry in per_run.items():
+            totals = skills.setdefault(skill, {'seconds': [], 'tokens': [], 'invocations': 0})
+            totals['seconds'].append(entry['seconds'])
+            totals['invocations'] += entry['invocations']
+            if entry['tokens'] is not None:
+                totals['tokens'].append(entry['tokens'])
+
+    session_seconds = sum(sum(totals['seconds']) for totals in skills.values())
+    rows = []
+    for skill, totals in skills.items():
+        total = sum(totals['seconds'])
+        percentiles = latency_percentiles(totals['seconds'])
+        rows.append({
+            'skill': skill,
+            'runs': len(totals['seconds']),
+            'invocations': totals['invocations'],
+            'mean_seconds': total / len(totals['seconds']),
+            'p50_seconds': percentiles['latency_p50'],
+            'p95_seconds': percentiles['latency_p95'],
+            'total_seconds': total,
+            'share': total / session_seconds if session_seconds > 0 else 0,
+            'avg_tokens': sum(totals['tokens']) / len(totals['tokens']) if totals['tokens'] else None,
+        })
+    rows.sort(key=lambda row: (-row['total_seconds'], row['skill']))
+    return {'model': model_dir.name, 'runs': len(runs), 'untimed_runs': untimed, 'skills': rows, 'stacks': stacks}
+
+
+def _format_tokens(value: Optional[float]) -> str:
+    return '-' if value is None else f"{value:,.0f}"
+
+
+def print_console_report(profiles: List[Dict[str, Any]]):
+    """Print the per-skill latency table of each model"""
+    print("\n" + "=" * 100)
+    print(f"{BLUE}Skill Latency Profile{NC}")
+    print("=" * 100)
+
+    for profile in profiles:
+        print(f"\n{BLUE}{profile['model']}{NC} ({profile['runs']} timed runs"
+              + (f", {YELLOW}{profile['untimed_runs']} without timestamps{NC}" if profile['untimed_runs'] else '')
+              + ")\n")
+        if not profile['skills']:
+            continue
+        print(f"{'Skill':<28} {'Runs':>5} {'Mean':>8} {'p50':>8} {'p95':>8} {'Total':>9} {'Share':>7} {'Tokens/Run':>11}")
+        print("-" * 100)
+        for row in profile['skills']:
+            print(f"{row['skill']:<28} {row['runs']:>5} {row['mean_seconds']:>7.1f}s {row['p50_seconds']:>7.1f}s "
+                  f"{row['p95_seconds']:>7.1f}s {row['total_seconds']:>8.0f}s {row['share']:>6.1%} "
+                  f"{_format_tokens(row['avg_tokens']):>11}")
+
+    print("\n" + "=" * 100 + "\n")
+
+
+def generate_markdown_report(profiles: List[Dict[str, Any]], output_file: Path):
+    """Write the per-skill latency tables as markdown"""
+    report = []
+    report.append("# Skill Latency Profile")
+    report.append("")
+    report.append(f"**Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    report.append(f"**Models:** {', '.join(p['model'] for p in profiles)}")
+    report.append("")
+    report.append("Wall time per skill, from the skill announcements and timestamps in each session transcript. "
+                  "Mean and percentiles are per run that used the skill; share is of all timed session time. "
+                  "Tokens are estimated from each skill's share of the transcript.")
+    report.append("")
+
+    for profile in profiles:
+        report.append(f"## {profile['model']}")
+        report.append("")
+        report.append(f"Timed runs: {profile['runs']}"
+                      + (f" ({profile['untimed_runs']} without timestamps)" if profile['untimed_runs'] else ''))
+        report.append("")
+        if not profile['skills']:
+            continue
+        report.append("| Skill | Runs | Mean | p50 | p95 | Total | Share | Est. Tokens/Run |")
+        report.append("|-------|------|------|-----|-----|-------|-------|-----------------|")
+        for row in profile['skills']:
+            report.append(f"| {row['skill']} | {row['runs']} | {row['mean_seconds']:.1f}s | {row['p50_seconds']:.1f}s | "
+                          f"{row['p95_seconds']:.1f}s | {row['total_seconds']:.0f}s | {row['share']:.1%} | "
+                          f"{_format_tokens(row['avg_tokens'])} |")
+        report.append("")
+
+    with open(output_file, 'w') as f:
+        f.write('\n'.join(report))
+
+
+def write_collapsed_stacks(profiles: List[Dict[str, Any]], output_file: Path):
+    """Write `frame;frame milliseconds` lines, the input format of flamegraph tools"""
+    with open(output_file, 'w') as f:
+        for profile in profiles:
+            for stack, milliseconds in sorted(profile['stacks'].items()):
+                if milliseconds > 0:
+                    f.write(f"{stack} {milliseconds}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-skill latency and token profile of agent sessions')
+    parser.add_argument('--models', help='Comma-separated models (default: every model with results)')
+    parser.add_argument('--results-dir', help=f'Results root directory (default: {RESULTS_ROOT})')
+    parser.add_argument('--output', help='Write a markdown report to this file')
+    parser.add_argument('--collapsed', help='Write collapsed stacks for flamegraph tools to this file')
+    parser.add_argument('--by-scenario', action='store_true', help='Add a scenario frame to the collapsed stacks')
+    parser.add_argument('--json', action='store_true', help='Print the profiles as JSON')
+
+    args = parser.parse_args()
+
+    results_root = Path(args.results_dir) if args.results_dir else RESULTS_ROOT
+    if args.models:
+        models = [m.strip() for m in args.models.split(',')]
+    else:
+        models = sorted(p.name for p in results_root.iterdir() if p.is_dir()) if results_root.is_dir() else []
+    models = [model for model in models if (results_root / model).is_dir()]
+    if not models:
+        print(f"{YELLOW}Warning: No results found in {results_root}{NC}")
+        sys.exit(0)
+
+    profiles = [profile_model(results_root / model, args.by_scenario) for model in models]
+
+    if args.json:
+        json.dump([{key: value for key, value in p.items() if key != 'stacks'} for p in profiles],
+                  sys.stdout, indent=2)
+        print()
+    else:
+        print_console_report(profiles)
+
+    if args.output:
+        generate_markdown_report(profiles, Path(args.output))
+        if not args.json:
+            print(f"{GREEN}✓{NC} Skill profile generated: {args.output}")
+    if args.collapsed:
+        write_collapsed_stacks(profiles, Path(args.collapsed))
+        if not args.json:
+            print(f"{GREEN}✓{NC} Collapsed stacks written: {args.collapsed}")
+
+
+if __name__ == '__main__':
+    main()
@@ -20,6 +20,8 @@ from urllib.parse import urlparse
 
 # Constants
 TRACKING_FILE_PATH_KEY = 'Tracking file path'
+# doc-proxy.py cache outcomes served without a full upstream download
+CACHE_HIT_STATUSES = ('hit', 'revalidated', 'stale')
 
 
 def load_tracking_file(file_path: Path) -> Dict[str, Any]:
@@ -37,7 +39,7 @@ def save_tracking_file(file_path: Path, data: Dict[str, Any]):
         json.dump(data, f, indent=2)
 
 
-def add_fetch(file_path: Path, url: str, title: str = None, duration_ms: int = None):
+def add_fetch(file_path: Path, url: str, title: str = None, duration_ms: int = None, cache: str = None):
     """Add a documentation fetch to tracking"""
     data = load_tracking_file(file_path)
     
@@ -47,6 +49,8 @@ def add_fetch(file_path: Path, url: str, title: str = None, duration_ms: int = N
         'timestamp': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
         'fetch_duration_ms': duration_ms
     }
+    if cache:
+        fetch_entry['cache'] = cache
     
     data['fetches'].append(fetch_entry)
     save_tracking_file(file_path, data)
@@ -64,7 +68,9 @@ def get_summary(file_path: Path) -> Dict[str, Any]:
             'total_count': 0,
             'pages': [],
             'domains': [],
-            'unique_pages': 0
+            'unique_pages': 0,
+            'cache_hits': 0,
+            'cache_misses': 0
         }
     
     # Extract domains
@@ -80,12 +86,17 @@ def get_summary(file_path: Path) -> Dict[str, Any]:
     
     unique_domains = list(set(domains))
     unique_urls = {f['url'] for f in fetches}
+    # Only fetches that went through doc-proxy.py carry a cache outcome
+    cache_hits = sum(1 for f in fetches if f.get('cache') in CACHE_HIT_STATUSES)
+    cache_misses = sum(1 for f in fetches if f.get('cache') and f['cache'] not in CACHE_HIT_STATUSES)
     
     return {
         'total_count': len(fetches),
         'pages': fetches,
         'domains': unique_domains,
-        'unique_pages': len(unique_urls)
+        'unique_pages': len(unique_urls),
+        'cache_hits': cache_hits,
+        'cache_misses': cache_misses
     }
 
 
@@ -98,6 +109,8 @@ def print_summary(file_path: Path):
     print(f"Total Fetches: {summary['total_count']}")
     print(f"Unique Pages: {summary['unique_pages']}")
     print(f"Domains: {', '.join(summary['domains']) if summary['domains'] else 'None'}")
+    if summary['cache_hits'] or summary['cache_misses']:
+        print(f"Cache: {summary['cache_hits']} hits, {summary['cache_misses']} misses")
     print(f"{'=' * 50}\n")
     
     if summary['pages']:
@@ -106,8 +119,9 @@ def print_summary(file_path: Path):
             url = page.get('url', 'unknown')
             title = page.get('title', '')
             timestamp = page.get('timestamp', '')
+            cache = page.get('cache', '')
             
-            print(f"{i:2}. {url}")
+            print(f"{i:2}. {url}" + (f" [{cache}]" if cache else ''))
             if title:
                 print(f"    Title: {title}")
             if timestamp:
@@ -134,11 +148,13 @@ def main():
     add_parser.add_argument('--url', required=True, help='URL of the fetched page')
     add_parser.add_argument('--title', help='Page title')
     add_parser.add_argument('--duration', type=int, help='Fetch duration in milliseconds')
+    add_parser.add_argument('--cache', help='Cache outcome (hit, revalidated, stale, miss, ...)')
     add_parser.add_argument('--file', required=True, help=TRACKING_FILE_PATH_KEY)
     
     # Summary command
     summary_parser = subparsers.add_parser('summary', help='Show fetch summary')
     summary_parser.add_argument('--file', required=True, help=TRACKING_FILE_PATH_KEY)
+    summary_parser.add_argument('--json', action='store_true', help='Print the summary as JSON')
     
     # Export command
     export_parser = subparsers.add_parser('export', help='Export summary to JSON')
@@ -154,9 +170,12 @@ def main():
     file_path = Path(args.file)
     
     if args.command == 'add':
-        add_fetch(file_path, args.url, args.title, args.duration)
+        add_fetch(file_path, args.url, args.title, args.duration, args.cache)
     elif args.command == 'summary':
-        print_summary(file_path)
+        if args.json:
+            print(json.dumps(get_summary(file_path)))
+        else:
+            print_summary(file_path)
     elif args.command == 'export':
         export_path = Path(args.output)
         export_summary(file_path, export_path)
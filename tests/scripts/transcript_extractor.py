@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+transcript_extractor.py - One-pass structured extraction from agent transcripts
+
+Streams session.md or agent-output.txt once through a memory map in line-aligned
+chunks and collects everything the runner and validator read from a transcript:
+skill invocations (announcements and bold skills/*.md reads), documentation URLs
+with their domains, Output Contract blocks, question blocks and timestamps, each with
+its line number and byte offset. The document is written next to the result as
+transcript.json by run-scenario.sh and read back by validate-result.py.
+
+scan_transcript() is the validator's pass for transcripts without a saved document:
+it collects only what the validation checks read (skill announcements, contract
+types and question line counts) and stops looking for contracts once both types
+have been seen. It keeps counters rather than lists, so its memory is bounded by the
+chunk size however long the session runs.
+
+skill_timeline() splits a session at its skill announcements and attributes wall time
+(from the timestamps) and an estimate of tokens (by share of transcript bytes) to each
+skill; skill-profile.py aggregates it across runs.
+
+Usage:
+    from transcript_extractor import extract_transcript, scan_transcript, skill_timeline
+    document = extract_transcript(Path('session.md'))
+    scan = scan_transcript(Path('agent-output.txt'))
+    timeline = skill_timeline(document, total_tokens=52000)
+"""
+
+import json
+import mmap
+import os
+import re
+from bisect import bisect_right
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+EXTRACT_VERSION = 1
+TRANSCRIPT_CHUNK_SIZE = 1 << 20
+
+SKILL_ANNOUNCEMENT_PATTERN = re.compile(rb'Using skill: ([a-z-]+)')
+# Bold file paths (**path**) are Read tool calls, unlike Glob directory listings
+SKILL_FILE_PATTERN = re.compile(rb'\*\*[^*\n]*skills/[a-z-]+\.md\*\*')
+SKILL_FILE_NAME_PATTERN = re.compile(rb'skills/([a-z-]+)\.md')
+URL_PATTERN = re.compile(rb'https?://[^ "<>)\n]+')
+DOC_DOMAIN_PATTERN = re.compile(rb'(docs\.sonarsource|github\.com|docs\.gitlab|learn\.microsoft|docs\.azure)')
+CONTRACT_MARKER = b'output contract'
+CONTRACT_TYPES = (b'platform', b'scanner')
+CONTRACT_FIELD_PATTERN = re.compile(r'^\s*([A-Za-z_][A-Za-z0-9_]*):\s*(.*?)\s*$')
+# Elapsed-time markers the CLI writes before session entries (<sub>⏱️ 1m 12s</sub>)
+ELAPSED_PATTERN = re.compile(rb'\xe2\x8f\xb1(?:\xef\xb8\x8f)?\s*((?:\d+(?:\.\d+)?\s*(?:h|ms|m|s)\b\s*)+)')
+ELAPSED_PART_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*(h|ms|m|s)')
+# ISO 8601 timestamps at the start of a line (log-style entries)
+CLOCK_PATTERN = re.compile(rb'[ \t>*#\[(-]*(\d{4}-\d{2}-\d{2})[T ](\d{2}:\d{2}:\d{2})(\.\d+)?(Z|[+-]\d{2}:?\d{2})?')
+# Anchored on the newline rather than with ^ and MULTILINE, which is tried at every byte
+CLOCK_LINE_PATTERN = re.compile(rb'\n' + CLOCK_PATTERN.pattern)
+DURATION_UNITS = {'h': 3600, 'm': 60, 's': 1, 'ms': 0.001}
+# Label of the session time before the first skill announcement
+NO_SKILL = '(agent)'
+
+# Contract blocks end at a blank line or heading outside a code fence, or after this many lines
+CONTRACT_MAX_LINES = 60
+# Question blocks keep the text of at most this many lines, each cut to QUESTION_LINE_LIMIT
+QUESTION_MAX_LINES = 20
+QUESTION_LINE_LIMIT = 500
+
+
+def _iter_line_chunks(data: mmap.mmap):
+    """Yield (offset, chunk) pairs of the mapped transcript, always ending on a line boundary"""
+    pos = 0
+    size = len(data)
+    while pos < size:
+        end = min(pos + TRANSCRIPT_CHUNK_SIZE, size)
+        if end < size:
+            newline = data.rfind(b'\n', pos, end)
+            if newline < 0:
+                newline = data.find(b'\n', end)
+            end = size if newline < 0 else newline + 1
+        yield pos, data[pos:end]
+        pos = end
+
+
+def _decode(raw: bytes) -> str:
+    return raw.decode('utf-8', errors='replace')
+
+
+def _elapsed_seconds(text: str) -> float:
+    """Seconds of an elapsed marker such as 1m 12s"""
+    return sum(float(value) * DURATION_UNITS[unit] for value, unit in ELAPSED_PART_PATTERN.findall(text))
+
+
+def _clock_seconds(date: bytes, time: bytes, fraction: Optional[bytes], zone: Optional[bytes]) -> float:
+    """Epoch seconds of an ISO 8601 timestamp; timestamps without a zone are taken as UTC"""
+    moment = datetime.strptime(f'{date.decode()} {time.decode()}', '%Y-%m-%d %H:%M:%S')
+    offset = timedelta()
+    if zone and zone != b'Z':
+        sign = -1 if zone[:1] == b'-' else 1
+        digits = zone[1:].replace(b':', b'')
+        offset = sign * timedelta(hours=int(digits[:2]), minutes=int(digits[2:]))
+    moment = moment.replace(tzinfo=timezone(offset))
+    return moment.timestamp() + (float(fraction) if fraction else 0.0)
+
+
+def url_domain(url: str) -> str:
+    """Host part of a URL, matching `awk -F[/:] '{print $4}'`"""
+    parts = re.split(r'[/:]', url)
+    return parts[3] if len(parts) > 3 else ''
+
+
+class _Extractor:
+    """Streaming state for one transcript"""
+
+    def __init__(self):
+        self.skill_mentions = []
+        self.urls = []
+        self.contracts = []
+        self.questions = []
+        self.timestamps = []
+        self.open_contract = None
+        self.line = 1
+        self.line_pos = 0
+
+    def _line_at(self, chunk: bytes, pos: int) -> int:
+        """1-based line number of a position, for positions visited in increasing order"""
+        self.line += chunk.count(b'\n', self.line_pos, pos)
+        self.line_pos = pos
+        return self.line
+
+    def feed(self, base: int, chunk: bytes):
+        self.line_pos = 0
+        if self.open_contract is not None:
+            self._feed_contract(chunk, 0)
+
+        hits = []
+        for match in SKILL_ANNOUNCEMENT_PATTERN.finditer(chunk):
+            hits.append((match.start(), 'announcement', match.group(1)))
+        for match in SKILL_FILE_PATTERN.finditer(chunk):
+            for name in SKILL_FILE_NAME_PATTERN.finditer(match.group()):
+                hits.append((match.start(), 'file', name.group(1)))
+        for match in URL_PATTERN.finditer(chunk):
+            if DOC_DOMAIN_PATTERN.search(match.group()):
+                hits.append((match.start(), 'url', match.group()))
+
+        lowered = chunk.lower()
+        pos = lowered.find(CONTRACT_MARKER)
+        while pos >= 0:
+            for contract_type in CONTRACT_TYPES:
+                if lowered.endswith(contract_type + b' ', 0, pos):
+                    hits.append((pos - len(contract_type) - 1, 'contract', contract_type))
+            pos = lowered.find(CONTRACT_MARKER, pos + len(CONTRACT_MARKER))
+
+        for match in ELAPSED_PATTERN.finditer(chunk):
+            hits.append((match.start(), 'elapsed', _elapsed_seconds(match.group(1).decode('ascii'))))
+        clocks = list(CLOCK_LINE_PATTERN.finditer(chunk))
+        first = CLOCK_PATTERN.match(chunk)
+        if first:
+            clocks.insert(0, first)
+        for match in clocks:
+            hits.append((match.start(1), 'clock', _clock_seconds(*match.groups())))
+
+        # One hit per line holding a question mark
+        pos = chunk.find(b'?')
+        while pos >= 0:
+            line_start = chunk.rfind(b'\n', 0, pos) + 1
+            line_end = chunk.find(b'\n', pos)
+            line_end = len(chunk) if line_end < 0 else line_end
+            hits.append((line_start, 'question', chunk[line_start:line_end]))
+            pos = chunk.find(b'?', line_end)
+
+        hits.sort(key=lambda hit: hit[0])
+        for pos, kind, payload in hits:
+            line = self._line_at(chunk, pos)
+            offset = base + pos
+            if kind in ('announcement', 'file'):
+                self.skill_mentions.append({'skill': payload.decode('ascii'), 'source': kind,
+                                            'line': line, 'offset': offset})
+            elif kind == 'url':
+                url = _decode(payload)
+                self.urls.append({'url': url, 'domain': url_domain(url), 'line': line, 'offset': offset})
+            elif kind == 'contract':
+                self._open_contract(chunk, pos, payload.decode('ascii'), line, offset)
+            elif kind in ('elapsed', 'clock'):
+                self.timestamps.append({'kind': kind, 'seconds': payload, 'line': line, 'offset': offset})
+            else:
+                self._add_question_line(_decode(payload).strip(), line, offset)
+
+        self.line += chunk.count(b'\n', self.line_pos)
+
+    def _add_question_line(self, text: str, line: int, offset: int):
+        block = self.questions[-1] if self.questions else None
+        if block is not None and block['line'] + block['count'] == line:
+            block['count'] += 1
+            if len(block['lines']) < QUESTION_MAX_LINES:
+                block['lines'].append(text[:QUESTION_LINE_LIMIT])
+        else:
+            self.questions.append({'line': line, 'offset': offset, 'count': 1,
+                                   'lines': [text[:QUESTION_LINE_LIMIT]]})
+
+    def _open_contract(self, chunk: bytes, pos: int, contract_type: str, line: int, offset: int):
+        line_end = chunk.find(b'\n', pos)
+        heading = _decode(chunk[chunk.rfind(b'\n', 0, pos) + 1:len(chunk) if line_end < 0 else line_end])
+        self.open_contract = {'type': contract_type, 'line': line, 'offset': offset,
+                              'heading': heading.strip(), 'body': [], 'in_fence': False}
+        self.contracts.append(self.open_contract)
+        if line_end >= 0:
+            self._feed_contract(chunk, line_end + 1)
+
+    def _feed_contract(self, chunk: bytes, start: int):
+        """Consume the lines of the open contract block from start until the block ends"""
+        contract = self.open_contract
+        pos = start
+        while pos < len(chunk):
+            line_end = chunk.find(b'\n', pos)
+            line_end = len(chunk) if line_end < 0 else line_end
+            text = _decode(chunk[pos:line_end]).rstrip()
+            pos = line_end + 1
+            stripped = text.strip()
+            if stripped.startswith('```'):
+                contract['in_fence'] = not contract['in_fence']
+            elif not contract['in_fence']:
+                if not stripped:
+                    if contract['body']:
+                        self.open_contract = None
+                        return
+                    continue
+                if stripped.startswith('#') or CONTRACT_MARKER.decode() in stripped.lower():
+                    self.open_contract = None
+                    return
+            contract['body'].append(text)
+            if len(contract['body']) >= CONTRACT_MAX_LINES:
+                self.open_contract = None
+                return
+
+    def document(self, transcript_path: Path, size: int) -> Dict[str, Any]:
+        announced = list(dict.fromkeys(m['skill'] for m in self.skill_mentions if m['source'] == 'announcement'))
+        from_files = list(dict.fromkeys(m['skill'] for m in self.skill_mentions if m['source'] == 'file'))
+
+        contracts = []
+        for contract in self.contracts:
+            fields = {}
+            for text in contract['body']:
+                match = CONTRACT_FIELD_PATTERN.match(text)
+                if match:
+                    fields.setdefault(match.group(1), match.group(2))
+            contracts.append({'type': contract['type'], 'line': contract['line'], 'offset': contract['offset'],
+                              'heading': contract['heading'], 'text': '\n'.join(contract['body']),
+                              'fields': fields})
+
+        return {
+            'version': EXTRACT_VERSION,
+            'source': str(transcript_path),
+            'size': size,
+            'lines': self.line - 1 if size else 0,
+            'skills': {
+                'invoked': sorted(set(announced) | set(from_files)),
+                'announced': announced,
+                'from_files': from_files,
+                'mentions': self.skill_mentions,
+            },
+            'urls': self.urls,
+            'domains': list(dict.fromkeys(u['domain'] for u in self.urls)),
+            'contracts': contracts,
+            'questions': self.questions,
+            'timestamps': self.timestamps,
+            'platform_contract': any(c['type'] == 'platform' for c in contracts),
+            'scanner_contract': any(c['type'] == 'scanner' for c in contracts),
+            # Heuristic: question marks on two consecutive lines indicate batched questions
+            'batched_questions': any(q['count'] > 1 for q in self.questions),
+        }
+
+
+def extract_transcript(transcript_path: Path) -> Optional[Dict[str, Any]]:
+    """Extract the structured transcript document in a single streaming pass.
+
+    Returns None when the transcript does not exist.
+    """
+    if not transcript_path.is_file():
+        return None
+    size = transcript_path.stat().st_size
+    extractor = _Extractor()
+    if size:
+        with open(transcript_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for base, chunk in _iter_line_chunks(data):
+                extractor.feed(base, chunk)
+            # A transcript without a trailing newline still ends on a line
+            if data[size - 1:size] != b'\n':
+                extractor.line += 1
+    return extractor.document(transcript_path, size)
+
+
+def scan_transcript(transcript_path: Path) -> Optional[Dict[str, Any]]:
+    """Skill announcements, contract types and question counts of a transcript in one pass.
+
+    Carries the size, skills.announced, *_contract and batched_questions fields of an
+    extracted document. Returns None when the transcript does not exist.
+    """
+    if not transcript_path.is_file():
+        return None
+    size = transcript_path.stat().st_size
+    announced = {}
+    contract_types = set()
+    question_lines = question_blocks = 0
+    batched = False
+    # Absolute offset just past the newline of the last question line
+    question_end = -1
+    if size:
+        with open(transcript_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for base, chunk in _iter_line_chunks(data):
+                for match in SKILL_ANNOUNCEMENT_PATTERN.finditer(chunk):
+                    announced.setdefault(match.group(1).decode('ascii'), None)
+
+                if len(contract_types) < len(CONTRACT_TYPES):
+                    lowered = chunk.lower()
+                    for contract_type in CONTRACT_TYPES:
+                        if contract_type + b' ' + CONTRACT_MARKER in lowered:
+                            contract_types.add(contract_type.decode('ascii'))
+
+                pos = chunk.find(b'?')
+                while pos >= 0:
+                    line_start = chunk.rfind(b'\n', 0, pos) + 1
+                    line_end = chunk.find(b'\n', pos)
+                    line_end = len(chunk) if line_end < 0 else line_end
+                    question_lines += 1
+                    if base + line_start == question_end:
+                        batched = True
+                    else:
+                        question_blocks += 1
+                    question_end = base + line_end + 1
+                    pos = chunk.find(b'?', line_end)
+    return {
+        'source': str(transcript_path),
+        'size': size,
+        'skills': {'announced': list(announced)},
+        'contract_types': sorted(contract_types),
+        'platform_contract': 'platform' in contract_types,
+        'scanner_contract': 'scanner' in contract_types,
+        'question_lines': question_lines,
+        'question_blocks': question_blocks,
+        'batched_questions': batched,
+    }
+
+
+def skill_timeline(document: Dict[str, Any], total_tokens: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """Wall time of each skill in a session, from its skill announcements and timestamps.
+
+    The session is cut at every announcement of a different skill (or, without any
+    announcements, at reads of skills/*.md). A segment lasts from the last timestamp at
+    or before its start to that of the next segment, and the last one to the final
+    timestamp. Elapsed markers are used when the session has them, else clock times.
+    Tokens are estimated as total_tokens split by each segment's share of transcript
+    bytes. Returns None when the session has fewer than two timestamps.
+    """
+    stamps = document.get('timestamps') or []
+    kind = 'elapsed' if any(stamp['kind'] == 'elapsed' for stamp in stamps) else 'clock'
+    stamps = [stamp for stamp in stamps if stamp['kind'] == kind]
+    if len(stamps) < 2:
+        return None
+    stamp_offsets = [stamp['offset'] for stamp in stamps]
+
+    def time_at(offset: int) -> float:
+        index = bisect_right(stamp_offsets, offset) - 1
+        return stamps[max(index, 0)]['seconds']
+
+    mentions = document['skills']['mentions']
+    source = 'announcement' if any(m['source'] == 'announcement' for m in mentions) else 'file'
+    boundaries = [{'skill': NO_SKILL, 'line': 1, 'offset': 0}]
+    for mention in mentions:
+        if mention['source'] == source and mention['skill'] != boundaries[-1]['skill']:
+            boundaries.append({'skill': mention['skill'], 'line': mention['line'], 'offset': mention['offset']})
+    if len(boundaries) > 1 and boundaries[1]['offset'] <= stamps[0]['offset']:
+        # Nothing timed happens before the first skill
+        boundaries.pop(0)
+
+    start_time = stamps[0]['seconds']
+    end_time = stamps[-1]['seconds']
+    size = document['size'] or 1
+    segments = []
+    for i, boundary in enumerate(boundaries):
+        last = i + 1 == len(boundaries)
+        end_offset = document['size'] if last else boundaries[i + 1]['offset']
+        begin = max(time_at(boundary['offset']), start_time)
+        end = end_time if last else time_at(end_offset)
+        segment_bytes = end_offset - boundary['offset']
+        segments.append({
+            'skill': boundary['skill'],
+            'line': boundary['line'],
+            'offset': boundary['offset'],
+            'start_seconds': round(begin - start_time, 3),
+            'seconds': round(max(end - begin, 0.0), 3),
+            'bytes': segment_bytes,
+            'tokens': round(total_tokens * segment_bytes / size) if total_tokens else None,
+        })
+    return {'clock': kind, 'total_seconds': round(end_time - start_time, 3), 'segments': segments}
+
+
+def load_extract(extract_file: Path) -> Optional[Dict[str, Any]]:
+    """Load a saved document; None if missing, unreadable or its transcript has changed since"""
+    try:
+        with open(extract_file, 'r') as f:
+            document = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if document.get('version') != EXTRACT_VERSION:
+        return None
+    source = Path(document.get('source', ''))
+    if source.is_file() and source.stat().st_size != document.get('size'):
+        return None
+    return document
+
+
+def save_extract(document: Dict[str, Any], extract_file: Path):
+    """Write a document atomically"""
+    tmp_file = extract_file.with_name(f'.{extract_file.name}.{os.getpid()}.tmp')
+    with open(tmp_file, 'w') as f:
+        json.dump(document, f, indent=2)
+    os.replace(tmp_file, extract_file)
@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+trend-report.py - Track score, duration and doc-fetch trends across runs and flag regressions
+
+Every validated result becomes a point in its (model, scenario) series, ordered by the
+result timestamp. Per series the engine keeps a bounded window of recent points for
+rolling averages and least-squares slopes, a running baseline (mean and variance) per
+metric, and two-sided CUSUM sums that detect change points: a sustained score drop or
+duration rise raises an alert. Runs also carry the agent_revision (a hash of agents/)
+they exercised; once a new revision has enough runs its averages are compared with
+the previous revision's, so a skill or agent edit that costs score or latency is
+flagged with the revisions involved.
+
+Only that state is kept (in tests/.cache/trends.json), so an update reads just the
+results added since the previous one. Re-validated or deleted results invalidate their
+model's series, which are then rebuilt from that model's results.
+
+Usage:
+    # Update with new results, print the trends and any new alerts
+    python trend-report.py
+
+    # Selected models, with a markdown report; exit 1 if a new alert was raised (CI)
+    python trend-report.py --models claude-sonnet-4,gpt-4-turbo --output trends.md --fail-on-alert
+
+    # Recompute everything from the results
+    python trend-report.py --rebuild
+"""
+
+import argparse
+import json
+import os
+import sys
+from math import sqrt
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+from result_loader import iter_result_files, load_result_fields, result_signature
+
+# ANSI color codes
+RED = '\033[0;31m'
+GREEN = '\033[0;32m'
+YELLOW = '\033[1;33m'
+BLUE = '\033[0;34m'
+NC = '\033[0m'
+
+RESULTS_ROOT = Path(__file__).parent.parent / 'results'
+DEFAULT_STATE = Path(__file__).parent.parent / '.cache' / 'trends.json'
+STATE_VERSION = 1
+TREND_FIELDS = ('language', 'scenario', 'timestamp', 'status', 'agent_revision', 'scores', 'execution',
+                'documentation_fetches')
+
+METRICS = ('score', 'duration', 'doc_fetches')
+# Metric direction that counts as a regression; doc fetch shifts are reported, not alerted
+REGRESSION_DIRECTION = {'score': -1, 'duration': 1}
+# Points kept per series, and how many of the latest make up the rolling average
+WINDOW = 20
+ROLLING = 5
+# CUSUM: points needed for a baseline, slack and decision threshold in standard deviations,
+# and a floor on the deviation so a perfectly stable history does not alarm on noise
+MIN_BASELINE = 5
+CUSUM_SLACK = 0.5
+CUSUM_THRESHOLD = 4.0
+MIN_STD = {'score': 2.0, 'duration': 5.0, 'doc_fetches': 1.0}
+# Agent revisions: runs needed before comparing, and the changes that count as a regression
+REVISION_MIN_RUNS = 3
+REVISION_SCORE_DROP = 5.0
+REVISION_DURATION_RISE = 0.25
+MAX_REVISIONS = 10
+MAX_ALERTS = 500
+
+
+def _number(value: Any) -> Optional[float]:
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def _slope(values: List[float]) -> float:
+    """Least-squares slope per run"""
+    n = len(values)
+    if n < 2:
+        return 0.0
+    mean_x = (n - 1) / 2
+    mean_y = sum(values) / n
+    covariance = sum((i - mean_x) * (v - mean_y) for i, v in enumerate(values))
+    variance = sum((i - mean_x) ** 2 for i in range(n))
+    return covariance / variance
+
+
+def new_state() -> Dict[str, Any]:
+    return {'version': STATE_VERSION, 'files': {}, 'series': {}, 'alerts': []}
+
+
+def load_state(state_file: Path) -> Dict[str, Any]:
+    """Saved engine state, or a fresh one if missing, unreadable or from another version"""
+    try:
+        with open(state_file, 'r') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return new_state()
+    return state if state.get('version') == STATE_VERSION else new_state()
+
+
+def save_state(state: Dict[str, Any], state_file: Path):
+    """Write the state atomically"""
+    state_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = state_file.with_name(f'.{state_file.name}.{os.getpid()}.tmp')
+    with open(tmp_file, 'w') as f:
+        json.dump(state, f, separators=(',', ':'))
+    os.replace(tmp_file, state_file)
+
+
+def _new_baseline() -> Dict[str, Any]:
+    # revision: agent revision of the segment's first run
+    return {'n': 0, 'mean': 0.0, 'm2': 0.0, 'revision': ''}
+
+
+def _new_series(model: str, scenario: str) -> Dict[str, Any]:
+    return {
+        'model': model,
+        'scenario': scenario,
+        'count': 0,
+        'points': [],
+        'baseline': {metric: _new_baseline() for metric in METRICS},
+        'cusum': {metric: {'low': 0.0, 'high': 0.0} for metric in METRICS},
+        'change_points': [],
+        'revisions': [],
+    }
+
+
+def _alert(series: Dict[str, Any], point: Dict[str, Any], kind: str, metric: str,
+           before: float, after: float, previous_revision: str) -> Dict[str, Any]:
+    return {
+        'model': series['model'],
+        'scenario': series['scenario'],
+        'kind': kind,
+        'metric': metric,
+        'before': round(before, 2),
+        'after': round(after, 2),
+        'timestamp': point['timestamp'],
+        'file': point['file'],
+        'agent_revision': point['revision'],
+        'previous_revision': previous_revision,
+    }
+
+
+def _update_cusum(series: Dict[str, Any], point: Dict[str, Any], alerts: List[Dict[str, Any]]):
+    """Feed a point to each metric's baseline and CUSUM sums, recording change points"""
+    for metric in METRICS:
+        value = point[metric]
+        if value is None:
+            continue
+        baseline = series['baseline'][metric]
+        cusum = series['cusum'][metric]
+        if baseline['n'] >= MIN_BASELINE:
+            std = max(sqrt(baseline['m2'] / (baseline['n'] - 1)), MIN_STD[metric])
+            z = (value - baseline['mean']) / std
+            cusum['high'] = max(0.0, cusum['high'] + z - CUSUM_SLACK)
+            cusum['low'] = max(0.0, cusum['low'] - z - CUSUM_SLACK)
+            direction = 1 if cusum['high'] > CUSUM_THRESHOLD else -1 if cusum['low'] > CUSUM_THRESHOLD else 0
+            if direction:
+                series['change_points'] = (series['change_points'] + [{
+                    'metric': metric, 'direction': 'up' if direction > 0 else 'down',
+                    'timestamp': point['timestamp'], 'before': round(baseline['mean'], 2), 'after': value,
+                }])[-MAX_REVISIONS:]
+                if REGRESSION_DIRECTION.get(metric) == direction:
+                    alerts.append(_alert(series, point, 'change-point', metric, baseline['mean'], value,
+                                         baseline['revision']))
+                # Start a new segment: the baseline is rebuilt from the runs after the change
+                series['baseline'][metric] = _new_baseline()
+                series['cusum'][metric] = {'low': 0.0, 'high': 0.0}
+                baseline = series['baseline'][metric]
+        # Welford update of the segment baseline
+        if baseline['n'] == 0:
+            baseline['revision'] = point['revision']
+        baseline['n'] += 1
+        delta = value - baseline['mean']
+        baseline['mean'] += delta / baseline['n']
+        baseline['m2'] += delta * (value - baseline['mean'])
+
+
+def _update_revisions(series: Dict[str, Any], point: Dict[str, Any], alerts: List[Dict[str, Any]]):
+    """Accumulate per-revision averages and compare a new revision with the previous one"""
+    revision = point['revision']
+    if not revision:
+        return
+    revisions = series['revisions']
+    if not revisions or revisions[-1]['revision'] != revision:
+        revisions.append({'revision': revision, 'runs': 0, 'score_sum': 0.0, 'duration_sum': 0.0,
+                          'duration_runs': 0, 'first_seen': point['timestamp'], 'compared': False})
+        del revisions[:-MAX_REVISIONS]
+    current = revisions[-1]
+    current['runs'] += 1
+    current['score_sum'] += point['score']
+    if point['duration'] is not None:
+        current['duration_sum'] += point['duration']
+        current['duration_runs'] += 1
+
+    if current['compared'] or current['runs'] < REVISION_MIN_RUNS or len(revisions) < 2:
+        return
+    previous = revisions[-2]
+    if previous['runs'] < REVISION_MIN_RUNS:
+        return
+    current['compared'] = True
+    before = previous['score_sum'] / previous['runs']
+    after = current['score_sum'] / current['runs']
+    if before - after >= REVISION_SCORE_DROP:
+        alerts.append(_alert(series, point, 'revision', 'score', before, after, previous['revision']))
+    if previous['duration_runs'] and current['duration_runs']:
+        before = previous['duration_sum'] / previous['duration_runs']
+        after = current['duration_sum'] / current['duration_runs']
+        if before > 0 and (after - before) / before >= REVISION_DURATION_RISE:
+            alerts.append(_alert(series, point, 'revision', 'duration', before, after, previous['revision']))
+
+
+def add_point(series: Dict[str, Any], point: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Add one run to a series; returns the alerts it raised"""
+    alerts = []
+    series['count'] += 1
+    series['points'] = (series['points'] + [point])[-WINDOW:]
+    _update_cusum(series, point, alerts)
+    _update_revisions(series, point, alerts)
+    return alerts
+
+
+def to_point(result: Dict[str, Any], file: str) -> Optional[Dict[str, Any]]:
+    """Trend point of a validated result; None for results that have not been scored"""
+    if result.get('status') not in ('passed', 'failed'):
+        return None
+    score = _number((result.get('scores') or {}).get('total'))
+    if score is None:
+        return None
+    return {
+        'timestamp': str(result.get('timestamp', '')),
+        'file': file,
+        'status': result['status'],
+        'revision': str(result.get('agent_revision') or ''),
+        'score': score,
+        'duration': _number((result.get('execution') or {}).get('duration_seconds')),
+        'doc_fetches': _number((result.get('documentation_fetches') or {}).get('total_count')),
+    }
+
+
+def update(state: Dict[str, Any], results_root: Path, models: List[str]) -> Dict[str, Any]:
+    """Feed results added since the last update; rebuilds when processed results changed"""
+    files = {}
+    for model in models:
+        model_dir = results_root / model
+        if model_dir.is_dir():
+            for result_file in iter_result_files(model_dir):
+                files[str(result_file.resolve())] = (model, model_dir, result_file)
+
+    # A processed result that was re-validated or deleted invalidates its model's series
+    known = state['files']
+    stale = sorted({model for path, (model, signature) in known.items() if model in models and
+                    (path not in files or result_signature(files[path][2]) != signature)})
+    if stale:
+        state['files'] = {path: entry for path, entry in known.items() if entry[0] not in stale}
+        state['series'] = {key: series for key, series in state['series'].items() if series['model'] not in stale}
+        state['alerts'] = [alert for alert in state['alerts'] if alert['model'] not in stale]
+        known = state['files']
+
+    pending = []
+    for path, (model, model_dir, result_file) in files.items():
+        if path in known:
+            continue
+        try:
+            result = load_result_fields(result_file, TREND_FIELDS)
+        except (OSError, ValueError):
+            continue
+        point = to_point(result, str(result_file.relative_to(model_dir)))
+        if point is None:
+            # Picked up once it has been validated
+            continue
+        key = f"{result.get('language')}/{result.get('scenario')}"
+        pending.append((point['timestamp'], path, model, key, point, result_signature(result_file)))
+
+    new_alerts = []
+    for _, path, model, key, point, signature in sorted(pending):
+        series = state['series'].setdefault(f'{model}|{key}', _new_series(model, key))
+        new_alerts.extend(add_point(series, point))
+        known[path] = [model, signature]
+    state['alerts'] = (state['alerts'] + new_alerts)[-MAX_ALERTS:]
+    return {'added': len(pending), 'rebuilt': stale, 'alerts': new_alerts}
+
+
+def series_summary(series: Dict[str, Any]) -> Dict[str, Any]:
+    """Rolling averages and slopes of a series' recent points"""
+    summary = {'model': series['model'], 'scenario': series['scenario'], 'runs': series['count'],
+               'last_timestamp': series['points'][-1]['timestamp'] if series['points'] else '',
+               'revision': series['points'][-1]['revision'] if series['points'] else '',
+               'change_points': series['change_points']}
+    for metric in METRICS:
+        values = [p[metric] for p in series['points'] if p[metric] is not None]
+        recent = values[-ROLLING:]
+        summary[f'{metric}_avg'] = sum(recent) / len(recent) if recent else None
+        summary[f'{metric}_slope'] = _slope(values)
+    recent_points = series['points'][-ROLLING:]
+    summary['pass_rate'] = (sum(1 for p in recent_points if p['status'] == 'passed') / len(recent_points) * 100
+                            if recent_points else 0)
+    return summary
+
+
+def model_summary(model: str, summaries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """A model's current level and trend: the mean over its scenario series"""
+    summary = {'model': model, 'scenarios': len(summaries), 'runs': sum(s['runs'] for s in summaries),
+               'last_timestamp': max((s['last_timestamp'] for s in summaries), default='')}
+    for key in ('pass_rate',) + tuple(f'{m}_{part}' for m in METRICS for part in ('avg', 'slope')):
+        values = [s[key] for s in summaries if s[key] is not None]
+        summary[key] = sum(values) / len(values) if values else None
+    return summary
+
+
+def _fmt(value: Optional[float], digits: int = 1, signed: bool = False) -> str:
+    if value is None:
+        return '-'
+    return f'{value:+.{digits}f}' if signed else f'{value:.{digits}f}'
+
+
+def describe_alert(alert: Dict[str, Any]) -> str:
+    unit = 's' if alert['metric'] == 'duration' else ''
+    text = (f"{alert['metric']} {alert['before']}{unit} → {alert['after']}{unit}")
+    if alert['kind'] == 'revision':
+        return f"{text} after agent change {alert['previous_revision'] or '?'} → {alert['agent_revision'] or '?'}"
+    if alert['previous_revision'] and alert['previous_revision'] != alert['agent_revision']:
+        return f"{text} (change point, agent {alert['previous_revision']} → {alert['agent_revision']})"
+    return f"{text} (change point)"
+
+
+def generate_markdown_report(models: List[Dict[str, Any]], scenarios: List[Dict[str, Any]],
+                             alerts: List[Dict[str, Any]], output_file: Path):
+    """Write the trend report"""
+    latest = max((m['last_timestamp'] for m in models), default='')
+    report = []
+    report.append("# SonarArchitect Trend Report")
+    report.append("")
+    report.append(f"**Results through:** {latest or 'n/a'}")
+    report.append(f"**Runs:** {sum(m['runs'] for m in models)} across {len(scenarios)} model/scenario series")
+    report.append("")
+    report.append(f"Averages cover each scenario's last {ROLLING} runs; trends are least-squares slopes "
+                  f"per run over the last {WINDOW}.")
+    report.append("")
+    report.append("## Models")
+    report.append("")
+    report.append("| Model | Runs | Pass Rate | Score | Score Trend | Duration | Duration Trend | Doc Fetches | Doc Trend |")
+    report.append("|-------|------|-----------|-------|-------------|----------|----------------|-------------|-----------|")
+    for m in models:
+        report.append(
+            f"| {m['model']} | {m['runs']} | {_fmt(m['pass_rate'])}% | {_fmt(m['score_avg'])}/100 | "
+            f"{_fmt(m['score_slope'], 2, True)} | {_fmt(m['duration_avg'], 0)}s | {_fmt(m['duration_slope'], 1, True)}s | "
+            f"{_fmt(m['doc_fetches_avg'])} | {_fmt(m['doc_fetches_slope'], 2, True)} |"
+        )
+    report.append("")
+    report.append("## Alerts")
+    report.append("")
+    if alerts:
+        report.append("| When | Model | Scenario | Regression | Result |")
+        report.append("|------|-------|----------|------------|--------|")
+        for alert in reversed(alerts[-50:]):
+            report.append(f"| {alert['timestamp']} | {alert['model']} | {alert['scenario']} | "
+                          f"{describe_alert(alert)} | `{alert['file']}` |")
+    else:
+        report.append("No regressions detected.")
+    report.append("")
+    report.append("## Scenarios")
+    report.append("")
+    report.append("| Model | Scenario | Runs | Score | Score Trend | Duration | Duration Trend | Doc Fetches | Agent | Last Change Point |")
+    report.append("|-------|----------|------|-------|-------------|----------|----------------|-------------|-------|-------------------|")
+    for s in scenarios:
+        change = s['change_points'][-1] if s['change_points'] else None
+        change_text = f"{change['metric']} {change['direction']} at {change['timestamp']}" if change else '-'
+        report.append(
+            f"| {s['model']} | {s['scenario']} | {s['runs']} | {_fmt(s['score_avg'])} | {_fmt(s['score_slope'], 2, True)} | "
+            f"{_fmt(s['duration_avg'], 0)}s | {_fmt(s['duration_slope'], 1, True)}s | {_fmt(s['doc_fetches_avg'])} | "
+            f"{s['revision'] or '-'} | {change_text} |"
+        )
+    report.append("")
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_file, 'w') as f:
+        f.write('\n'.join(report))
+
+
+def print_console_report(models: List[Dict[str, Any]], outcome: Dict[str, Any]):
+    print("\n" + "=" * 100)
+    print(f"{BLUE}Trends{NC}")
+    print("=" * 100)
+    print("")
+    if outcome['rebuilt']:
+        print(f"{YELLOW}Results changed for {', '.join(outcome['rebuilt'])}, rebuilt their series{NC}")
+    print(f"{BLUE}Update:{NC} {outcome['added']} new results")
+    print("")
+    print(f"{'Model':<25} {'Runs':<8} {'Score':<10} {'Trend/run':<12} {'Duration':<10} {'Trend/run':<12} {'Doc Fetches':<12}")
+    print("-" * 100)
+    for m in models:
+        print(f"{m['model']:<25} {m['runs']:<8} {_fmt(m['score_avg']):<10} {_fmt(m['score_slope'], 2, True):<12} "
+              f"{_fmt(m['duration_avg'], 0) + 's':<10} {_fmt(m['duration_slope'], 1, True):<12} "
+              f"{_fmt(m['doc_fetches_avg']):<12}")
+    print("")
+    if outcome['alerts']:
+        print(f"{RED}New regressions ({len(outcome['alerts'])}):{NC}")
+        for alert in outcome['alerts']:
+            print(f"  {RED}✗{NC} {alert['model']} {alert['scenario']}: {describe_alert(alert)}")
+    else:
+        print(f"{GREEN}✓{NC} No new regressions")
+    print("")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Track result trends and detect regressions')
+    parser.add_argument('--models', help='Comma-separated models (default: every model with results)')
+    parser.add_argument('--results-dir', help=f'Results root directory (default: {RESULTS_ROOT})')
+    parser.add_argument('--state', help=f'Engine state file (default: {DEFAULT_STATE})')
+    parser.add_argument('--output', help='Write a markdown trend report to this file')
+    parser.add_argument('--json', action='store_true', help='Print the trend summaries as JSON')
+    parser.add_argument('--rebuild', action='store_true', help='Discard the state and process every result')
+    parser.add_argument('--fail-on-alert', action='store_true', help='Exit with 1 if this update raised an alert')
+
+    args = parser.parse_args()
+
+    results_root = Path(args.results_dir) if args.results_dir else RESULTS_ROOT
+    state_file = Path(args.state) if args.state else DEFAULT_STATE
+    if args.models:
+        models = [m.strip() for m in args.models.split(',')]
+    else:
+        models = sorted(p.name for p in results_root.iterdir() if p.is_dir()) if results_root.is_dir() else []
+    if not models:
+        print(f"{YELLOW}Warning: No results found in {results_root}{NC}")
+        sys.exit(0)
+
+    state = new_state() if args.rebuild else load_state(state_file)
+    outcome = update(state, results_root, models)
+    save_state(state, state_file)
+
+    scenario_summaries = [series_summary(s) for _, s in sorted(state['series'].items()) if s['model'] in models]
+    model_summaries = [model_summary(model, [s for s in scenario_summaries if s['model'] == model])
+                       for model in models if any(s['model'] == model for s in scenario_summaries)]
+    alerts = [a for a in state['alerts'] if a['model'] in models]
+
+    if args.json:
+        json.dump({'models': model_summaries, 'scenarios': scenario_summaries, 'alerts': alerts,
+                   'new_alerts': outcome['alerts']}, sys.stdout, indent=2)
+        print()
+    else:
+        print_console_report(model_summaries, outcome)
+
+    if args.output:
+        generate_markdown_report(model_summaries, scenario_summaries, alerts, Path(args.output))
+        if not args.json:
+            print(f"{GREEN}✓{NC} Trend report generated: {args.output}\n")
+
+    if args.fail_on_alert and outcome['alerts']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
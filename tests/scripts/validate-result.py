@@ -4,15 +4,42 @@ validate-result.py - Validate test results against scenario expectations
 
 Usage:
     python validate-result.py --scenario <scenario-file> --result <result-file>
+
+    # Batch mode: validate every result under a directory (or matching a glob)
+    python validate-result.py --batch <results-dir-or-glob> [--workers N]
+
+Validation output is written to <result>.validation.json next to the result (see
+result_loader.py); the result file itself is never rewritten.
+
+Validation output is cached under tests/.cache/validation, keyed by a hash of every
+input (result, transcript, scenario, assertions, this script and the local modules it
+imports); pass --no-cache
+to force recomputation.
+
+--profile records wall time per checkpoint and match counts/durations per assertion
+regex in a validation.timings block, and flags slow or backtracking-prone patterns.
 """
 
 import argparse
+import contextlib
+import glob
+import hashlib
+import io
 import json
+import os
 import yaml
 import re
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+
+from result_loader import is_result_file, iter_result_files, load_result_fields, write_validation_sidecar
+from scenario_manifest import ScenarioError, ScenarioManifest
+from transcript_extractor import load_extract, scan_transcript
 
 # ANSI color codes
 RED = '\033[0;31m'
@@ -21,20 +48,202 @@ YELLOW = '\033[1;33m'
 BLUE = '\033[0;34m'
 NC = '\033[0m'  # No Color
 
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / '.cache' / 'validation'
+DEFAULT_CACHE_ENTRIES = 2000
+
+# A single assertion regex call slower than this is reported when profiling
+SLOW_RULE_MS = 50.0
+# A quantified group that itself contains a quantifier, e.g. (a+)+ or (\w*\s?)*,
+# can backtrack exponentially on inputs that almost match
+NESTED_QUANTIFIER_PATTERN = re.compile(r'\((?:[^()\\]|\\.)*(?:[*+]|\{\d*,\d*\})(?:[^()\\]|\\.)*\)(?:[*+]|\{\d*,\d*\})')
+
+
+def _load_assertion_file(assertions_dir: Path, name: str) -> Optional[Dict[str, Any]]:
+    """Load a single assertion JSON file, or None if it does not exist"""
+    assertion_file = assertions_dir / name
+    if not assertion_file.exists():
+        return None
+    with open(assertion_file, 'r') as f:
+        return json.load(f)
+
+
+class AssertionRules:
+    """Assertion rules loaded once per assertions directory with all regexes precompiled.
+
+    Rules are indexed by language (scanner selection, relevant documentation pages)
+    and by platform (version currency) so validators only look at what applies.
+    A section is None when its assertion file is missing.
+    """
+
+    def __init__(self, assertions_dir: Path):
+        self.assertions_dir = assertions_dir
+
+        self.scanner_by_language = None
+        scanner_assertions = _load_assertion_file(assertions_dir, 'scanner-selection.json')
+        if scanner_assertions is not None:
+            self.scanner_by_language = {}
+            for rule in scanner_assertions.get('rules', []):
+                self.scanner_by_language.setdefault(rule.get('language'), {
+                    'expected_scanner': rule.get('expected_scanner'),
+                    'correct_patterns': [re.compile(p) for p in rule.get('correct_patterns', [])],
+                    'incorrect_patterns': [
+                        (re.compile(i.get('pattern')), i.get('reason'))
+                        for i in rule.get('incorrect_patterns', [])
+                    ]
+                })
+
+        self.token_patterns = None
+        security_assertions = _load_assertion_file(assertions_dir, 'security-compliance.json')
+        if security_assertions is not None:
+            self.token_patterns = [
+                (re.compile(p.get('regex')), p.get('failure_message'))
+                for rule in security_assertions.get('rules', [])
+                if rule['id'] == 'no-hardcoded-tokens'
+                for p in rule.get('patterns', [])
+            ]
+
+        self.version_checks_by_platform = None
+        self.version_last_updated = ''
+        self.version_stale = False
+        version_assertions = _load_assertion_file(assertions_dir, 'version-currency.json')
+        if version_assertions is not None:
+            self.version_checks_by_platform = {
+                platform: [
+                    {
+                        'name': action['name'],
+                        'pattern': re.compile(action.get('pattern')),
+                        'current_version': action.get('current_version', '').replace('v', ''),
+                        'deprecated_versions': {v.replace('v', '') for v in action.get('deprecated_versions', [])}
+                    }
+                    for action in checks.get('actions', [])
+                ]
+                for platform, checks in version_assertions.get('platforms', {}).items()
+            }
+            self.version_last_updated = version_assertions.get('last_updated', '')
+            staleness_days = version_assertions.get('staleness_warning_days', 90)
+            if self.version_last_updated:
+                try:
+                    updated_date = datetime.strptime(self.version_last_updated, '%Y-%m-%d')
+                    self.version_stale = datetime.now() - updated_date > timedelta(days=staleness_days)
+                except ValueError:
+                    pass
+
+        self.doc_assertions = _load_assertion_file(assertions_dir, 'documentation-fetches.json')
+        self.doc_rules = {}
+        self.doc_pages_by_language = {}
+        if self.doc_assertions is not None:
+            for rule in self.doc_assertions.get('rules', []):
+                self.doc_rules.setdefault(rule['id'], rule)
+            relevant_pages_rule = self.doc_rules.get('relevant-pages')
+            if relevant_pages_rule:
+                self.doc_pages_by_language = {
+                    language: [compile_page_pattern(p) for p in patterns]
+                    for language, patterns in relevant_pages_rule['expected_patterns_by_language'].items()
+                }
+
+
+    def iter_patterns(self):
+        """Yield (rule id, compiled pattern) for every assertion regex"""
+        for language, lang_rules in (self.scanner_by_language or {}).items():
+            for pattern in lang_rules['correct_patterns']:
+                yield f'scanner-selection:{pattern.pattern}', pattern
+            for pattern, _ in lang_rules['incorrect_patterns']:
+                yield f'scanner-selection:{pattern.pattern}', pattern
+        for pattern, _ in self.token_patterns or []:
+            yield f'security-compliance:{pattern.pattern}', pattern
+        for checks in (self.version_checks_by_platform or {}).values():
+            for action in checks:
+                yield f"version-currency:{action['pattern'].pattern}", action['pattern']
+        for patterns in self.doc_pages_by_language.values():
+            for expected in patterns:
+                yield f"documentation-fetches:{expected['pattern'].pattern}", expected['pattern']
+
+    def find_backtracking_risks(self) -> List[Dict[str, str]]:
+        """Flag assertion regexes with nested quantifiers (catastrophic backtracking risk)"""
+        risks = {}
+        for rule_id, pattern in self.iter_patterns():
+            if NESTED_QUANTIFIER_PATTERN.search(pattern.pattern):
+                risks[rule_id] = {'rule': rule_id, 'reason': 'nested quantifier (backtracking risk)'}
+        return list(risks.values())
+
+
+def compile_page_pattern(expected: Dict[str, Any]) -> Dict[str, Any]:
+    """Precompile an expected documentation page pattern"""
+    return {
+        'pattern': re.compile(expected.get('pattern')),
+        'description': expected.get('description'),
+        'score': expected.get('score', 1)
+    }
+
+
+class LiteralMatcher:
+    """Literal checks for one expected file, evaluated once per captured file.
+
+    The must_contain / must_not_contain literals of every expectation on a path
+    are deduplicated up front and find() reports which of them occur in the
+    file's content. Each literal is checked with ``in``: CPython's substring search beats
+    a single-pass regex or automaton scan for literal sets of scenario size.
+    """
+
+    def __init__(self, literals: List[str]):
+        self.literals = list(dict.fromkeys(literals))
+
+    def find(self, content: str) -> set:
+        """Return the subset of literals present in content"""
+        return {literal for literal in self.literals if literal in content}
+
+
+@lru_cache(maxsize=None)
+def scenario_manifest() -> ScenarioManifest:
+    """Compiled scenario manifest, loaded once per process"""
+    return ScenarioManifest()
+
+
+def load_scenario(scenario_file: Path) -> Dict[str, Any]:
+    """Load a scenario from the compiled manifest, parsing the YAML directly if it does not compile"""
+    try:
+        return scenario_manifest().get(scenario_file)['scenario']
+    except ScenarioError:
+        with open(scenario_file, 'r') as f:
+            return yaml.safe_load(f)
+
+
+@lru_cache(maxsize=None)
+def load_assertion_rules(assertions_dir: Path) -> AssertionRules:
+    """Load and compile assertion rules, once per assertions directory"""
+    return AssertionRules(assertions_dir)
+
 
 class TestValidator:
-    def __init__(self, scenario_file: Path, result_file: Path, assertions_dir: Path):
+    def __init__(self, scenario_file: Path, result_file: Path, assertions_dir: Path,
+                 rules: Optional[AssertionRules] = None, scenario: Optional[Dict[str, Any]] = None,
+                 profile: bool = False):
         self.scenario_file = scenario_file
         self.result_file = result_file
         self.assertions_dir = assertions_dir
+        self.rules = rules or load_assertion_rules(assertions_dir)
         
-        # Load files
-        with open(scenario_file, 'r') as f:
-            self.scenario = yaml.safe_load(f)
+        # Load files (batch mode passes the already parsed scenario)
+        self.scenario = scenario if scenario is not None else load_scenario(scenario_file)
         
         with open(result_file, 'r') as f:
             self.result = json.load(f)
         
+        # First file wins when the same path was captured twice
+        self.files_by_path = {}
+        for file_info in self.result.get('files_created', []):
+            self.files_by_path.setdefault(file_info.get('path'), file_info)
+        
+        # Literal checks grouped per expected path, evaluated at most once per captured file
+        literals_by_path = {}
+        for expected_file in self.scenario.get('expected', {}).get('files_created', []):
+            literals_by_path.setdefault(expected_file.get('path'), []).extend(
+                expected_file.get('must_contain', []) + expected_file.get('must_not_contain', []))
+        self.literal_matchers = {path: LiteralMatcher(literals) for path, literals in literals_by_path.items()}
+        self._literals_found = {}
+        self._transcript_scan = None
+        self._transcript_scanned = False
+        
         # Initialize scores
         self.scores = {
             'accuracy': 0,
@@ -51,18 +260,27 @@ class TestValidator:
         
         self.checkpoints = []
         self.failures = []
+        
+        # Opt-in profiling: wall time per checkpoint, calls/matches/durations per rule
+        self.profile = profile
+        self.checkpoint_timings = {}
+        self.rule_timings = {}
     
     def validate_all(self) -> Dict[str, Any]:
         """Run all validations"""
         print(f"\n{BLUE}Validating Test Results{NC}\n")
         
         # Run validation checks
-        self.validate_skill_invocation()
-        self.validate_scanner_selection()
-        self.validate_files_created()
-        self.validate_version_currency()
-        self.validate_usability()
-        self.validate_output_contracts()
+        start = time.perf_counter()
+        for check in (self.validate_execution,
+                      self.validate_skill_invocation,
+                      self.validate_scanner_selection,
+                      self.validate_files_created,
+                      self.validate_version_currency,
+                      self.validate_usability,
+                      self.validate_output_contracts):
+            self._run_checkpoint(check)
+        total_ms = (time.perf_counter() - start) * 1000
 
         # Calculate total score
         self.scores['total'] = sum(self.scores.values()) - self.scores['total']
@@ -70,20 +288,89 @@ class TestValidator:
         # Status is informational: show failures if any hard failures occurred
         status = 'FAILED' if self.failures else 'PASSED'
 
-        return {
+        validation_result = {
             'status': status,
             'scores': self.scores,
             'max_scores': self.max_scores,
             'checkpoints': self.checkpoints,
             'failures': self.failures
         }
+        if self.profile:
+            validation_result['timings'] = self.get_timings(total_ms)
+        return validation_result
+    
+    def _run_checkpoint(self, check):
+        """Run one validate_* checkpoint, timing it when profiling"""
+        if not self.profile:
+            check()
+            return
+        start = time.perf_counter()
+        check()
+        name = check.__name__[len('validate_'):]
+        self.checkpoint_timings[name] = round((time.perf_counter() - start) * 1000, 3)
+    
+    def _match(self, source: str, pattern, text: str, method: str = 'search'):
+        """Apply an assertion regex, recording calls, matches and duration when profiling"""
+        if not self.profile:
+            return getattr(pattern, method)(text)
+        
+        start = time.perf_counter()
+        result = getattr(pattern, method)(text)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        
+        stats = self.rule_timings.setdefault(f'{source}:{pattern.pattern}', {
+            'calls': 0, 'matches': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'max_input_chars': 0
+        })
+        stats['calls'] += 1
+        stats['matches'] += len(result) if isinstance(result, list) else int(result is not None)
+        stats['total_ms'] += elapsed_ms
+        if elapsed_ms > stats['max_ms']:
+            stats['max_ms'] = elapsed_ms
+            stats['max_input_chars'] = len(text)
+        return result
+    
+    def get_timings(self, total_ms: float) -> Dict[str, Any]:
+        """Build the validation.timings block from the collected profile"""
+        rules = {
+            rule_id: {**stats, 'total_ms': round(stats['total_ms'], 3), 'max_ms': round(stats['max_ms'], 3)}
+            for rule_id, stats in sorted(self.rule_timings.items(), key=lambda item: -item[1]['total_ms'])
+        }
+        slow_rules = self.rules.find_backtracking_risks()
+        flagged = {risk['rule'] for risk in slow_rules}
+        for rule_id, stats in rules.items():
+            if stats['max_ms'] > SLOW_RULE_MS and rule_id not in flagged:
+                slow_rules.append({
+                    'rule': rule_id,
+                    'reason': f"single call took {stats['max_ms']:.1f} ms on {stats['max_input_chars']} chars"
+                })
+        return {
+            'total_ms': round(total_ms, 3),
+            'checkpoints': self.checkpoint_timings,
+            'rules': rules,
+            'slow_rules': slow_rules
+        }
     
+    def validate_execution(self):
+        """Validate that the agent run finished before its deadline"""
+        execution = self.result.get('execution', {})
+        if not execution.get('timed_out'):
+            return
+        print(f"{YELLOW}[Checkpoint]{NC} Validating agent execution...")
+        message = f"Agent timed out after {execution.get('duration_seconds', '?')}s"
+        self.failures.append(message)
+        print(f"  {RED}✗{NC} {message}")
+        self.checkpoints.append({
+            'name': 'execution',
+            'status': 'failed',
+            'message': message
+        })
+
     def validate_skill_invocation(self):
         """Validate that correct skills were invoked in proper order"""
         print(f"{YELLOW}[Checkpoint]{NC} Validating skill invocation...")
         
         expected_skills = self.scenario.get('expected', {}).get('skills_invoked', [])
-        actual_skills = self.result.get('skills_invoked', [])
+        actual_skills = self.get_skills_invoked()
         
         # Check if all expected skills are present
         missing_skills = set(expected_skills) - set(actual_skills)
@@ -120,16 +407,14 @@ class TestValidator:
             content = file_info.get('content', '')
             
             # Check for correct patterns
-            for pattern in lang_rules.get('correct_patterns', []):
-                if re.search(pattern, content):
+            for pattern in lang_rules['correct_patterns']:
+                if self._match('scanner-selection', pattern, content):
                     correct_scanner = True
                     break
             
             # Check for incorrect patterns
-            for incorrect in lang_rules.get('incorrect_patterns', []):
-                pattern = incorrect.get('pattern')
-                if re.search(pattern, content):
-                    reason = incorrect.get('reason')
+            for pattern, reason in lang_rules['incorrect_patterns']:
+                if self._match('scanner-selection', pattern, content):
                     self.failures.append(f"Incorrect scanner: {reason}")
                     print(f"  {RED}✗{NC} {reason}")
                     correct_scanner = False
@@ -142,21 +427,12 @@ class TestValidator:
         
         language = self.scenario.get('language')
         
-        # Load scanner selection assertions
-        assertion_file = self.assertions_dir / 'scanner-selection.json'
-        if not assertion_file.exists():
+        if self.rules.scanner_by_language is None:
             print(f"  {YELLOW}!{NC} No scanner assertions found")
             return
         
-        with open(assertion_file, 'r') as f:
-            scanner_assertions = json.load(f)
-        
         # Find language-specific rules
-        lang_rules = None
-        for rule in scanner_assertions.get('rules', []):
-            if rule.get('language') == language:
-                lang_rules = rule
-                break
+        lang_rules = self.rules.scanner_by_language.get(language)
         
         if not lang_rules:
             print(f"  {YELLOW}!{NC} No rules for language: {language}")
@@ -181,37 +457,35 @@ class TestValidator:
                 'message': 'Incorrect scanner selection'
             })
     
-    def _validate_single_file(self, expected_file, actual_files):
+    def _validate_single_file(self, expected_file):
         """Helper to validate a single file's content"""
         expected_path = expected_file.get('path')
         must_contain = expected_file.get('must_contain', [])
         must_not_contain = expected_file.get('must_not_contain', [])
         
         # Find matching file
-        actual_file = None
-        for af in actual_files:
-            if af.get('path') == expected_path:
-                actual_file = af
-                break
+        actual_file = self.files_by_path.get(expected_path)
         
         if not actual_file:
             self.failures.append(f"File not created: {expected_path}")
             print(f"  {RED}✗{NC} File not created: {expected_path}")
             return False
         
-        content = actual_file.get('content', '')
+        if expected_path not in self._literals_found:
+            self._literals_found[expected_path] = self.literal_matchers[expected_path].find(actual_file.get('content', ''))
+        found = self._literals_found[expected_path]
         all_present = True
         
         # Check must_contain
         for item in must_contain:
-            if item not in content:
+            if item not in found:
                 self.failures.append(f"Missing content in {expected_path}: {item}")
                 print(f"  {RED}✗{NC} Missing: {item}")
                 all_present = False
         
         # Check must_not_contain
         for item in must_not_contain:
-            if item in content:
+            if item in found:
                 self.failures.append(f"Forbidden content in {expected_path}: {item}")
                 print(f"  {RED}✗{NC} Contains forbidden: {item}")
                 all_present = False
@@ -226,16 +500,15 @@ class TestValidator:
         print(f"{YELLOW}[Checkpoint]{NC} Validating file creation...")
         
         expected_files = self.scenario.get('expected', {}).get('files_created', [])
-        actual_files = self.result.get('files_created', [])
         
         for expected_file in expected_files:
-            if self._validate_single_file(expected_file, actual_files):
+            if self._validate_single_file(expected_file):
                 self.scores['accuracy'] += 5
 
         # Cap accuracy at maximum to prevent overflow from many files
         self.scores['accuracy'] = min(self.scores['accuracy'], self.max_scores['accuracy'])
     
-    def _check_security_violations(self, files_created, security_rules):
+    def _check_security_violations(self, files_created, token_patterns):
         """Helper to check for security violations in files"""
         security_pass = True
         
@@ -243,15 +516,12 @@ class TestValidator:
             content = file_info.get('content', '')
             
             # Check for hardcoded tokens
-            for rule in security_rules:
-                if rule['id'] == 'no-hardcoded-tokens':
-                    for pattern_info in rule.get('patterns', []):
-                        pattern = pattern_info.get('regex')
-                        if re.search(pattern, content):
-                            self.failures.append(pattern_info.get('failure_message'))
-                            print(f"  {RED}✗{NC} {pattern_info.get('failure_message')}")
-                            security_pass = False
-                            self.scores['security'] -= 20
+            for pattern, failure_message in token_patterns:
+                if self._match('security-compliance', pattern, content):
+                    self.failures.append(failure_message)
+                    print(f"  {RED}✗{NC} {failure_message}")
+                    security_pass = False
+                    self.scores['security'] -= 20
         
         return security_pass
     
@@ -259,17 +529,12 @@ class TestValidator:
         """Validate security best practices"""
         print(f"{YELLOW}[Checkpoint]{NC} Validating security compliance...")
         
-        # Load security assertions
-        assertion_file = self.assertions_dir / 'security-compliance.json'
-        if not assertion_file.exists():
+        if self.rules.token_patterns is None:
             print(f"  {YELLOW}!{NC} No security assertions found")
             return
         
-        with open(assertion_file, 'r') as f:
-            security_assertions = json.load(f)
-        
         files_created = self.result.get('files_created', [])
-        security_pass = self._check_security_violations(files_created, security_assertions.get('rules', []))
+        security_pass = self._check_security_violations(files_created, self.rules.token_patterns)
         
         if security_pass:
             self.scores['security'] += 20
@@ -284,26 +549,13 @@ class TestValidator:
         """Validate that latest versions are used"""
         print(f"{YELLOW}[Checkpoint]{NC} Validating version currency...")
         
-        # Load version assertions
-        assertion_file = self.assertions_dir / 'version-currency.json'
-        if not assertion_file.exists():
+        if self.rules.version_checks_by_platform is None:
             print(f"  {YELLOW}!{NC} No version assertions found")
             return
-        
-        with open(assertion_file, 'r') as f:
-            version_assertions = json.load(f)
 
         # Warn if version data may be stale
-        from datetime import datetime, timedelta
-        last_updated = version_assertions.get('last_updated', '')
-        staleness_days = version_assertions.get('staleness_warning_days', 90)
-        if last_updated:
-            try:
-                updated_date = datetime.strptime(last_updated, '%Y-%m-%d')
-                if datetime.now() - updated_date > timedelta(days=staleness_days):
-                    print(f"  {YELLOW}!{NC} Warning: version-currency.json may be stale (last updated: {last_updated})")
-            except ValueError:
-                pass
+        if self.rules.version_stale:
+            print(f"  {YELLOW}!{NC} Warning: version-currency.json may be stale (last updated: {self.rules.version_last_updated})")
 
         platform = self.scenario.get('platform')
         files_created = self.result.get('files_created', [])
@@ -311,22 +563,20 @@ class TestValidator:
         current_versions_used = 0
         total_checks = 0
         
+        # Get platform-specific version checks (GitHub Actions specific)
+        platform_checks = self.rules.version_checks_by_platform.get(platform, [])
+        
         for file_info in files_created:
             content = file_info.get('content', '')
             
-            # Get platform-specific version checks
-            platform_checks = version_assertions.get('platforms', {}).get(platform, {})
-            
-            # Check actions (GitHub Actions specific)
-            for action in platform_checks.get('actions', []):
-                pattern = action.get('pattern')
-                matches = re.findall(pattern, content)
+            for action in platform_checks:
+                matches = self._match('version-currency', action['pattern'], content, method='findall')
                 
                 for match in matches:
                     total_checks += 1
-                    if match == action.get('current_version', '').replace('v', ''):
+                    if match == action['current_version']:
                         current_versions_used += 1
-                    elif match in [v.replace('v', '') for v in action.get('deprecated_versions', [])]:
+                    elif match in action['deprecated_versions']:
                         self.failures.append(f"Deprecated version: {action['name']}@v{match}")
                         print(f"  {RED}✗{NC} Deprecated: {action['name']}@v{match}")
         
@@ -337,9 +587,9 @@ class TestValidator:
         else:
             print(f"  {YELLOW}!{NC} No version checks applicable")
     
-    def _check_min_fetches(self, doc_assertions, total_fetches):
+    def _check_min_fetches(self, total_fetches):
         """Check minimum fetch count rule and return score"""
-        min_fetches_rule = next((r for r in doc_assertions['rules'] if r['id'] == 'minimum-fetches'), None)
+        min_fetches_rule = self.rules.doc_rules.get('minimum-fetches')
         if not min_fetches_rule:
             return 0
         
@@ -356,9 +606,9 @@ class TestValidator:
             print(f"  {GREEN}✓{NC} Sufficient fetches ({total_fetches})")
             return min_fetches_rule.get('score_if_met', 3)
     
-    def _check_max_fetches(self, doc_assertions, total_fetches):
+    def _check_max_fetches(self, total_fetches):
         """Check maximum fetch count rule and return score"""
-        max_fetches_rule = next((r for r in doc_assertions['rules'] if r['id'] == 'maximum-fetches'), None)
+        max_fetches_rule = self.rules.doc_rules.get('maximum-fetches')
         if not max_fetches_rule:
             return 0
         
@@ -372,9 +622,9 @@ class TestValidator:
             return max_fetches_rule.get('score_if_exceeded', -2)
         return 0
     
-    def _check_official_sources(self, doc_assertions, fetched_domains, platform):
+    def _check_official_sources(self, fetched_domains, platform):
         """Check official sources rule and return score"""
-        official_sources_rule = next((r for r in doc_assertions['rules'] if r['id'] == 'official-sources'), None)
+        official_sources_rule = self.rules.doc_rules.get('official-sources')
         if not official_sources_rule:
             return 0
         
@@ -397,27 +647,27 @@ class TestValidator:
                 print(f"  {YELLOW}!{NC} No fetches from {domain}")
         return score
     
-    def _check_relevant_pages(self, doc_assertions, fetched_pages, language):
+    def _check_relevant_pages(self, fetched_pages, language):
         """Check relevant pages rule and return score"""
-        relevant_pages_rule = next((r for r in doc_assertions['rules'] if r['id'] == 'relevant-pages'), None)
+        relevant_pages_rule = self.rules.doc_rules.get('relevant-pages')
         if not relevant_pages_rule:
             return 0
         
-        expected_patterns = relevant_pages_rule['expected_patterns_by_language'].get(language, [])
+        expected_patterns = list(self.rules.doc_pages_by_language.get(language, []))
         scenario_doc_fetch = self.scenario.get('expected', {}).get('documentation_fetches', {})
         if 'expected_pages' in scenario_doc_fetch:
             for page in scenario_doc_fetch['expected_pages']:
-                expected_patterns.append(page)
+                expected_patterns.append(compile_page_pattern(page))
         
         score = 0
         for expected in expected_patterns:
-            pattern = expected.get('pattern')
-            description = expected.get('description')
-            score_value = expected.get('score', 1)
+            pattern = expected['pattern']
+            description = expected['description']
+            score_value = expected['score']
             
             matched = False
             for page in fetched_pages:
-                if re.search(pattern, page.get('url', '')):
+                if self._match('documentation-fetches', pattern, page.get('url', '')):
                     matched = True
                     print(f"  {GREEN}✓{NC} Fetched: {description}")
                     score += score_value
@@ -427,7 +677,7 @@ class TestValidator:
                 print(f"  {YELLOW}!{NC} Missing: {description}")
         return score
     
-    def _check_duplicate_fetches(self, doc_assertions, fetched_pages, total_fetches):
+    def _check_duplicate_fetches(self, fetched_pages, total_fetches):
         """Check duplicate fetches rule and return score"""
         if total_fetches == 0:
             return 0
@@ -435,7 +685,7 @@ class TestValidator:
         unique_urls = len({p.get('url') for p in fetched_pages})
         duplicate_ratio = 1 - (unique_urls / total_fetches)
         
-        no_dup_rule = next((r for r in doc_assertions['rules'] if r['id'] == 'no-duplicate-fetches'), None)
+        no_dup_rule = self.rules.doc_rules.get('no-duplicate-fetches')
         if not no_dup_rule:
             return 0
         
@@ -446,9 +696,9 @@ class TestValidator:
             print(f"  {YELLOW}!{NC} {no_dup_rule.get('warning_message')}")
             return 0
     
-    def _check_curl_md_pattern(self, doc_assertions, fetched_pages):
+    def _check_curl_md_pattern(self, fetched_pages):
         """Check that docs.sonarsource.com URLs use .md extension, warn if not"""
-        curl_md_rule = next((r for r in doc_assertions['rules'] if r['id'] == 'curl-md-pattern'), None)
+        curl_md_rule = self.rules.doc_rules.get('curl-md-pattern')
         if not curl_md_rule:
             return 0
 
@@ -485,14 +735,11 @@ class TestValidator:
         """Validate that proper documentation was fetched"""
         print(f"{YELLOW}[Checkpoint]{NC} Validating documentation fetches...")
         
-        assertion_file = self.assertions_dir / 'documentation-fetches.json'
-        if not assertion_file.exists():
+        doc_assertions = self.rules.doc_assertions
+        if doc_assertions is None:
             print(f"  {YELLOW}!{NC} No documentation fetch assertions found")
             return
         
-        with open(assertion_file, 'r') as f:
-            doc_assertions = json.load(f)
-        
         actual_doc_fetch = self.result.get('documentation_fetches', {})
         total_fetches = actual_doc_fetch.get('total_count', 0)
         fetched_pages = actual_doc_fetch.get('pages', [])
@@ -508,12 +755,12 @@ class TestValidator:
         max_doc_score = doc_assertions.get('scoring', {}).get('max_points', 15)
         doc_score = 0
         
-        doc_score += self._check_min_fetches(doc_assertions, total_fetches)
-        doc_score += self._check_max_fetches(doc_assertions, total_fetches)
-        doc_score += self._check_official_sources(doc_assertions, fetched_domains, platform)
-        doc_score += self._check_relevant_pages(doc_assertions, fetched_pages, language)
-        doc_score += self._check_duplicate_fetches(doc_assertions, fetched_pages, total_fetches)
-        doc_score += self._check_curl_md_pattern(doc_assertions, fetched_pages)
+        doc_score += self._check_min_fetches(total_fetches)
+        doc_score += self._check_max_fetches(total_fetches)
+        doc_score += self._check_official_sources(fetched_domains, platform)
+        doc_score += self._check_relevant_pages(fetched_pages, language)
+        doc_score += self._check_duplicate_fetches(fetched_pages, total_fetches)
+        doc_score += self._check_curl_md_pattern(fetched_pages)
         
         actual_doc_score = min(max(doc_score, 0), max_doc_score)
         self.scores['efficiency'] += actual_doc_score
@@ -541,7 +788,7 @@ class TestValidator:
         """Validate usability - clear setup instructions provided to user"""
         print(f"{YELLOW}[Checkpoint]{NC} Validating usability...")
 
-        skills_invoked = self.result.get('skills_invoked', [])
+        skills_invoked = self.get_skills_invoked()
         files_created = self.result.get('files_created', [])
         usability_score = 0
 
@@ -575,22 +822,34 @@ class TestValidator:
             'message': f'Usability score: {usability_score}/{self.max_scores["usability"]}'
         })
 
+    def get_skills_invoked(self) -> List[str]:
+        """Skills the result recorded, or the transcript's announcements for results captured without them"""
+        if 'skills_invoked' in self.result:
+            return self.result['skills_invoked']
+        transcript = self.get_transcript_scan()
+        return transcript['skills']['announced'] if transcript else []
+
+    def get_transcript_scan(self) -> Optional[Dict[str, Any]]:
+        """Transcript document written by the runner, or a scan of the agent output made once"""
+        if not self._transcript_scanned:
+            execution = self.result.get('execution', {})
+            if execution.get('transcript_extract'):
+                self._transcript_scan = load_extract(Path(execution['transcript_extract']))
+            if self._transcript_scan is None and execution.get('agent_output'):
+                self._transcript_scan = scan_transcript(Path(execution['agent_output']))
+            self._transcript_scanned = True
+        return self._transcript_scan
+
     def validate_efficiency_batching(self):
         """Validate that prerequisite questions were batched efficiently"""
         print(f"{YELLOW}[Checkpoint]{NC} Validating question batching efficiency...")
 
-        agent_output_path = self.result.get('execution', {}).get('agent_output', '')
-        if not agent_output_path or not Path(agent_output_path).exists():
+        transcript = self.get_transcript_scan()
+        if transcript is None:
             print(f"  {YELLOW}!{NC} Agent output not available for batching check")
             return
 
-        with open(agent_output_path, 'r', errors='replace') as f:
-            output = f.read()
-
-        # Heuristic: multiple question marks in close proximity indicates batched questions
-        question_blocks = re.findall(r'[^\n]*\?[^\n]*\n[^\n]*\?', output)
-
-        if question_blocks:
+        if transcript['batched_questions']:
             batching_score = 5
             print(f"  {GREEN}✓{NC} Questions appear to be batched efficiently")
         else:
@@ -611,18 +870,13 @@ class TestValidator:
         """Validate that Output Contracts were produced by platform and scanner skills"""
         print(f"{YELLOW}[Checkpoint]{NC} Validating Output Contracts...")
 
-        agent_output_path = self.result.get('execution', {}).get('agent_output', '')
-        agent_output = ''
-        if agent_output_path and Path(agent_output_path).exists():
-            with open(agent_output_path, 'r', errors='replace') as f:
-                agent_output = f.read()
-
-        if not agent_output:
+        transcript = self.get_transcript_scan()
+        if not transcript or transcript['size'] == 0:
             print(f"  {YELLOW}!{NC} Agent output not available for Output Contract check")
             return
 
-        platform_contract = bool(re.search(r'Platform Output Contract', agent_output, re.IGNORECASE))
-        scanner_contract = bool(re.search(r'Scanner Output Contract', agent_output, re.IGNORECASE))
+        platform_contract = transcript['platform_contract']
+        scanner_contract = transcript['scanner_contract']
 
         if platform_contract:
             self.scores['accuracy'] = min(self.scores['accuracy'] + 5, self.max_scores['accuracy'])
@@ -643,14 +897,305 @@ class TestValidator:
         })
 
 
+@lru_cache(maxsize=None)
+def validator_code_hash() -> str:
+    """Hash of this script and every local module it has loaded, computed once per process"""
+    script_dir = Path(__file__).resolve().parent
+    code_files = {Path(__file__).resolve()}
+    for module in list(sys.modules.values()):
+        module_file = getattr(module, '__file__', None)
+        if module_file and Path(module_file).resolve().parent == script_dir:
+            code_files.add(Path(module_file).resolve())
+    digest = hashlib.sha256()
+    for code_file in sorted(code_files):
+        ValidationCache._hash_file(digest, code_file)
+    return digest.hexdigest()
+
+
+class ValidationCache:
+    """Content-addressed store of validation outputs, bounded to the most recently used entries.
+
+    The key hashes every input of a validation, so any change to the result,
+    transcript, scenario, assertions or validator code misses automatically.
+    Entries are plain JSON files; their mtime is the LRU clock.
+    """
+
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR, max_entries: int = DEFAULT_CACHE_ENTRIES):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+
+    @staticmethod
+    def _hash_file(digest, path: Path):
+        """Feed a file's bytes into the digest, marking missing files explicitly"""
+        digest.update(str(path).encode() + b'\0')
+        if not path.is_file():
+            digest.update(b'<missing>')
+            return
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        digest.update(b'\0')
+
+    def key(self, scenario_file: Path, result_file: Path, assertions_dir: Path) -> str:
+        """Compute the cache key for one validation"""
+        digest = hashlib.sha256()
+        digest.update(validator_code_hash().encode())
+        self._hash_file(digest, scenario_file)
+        for assertion_file in sorted(assertions_dir.glob('*.json')):
+            self._hash_file(digest, assertion_file)
+        
+        # Validation output lives in the sidecar, so the result's raw bytes are all input
+        self._hash_file(digest, result_file)
+        execution = load_result_fields(result_file, ('execution',)).get('execution') or {}
+        for transcript_field in ('agent_output', 'transcript_extract'):
+            transcript_path = execution.get(transcript_field, '')
+            if transcript_path:
+                self._hash_file(digest, Path(transcript_path))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached validation for a key, refreshing its LRU position"""
+        entry = self.cache_dir / f'{key}.json'
+        try:
+            with open(entry, 'r') as f:
+                cached = json.load(f)
+            os.utime(entry)
+        except (OSError, ValueError):
+            return None
+        return cached
+
+    def put(self, key: str, validation_result: Dict[str, Any]):
+        """Store a validation and evict the least recently used entries beyond the bound"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry = self.cache_dir / f'{key}.json'
+        tmp_entry = entry.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_entry, 'w') as f:
+            json.dump(validation_result, f)
+        os.replace(tmp_entry, entry)
+        
+        entries = list(self.cache_dir.glob('*.json'))
+        if len(entries) <= self.max_entries:
+            return
+        by_age = []
+        for cached_entry in entries:
+            try:
+                by_age.append((cached_entry.stat().st_mtime, cached_entry))
+            except FileNotFoundError:
+                pass
+        by_age.sort()
+        for _, stale_entry in by_age[:len(by_age) - self.max_entries]:
+            try:
+                stale_entry.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def validate_result(scenario_file: Path, result_file: Path, assertions_dir: Path,
+                    cache: Optional[ValidationCache] = None,
+                    scenario: Optional[Dict[str, Any]] = None,
+                    profile: bool = False) -> tuple:
+    """Validate one result, replaying a cached validation when the inputs are unchanged.
+
+    Profiling always recomputes: replayed timings would be meaningless.
+    Returns (validation_result, cached).
+    """
+    if profile:
+        cache = None
+    key = cache.key(scenario_file, result_file, assertions_dir) if cache else None
+    if key:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached, True
+    
+    validator = TestValidator(scenario_file, result_file, assertions_dir, scenario=scenario, profile=profile)
+    validation_result = validator.validate_all()
+    if key:
+        cache.put(key, validation_result)
+    return validation_result, False
+
+
+def print_cached_validation(validation_result: Dict[str, Any]):
+    """Replay the checkpoints and failures of a cached validation"""
+    print(f"\n{BLUE}Validating Test Results{NC} (cached, inputs unchanged)\n")
+    for checkpoint in validation_result['checkpoints']:
+        if checkpoint['status'] == 'passed':
+            icon = f"{GREEN}✓{NC}"
+        elif checkpoint['status'] == 'failed':
+            icon = f"{RED}✗{NC}"
+        else:
+            icon = f"{YELLOW}!{NC}"
+        print(f"  {icon} {checkpoint['name']}: {checkpoint['message']}")
+    for failure in validation_result['failures']:
+        print(f"  {RED}✗{NC} {failure}")
+
+
+def default_assertions_dir(scenario_file: Path) -> Path:
+    """Locate the assertions directory next to the scenarios tree"""
+    # Path structure: .../tests/scenarios/<language>/<name>.yaml
+    # Go up 3 levels from the file to reach tests/
+    tests_dir = scenario_file.parent.parent.parent if 'scenarios' in str(scenario_file) else scenario_file.parent
+    return tests_dir / 'assertions'
+
+
+def print_validation_summary(validation_result: Dict[str, Any], max_scores: Dict[str, int]):
+    """Print the score summary for a single validation"""
+    print(f"\n{'=' * 44}")
+    status = validation_result['status']
+    if status == 'PASSED':
+        print(f"{GREEN}TEST {status} ✓{NC}")
+    else:
+        print(f"{RED}TEST {status} ✗{NC}")
+    print(f"{'=' * 44}")
+    
+    max_total = sum(max_scores.values())
+    print(f"Score: {validation_result['scores']['total']}/{max_total}")
+    print(f"  Accuracy:   {validation_result['scores']['accuracy']}/{max_scores['accuracy']}")
+    print(f"  Currency:   {validation_result['scores']['currency']}/{max_scores['currency']}")
+    print(f"  Usability:  {validation_result['scores']['usability']}/{max_scores['usability']}")
+    print(f"{'=' * 44}\n")
+
+
+def print_timings(timings: Dict[str, Any], top: int = 5):
+    """Print the profiling block: checkpoints, most expensive rules and flagged patterns"""
+    print(f"{BLUE}Validation timings{NC} (total {timings['total_ms']:.1f} ms)")
+    for name, elapsed_ms in sorted(timings['checkpoints'].items(), key=lambda item: -item[1]):
+        print(f"  {name:<22} {elapsed_ms:>9.2f} ms")
+    if timings['rules']:
+        print(f"\n  Top {min(top, len(timings['rules']))} assertion patterns by time:")
+        for rule_id, stats in list(timings['rules'].items())[:top]:
+            print(f"  {stats['total_ms']:>9.2f} ms  {stats['calls']:>4} calls  {stats['matches']:>4} matches  {rule_id}")
+    for slow in timings['slow_rules']:
+        print(f"  {YELLOW}!{NC} {slow['rule']}: {slow['reason']}")
+    print("")
+
+
+def find_result_files(target: str) -> List[Path]:
+    """Find result JSON files in a results directory or matching a glob"""
+    target_path = Path(target)
+    if target_path.is_dir():
+        return list(iter_result_files(target_path, recursive=True))
+    return sorted(path for path in (Path(p) for p in glob.glob(target, recursive=True))
+                  if path.is_file() and is_result_file(path))
+
+
+def _validate_batch_item(scenario_file: Path, scenario: Dict[str, Any], result_file: Path,
+                         assertions_dir: Path, cache: Optional[ValidationCache], profile: bool) -> Dict[str, Any]:
+    """Validate one result inside a batch worker, keeping its console output quiet"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        validation_result, cached = validate_result(scenario_file, result_file, assertions_dir,
+                                                    cache=cache, scenario=scenario, profile=profile)
+        write_validation_sidecar(result_file, validation_result)
+    return {
+        'status': validation_result['status'],
+        'total': validation_result['scores']['total'],
+        'max_total': sum(validation_result['max_scores'].values()),
+        'failures': len(validation_result['failures']),
+        'cached': cached
+    }
+
+
+def run_batch(target: str, scenarios_dir: Path, assertions_dir: Path, workers: int,
+              cache: Optional[ValidationCache] = None, profile: bool = False) -> int:
+    """Validate every result under a directory or glob with a process pool"""
+    result_files = find_result_files(target)
+    if not result_files:
+        print(f"{YELLOW}Warning: No result files found for {target}{NC}")
+        return 0
+    
+    # Parse each scenario once and share it across all results for that scenario
+    scenarios = {}
+    jobs = []
+    skipped = 0
+    for result_file in result_files:
+        try:
+            # Only the two fields that pick the scenario; the worker loads the whole result
+            result = load_result_fields(result_file, ('scenario', 'language'))
+        except (OSError, ValueError):
+            result = None
+        if not isinstance(result, dict) or 'scenario' not in result:
+            skipped += 1
+            continue
+        
+        scenario_file = scenarios_dir / result.get('language', '') / f"{result['scenario']}.yaml"
+        if scenario_file not in scenarios:
+            scenarios[scenario_file] = load_scenario(scenario_file) if scenario_file.exists() else None
+        if scenarios[scenario_file] is None:
+            print(f"  {YELLOW}!{NC} No scenario for {result_file}: {scenario_file}")
+            skipped += 1
+            continue
+        jobs.append((scenario_file, result_file))
+    
+    print(f"\n{BLUE}Validating {len(jobs)} results with {min(workers, max(len(jobs), 1))} workers{NC}\n")
+    
+    passed = failed = errors = cached = 0
+    with ProcessPoolExecutor(max_workers=min(workers, max(len(jobs), 1))) as pool:
+        futures = {
+            pool.submit(_validate_batch_item, scenario_file, scenarios[scenario_file], result_file,
+                        assertions_dir, cache, profile): result_file
+            for scenario_file, result_file in jobs
+        }
+        for future in as_completed(futures):
+            result_file = futures[future]
+            try:
+                outcome = future.result()
+            except Exception as e:
+                errors += 1
+                print(f"{RED}✗ ERROR{NC}  {result_file}: {e}")
+                continue
+            cached += outcome['cached']
+            note = ' (cached)' if outcome['cached'] else ''
+            if outcome['status'] == 'PASSED':
+                passed += 1
+                print(f"{GREEN}✓ PASSED{NC}  {outcome['total']:>3}/{outcome['max_total']}  {result_file}{note}")
+            else:
+                failed += 1
+                print(f"{RED}✗ FAILED{NC}  {outcome['total']:>3}/{outcome['max_total']}  {result_file} ({outcome['failures']} failures){note}")
+    
+    print(f"\n{'=' * 44}")
+    print(f"Validated: {passed + failed}  {GREEN}Passed: {passed}{NC}  {RED}Failed: {failed}{NC}")
+    if cached:
+        print(f"{BLUE}From cache:{NC} {cached}")
+    if skipped:
+        print(f"{YELLOW}Skipped:{NC} {skipped}")
+    if errors:
+        print(f"{RED}Errors:{NC} {errors}")
+    print(f"{'=' * 44}\n")
+    
+    return 1 if errors else 0
+
+
 def main():
     parser = argparse.ArgumentParser(description='Validate test results against scenarios')
-    parser.add_argument('--scenario', required=True, help='Path to scenario YAML file')
-    parser.add_argument('--result', required=True, help='Path to result JSON file')
+    parser.add_argument('--scenario', help='Path to scenario YAML file')
+    parser.add_argument('--result', help='Path to result JSON file')
     parser.add_argument('--assertions-dir', help='Path to assertions directory')
+    parser.add_argument('--batch', metavar='PATH_OR_GLOB',
+                        help='Validate every result in a results directory or matching a glob')
+    parser.add_argument('--scenarios-dir', help='Scenarios directory used to resolve results in batch mode')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes for batch mode (default: CPU count)')
+    parser.add_argument('--no-cache', action='store_true', help='Always recompute, never read or write the validation cache')
+    parser.add_argument('--cache-dir', help=f'Validation cache directory (default: {DEFAULT_CACHE_DIR})')
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_ENTRIES,
+                        help=f'Maximum cached validations kept (default: {DEFAULT_CACHE_ENTRIES})')
+    parser.add_argument('--profile', action='store_true',
+                        help='Record checkpoint and assertion regex timings in validation.timings (bypasses the cache)')
     
     args = parser.parse_args()
     
+    cache = None
+    if not args.no_cache:
+        cache = ValidationCache(Path(args.cache_dir) if args.cache_dir else DEFAULT_CACHE_DIR, args.cache_size)
+    
+    if args.batch:
+        tests_dir = Path(__file__).parent.parent
+        scenarios_dir = Path(args.scenarios_dir) if args.scenarios_dir else tests_dir / 'scenarios'
+        assertions_dir = Path(args.assertions_dir) if args.assertions_dir else tests_dir / 'assertions'
+        sys.exit(run_batch(args.batch, scenarios_dir, assertions_dir, max(args.workers, 1), cache, args.profile))
+    
+    if not args.scenario or not args.result:
+        parser.error('--scenario and --result are required unless --batch is given')
+    
     scenario_file = Path(args.scenario)
     result_file = Path(args.result)
     
@@ -666,40 +1211,20 @@ def main():
     if args.assertions_dir:
         assertions_dir = Path(args.assertions_dir)
     else:
-        # Path structure: .../tests/scenarios/<language>/<name>.yaml
-        # Go up 3 levels from the file to reach tests/
-        tests_dir = scenario_file.parent.parent.parent if 'scenarios' in str(scenario_file) else scenario_file.parent
-        assertions_dir = tests_dir / 'assertions'
+        assertions_dir = default_assertions_dir(scenario_file)
     
     # Run validation
-    validator = TestValidator(scenario_file, result_file, assertions_dir)
-    validation_result = validator.validate_all()
-    
-    # Print summary
-    print(f"\n{'=' * 44}")
-    status = validation_result['status']
-    if status == 'PASSED':
-        print(f"{GREEN}TEST {status} ✓{NC}")
-    else:
-        print(f"{RED}TEST {status} ✗{NC}")
-    print(f"{'=' * 44}")
+    validation_result, cached = validate_result(scenario_file, result_file, assertions_dir,
+                                                cache=cache, profile=args.profile)
+    if cached:
+        print_cached_validation(validation_result)
     
-    max_total = sum(validator.max_scores.values())
-    print(f"Score: {validation_result['scores']['total']}/{max_total}")
-    print(f"  Accuracy:   {validation_result['scores']['accuracy']}/{validator.max_scores['accuracy']}")
-    print(f"  Currency:   {validation_result['scores']['currency']}/{validator.max_scores['currency']}")
-    print(f"  Usability:  {validation_result['scores']['usability']}/{validator.max_scores['usability']}")
-    print(f"{'=' * 44}\n")
+    print_validation_summary(validation_result, validation_result['max_scores'])
+    if 'timings' in validation_result:
+        print_timings(validation_result['timings'])
     
-    # Update result file with validation
-    with open(result_file, 'r+') as f:
-        result_data = json.load(f)
-        result_data['validation'] = validation_result
-        result_data['scores'] = validation_result['scores']
-        result_data['status'] = status.lower()
-        f.seek(0)
-        json.dump(result_data, f, indent=2)
-        f.truncate()
+    # Record validation next to the result instead of rewriting it
+    write_validation_sidecar(result_file, validation_result)
     
     sys.exit(0)
 
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+workspace_files.py - Shared definition of which test workspace files are the agent's work
+
+capture-workspace.py captures these files into a result and agent-replay.py records
+and replays changes to them, so both must skip exactly the same paths: git internals,
+the agent setup provisioned into every workspace and the runner's own output files.
+
+Usage:
+    from workspace_files import iter_workspace_files
+"""
+
+import os
+from pathlib import Path
+from typing import Iterator
+
+# Never the agent's work: git internals and the agent setup copied into every workspace
+EXCLUDED_DIRS = {'.git'}
+EXCLUDED_DIR_PATHS = {'.github/agents'}
+# Test metadata written by run-scenario.sh at the workspace root
+EXCLUDED_FILES = {'result.json', 'result.validation.json', 'agent-output.txt', 'session.md', 'doc-fetches.json',
+                  'transcript.json'}
+
+
+def iter_workspace_files(workspace: Path) -> Iterator[str]:
+    """Yield workspace-relative paths of the agent's files in a stable order"""
+    for root, dirs, files in os.walk(workspace):
+        rel_root = os.path.relpath(root, workspace)
+        rel_root = '' if rel_root == '.' else rel_root.replace(os.sep, '/')
+        dirs[:] = sorted(
+            d for d in dirs
+            if d not in EXCLUDED_DIRS and f'{rel_root}/{d}'.lstrip('/') not in EXCLUDED_DIR_PATHS
+        )
+        for name in sorted(files):
+            rel_path = f'{rel_root}/{name}' if rel_root else name
+            if rel_path in EXCLUDED_FILES:
+                continue
+            if os.path.isfile(os.path.join(root, name)):
+                yield rel_path
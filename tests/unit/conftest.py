@@ -0,0 +1,20 @@
+"""Shared setup for the unit tests of the scripts in tests/scripts"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).parent.parent / 'scripts'
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+
+def load_script(name: str):
+    """Import a hyphenated CLI script (e.g. compare-models.py) as a module"""
+    module_name = name.replace('-', '_')
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, SCRIPTS_DIR / f'{name}.py')
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
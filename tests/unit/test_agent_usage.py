@@ -0,0 +1,69 @@
+"""Tests for the usage summary parser in agent-usage.py"""
+
+from conftest import load_script
+
+agent_usage = load_script('agent-usage')
+
+SUMMARY = """Done. Pipeline created.
+
+Total usage est:       1.5 Premium requests
+Total duration (API):  1m 12.4s
+Total duration (wall): 1h 2m 3s
+Total code changes:    12 lines added, 0 lines removed
+Usage by model:
+    claude-sonnet-4      45.2k input, 1.2k output, 30.1k cache read, 0 cache write (Est. 1 Premium request)
+    gpt-5-mini           420 input, 1.5m output (Est. 0.5 Premium requests)
+
+"""
+
+
+def test_parse_usage():
+    usage = agent_usage.parse_usage(SUMMARY)
+    assert usage == {
+        'models': {
+            'claude-sonnet-4': {'input': 45200, 'output': 1200, 'cache_read': 30100, 'cache_write': 0},
+            'gpt-5-mini': {'input': 420, 'output': 1500000, 'cache_read': 0, 'cache_write': 0},
+        },
+        'premium_requests': 1.5,
+        'api_seconds': 72.4,
+        'wall_seconds': 3723.0,
+    }
+
+
+def test_parse_usage_reads_the_last_summary():
+    earlier = SUMMARY.replace('45.2k input', '1k input').replace('1.5 Premium', '9 Premium')
+    usage = agent_usage.parse_usage(earlier + 'Resumed.\n' + SUMMARY)
+    assert usage['models']['claude-sonnet-4']['input'] == 45200
+    assert usage['premium_requests'] == 1.5
+
+
+def test_parse_usage_without_summary():
+    assert agent_usage.parse_usage('no summary here\n') is None
+    assert agent_usage.parse_usage('Usage by model:\n\n(nothing)\n') is None
+
+
+def test_durations():
+    assert agent_usage._seconds('250ms') == 0.25
+    assert agent_usage._seconds('2m 0.5s') == 120.5
+    assert agent_usage._seconds('unknown') is None
+
+
+def test_usage_document_prices_each_model():
+    usage = agent_usage.parse_usage(SUMMARY)
+    pricing = {
+        'claude-sonnet-4': {'input': 3.0, 'output': 15.0, 'cache_read': 0.3, 'cache_write': 3.75},
+        'gpt-5-mini': {'input': 0.25, 'output': 2.0},
+    }
+    document = agent_usage.usage_document(usage, pricing, 'claude-sonnet-4')
+    assert document['total_tokens'] == 45200 + 1200 + 420 + 1500000
+    expected = (45200 * 3.0 + 1200 * 15.0 + 30100 * 0.3 + 420 * 0.25 + 1500000 * 2.0) / 1e6
+    assert document['cost'] == round(expected, 6)
+    assert document['usage']['cache_read_tokens'] == 30100
+    assert document['usage']['premium_requests'] == 1.5
+
+
+def test_usage_document_falls_back_to_model_under_test_and_unpriced_models():
+    usage = agent_usage.parse_usage(SUMMARY)
+    document = agent_usage.usage_document(usage, {'gpt-5-mini': {'input': 1.0}}, 'gpt-5-mini')
+    assert document['cost'] == round((45200 + 420) * 1.0 / 1e6, 6)
+    assert agent_usage.usage_document(usage, {}, 'other')['cost'] is None
@@ -0,0 +1,56 @@
+"""Tests for the bootstrap statistics in compare-models.py"""
+
+import random
+from array import array
+
+from conftest import load_script
+
+compare_models = load_script('compare-models')
+
+
+def naive_bootstrap(columns, resamples, rng):
+    """Resampled means computed directly, drawing the same indices as bootstrap_means()"""
+    names = list(columns)
+    n = len(columns[names[0]])
+    indices = list(compare_models._resample_indices(n, resamples, rng))
+    means = {name: [] for name in names}
+    for start in range(0, len(indices), n):
+        drawn = indices[start:start + n]
+        for name in names:
+            means[name].append(sum(columns[name][i] for i in drawn) / n)
+    return means
+
+
+def test_bootstrap_means_matches_direct_resampling():
+    data = random.Random(1)
+    columns = {
+        'total': array('d', (data.uniform(0, 100) for _ in range(37))),
+        'duration': array('d', (data.uniform(30, 900) for _ in range(37))),
+        'fetches': array('d', (data.randint(0, 40) for _ in range(37))),
+        'negative': array('d', (data.uniform(-5, 5) for _ in range(37))),
+    }
+    packed = compare_models.bootstrap_means(columns, 200, random.Random(7))
+    direct = naive_bootstrap(columns, 200, random.Random(7))
+    for name in columns:
+        assert len(packed[name]) == 200
+        # Values are packed at FIXED_POINT_SCALE resolution
+        tolerance = 1 / compare_models.FIXED_POINT_SCALE
+        assert all(abs(a - b) <= tolerance for a, b in zip(packed[name], direct[name]))
+
+
+def test_bootstrap_means_of_constant_and_single_run_columns():
+    columns = {'total': array('d', [42.0] * 5), 'duration': array('d', [0.0] * 5)}
+    means = compare_models.bootstrap_means(columns, 50, random.Random(0))
+    assert set(means['total']) == {42.0}
+    assert set(means['duration']) == {0.0}
+
+    single = compare_models.bootstrap_means({'total': array('d', [3.5])}, 10, random.Random(0))
+    assert list(single['total']) == [3.5] * 10
+
+
+def test_p_value_and_interval():
+    a = array('d', [1.0, 2.0, 3.0, 4.0])
+    assert compare_models._p_value(a, a) == 1.0
+    assert compare_models._p_value(array('d', [5.0] * 4), a) == 0.0
+    ordered = array('d', range(100))
+    assert compare_models._interval(ordered, 0.5) == (25, 75)
@@ -0,0 +1,118 @@
+"""Tests for CONNECT handling in doc-proxy.py"""
+
+import shutil
+import socket
+import subprocess
+import threading
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from conftest import load_script
+
+doc_proxy = load_script('doc-proxy')
+
+
+@contextmanager
+def running(server):
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server.server_address[1]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def offline_proxy(tmp_path, monkeypatch):
+    """An offline proxy without a local CA, tracking into tmp_path"""
+    tracking_file = tmp_path / 'doc-fetches.json'
+    monkeypatch.setattr(doc_proxy.ProxyHandler, 'cache', doc_proxy.DocCache(tmp_path / 'cache', []))
+    monkeypatch.setattr(doc_proxy.ProxyHandler, 'tracker', doc_proxy.FetchTracker(tracking_file))
+    monkeypatch.setattr(doc_proxy.ProxyHandler, 'authority', None)
+    monkeypatch.setattr(doc_proxy.ProxyHandler, 'offline', True)
+    monkeypatch.setattr(doc_proxy.ProxyHandler, 'quiet', True)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), doc_proxy.ProxyHandler)
+    server.daemon_threads = True
+    with running(server) as port:
+        yield port, tracking_file
+
+
+def connect(proxy_port, target):
+    """Send a CONNECT and return the socket and the proxy's status line"""
+    sock = socket.create_connection(('127.0.0.1', proxy_port), timeout=5)
+    sock.sendall(f'CONNECT {target} HTTP/1.1\r\nHost: {target}\r\n\r\n'.encode())
+    response = b''
+    while b'\r\n\r\n' not in response:
+        chunk = sock.recv(4096)
+        if not chunk:
+            break
+        response += chunk
+    return sock, response.split(b'\r\n', 1)[0].decode()
+
+
+def test_offline_tunnels_hosts_that_are_not_documentation(offline_proxy):
+    proxy_port, tracking_file = offline_proxy
+    upstream = socket.socket()
+    upstream.bind(('127.0.0.1', 0))
+    upstream.listen(1)
+
+    def echo():
+        conn, _ = upstream.accept()
+        with conn:
+            conn.sendall(conn.recv(1024).upper())
+
+    threading.Thread(target=echo, daemon=True).start()
+    sock, status = connect(proxy_port, f'127.0.0.1:{upstream.getsockname()[1]}')
+    with sock:
+        assert ' 200 ' in status
+        sock.sendall(b'model api traffic')
+        assert sock.recv(1024) == b'MODEL API TRAFFIC'
+    upstream.close()
+    assert not tracking_file.exists()
+
+
+def test_offline_refuses_documentation_https_without_a_ca(offline_proxy):
+    proxy_port, tracking_file = offline_proxy
+    sock, status = connect(proxy_port, 'docs.sonarsource.com:443')
+    sock.close()
+    assert ' 504 ' in status
+    assert not tracking_file.exists()
+
+
+needs_openssl = pytest.mark.skipif(not shutil.which('openssl'), reason='openssl not available')
+
+
+def openssl(*args):
+    return subprocess.run(['openssl', *args], capture_output=True, text=True)
+
+
+@needs_openssl
+def test_ca_is_name_constrained_and_short_lived(tmp_path):
+    authority = doc_proxy.CertAuthority(tmp_path, ['docs.example.com', 'Api.Example.org']).ensure()
+    text = openssl('x509', '-noout', '-text', '-in', str(authority.cert_file)).stdout
+    assert 'X509v3 Name Constraints: critical' in text
+    assert 'DNS:docs.example.com' in text and 'DNS:api.example.org' in text
+    assert openssl('x509', '-noout', '-checkend', str(doc_proxy.CA_DAYS * 86400),
+                   '-in', str(authority.cert_file)).returncode != 0
+
+    chain = ['verify', '-CAfile', str(authority.cert_file)]
+    assert openssl(*chain, str(authority._issue('docs.example.com'))).returncode == 0
+    outside = openssl(*chain, str(authority._issue('www.example.net')))
+    assert outside.returncode != 0 and 'subtree violation' in outside.stderr
+
+
+@needs_openssl
+def test_ca_is_recreated_when_the_host_list_changes(tmp_path):
+    authority = doc_proxy.CertAuthority(tmp_path, ['docs.example.com']).ensure()
+    original = authority.cert_file.read_bytes()
+    issued = authority._issue('docs.example.com')
+
+    doc_proxy.CertAuthority(tmp_path, ['DOCS.example.com']).ensure()
+    assert authority.cert_file.read_bytes() == original and issued.is_file()
+
+    doc_proxy.CertAuthority(tmp_path, ['docs.example.com', 'extra.example.com']).ensure()
+    assert authority.cert_file.read_bytes() != original
+    assert not issued.exists()
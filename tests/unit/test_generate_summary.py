@@ -0,0 +1,155 @@
+"""Tests for the incremental SummaryState in generate-summary.py"""
+
+import json
+
+from conftest import load_script
+
+generate_summary = load_script('generate-summary')
+SummaryState = generate_summary.SummaryState
+
+
+def write_result(results_dir, name, status, language='maven', total=None, fetches=0):
+    workspace = results_dir / f'.workspace-{name}-1'
+    workspace.mkdir(exist_ok=True)
+    result = {'scenario': name, 'language': language, 'status': status,
+              'files_created': {'pipeline.yml': 'x' * 5000},
+              'documentation_fetches': {'total_count': fetches}}
+    if total is not None:
+        result['scores'] = {'total': total}
+    result_file = workspace / 'result.json'
+    result_file.write_text(json.dumps(result))
+    return result_file
+
+
+def rebuilt(results_dir):
+    with SummaryState(results_dir, rebuild=True) as state:
+        state.sync()
+        return state.categorize()
+
+
+def test_incremental_updates_match_rebuild(tmp_path):
+    first = write_result(tmp_path, 'a', 'passed', total=90, fetches=4)
+    write_result(tmp_path, 'b', 'failed', language='gradle', total=40)
+    with SummaryState(tmp_path) as state:
+        state.sync()
+
+    # Replace one result, add another and delete a third, one at a time
+    third = write_result(tmp_path, 'c', 'success', language='dotnet')
+    with SummaryState(tmp_path) as state:
+        assert state.loaded
+        state.add_result(third)
+    write_result(tmp_path, 'a', 'failed', total=5, fetches=2)
+    with SummaryState(tmp_path) as state:
+        state.add_result(first)
+    third.unlink()
+    with SummaryState(tmp_path) as state:
+        state.add_result(third)
+        categorized = state.categorize()
+
+    assert categorized == rebuilt(tmp_path)
+    stats = categorized['stats']
+    assert (stats['total_scenarios'], stats['passed'], stats['failed'], stats['pending']) == (2, 0, 2, 0)
+    assert stats['avg_score'] == (5 + 40) / 2
+    assert stats['avg_doc_fetches'] == 2
+    assert set(categorized['by_language']) == {'maven', 'gradle'}
+
+
+def test_sync_drops_deleted_results_and_counts_unvalidated_as_pending(tmp_path):
+    write_result(tmp_path, 'a', 'passed', total=100)
+    gone = write_result(tmp_path, 'b', 'timeout')
+    write_result(tmp_path, 'c', None)
+    with SummaryState(tmp_path) as state:
+        state.sync()
+        assert state.totals['by_status'] == {'passed': 1, 'failed': 0, 'pending': 2}
+
+    gone.unlink()
+    with SummaryState(tmp_path) as state:
+        state.sync()
+        categorized = state.categorize()
+    assert categorized == rebuilt(tmp_path)
+    assert categorized['by_status'] == {'passed': 1, 'failed': 0, 'pending': 1}
+    assert [result['scenario'] for result in categorized['all_results']] == ['a', 'c']
+
+
+def test_unchanged_results_are_not_reread(tmp_path, monkeypatch):
+    write_result(tmp_path, 'a', 'passed', total=80)
+    with SummaryState(tmp_path) as state:
+        state.sync()
+
+    def fail(result_files, fields):
+        assert not result_files, 'unchanged result was read again'
+        return []
+
+    monkeypatch.setattr(generate_summary, 'load_results_projected', fail)
+    with SummaryState(tmp_path) as state:
+        state.sync()
+        assert not state.dirty
+
+
+def test_state_from_another_version_is_rebuilt(tmp_path):
+    write_result(tmp_path, 'a', 'passed', total=80)
+    with SummaryState(tmp_path) as state:
+        state.sync()
+    state_file = tmp_path / generate_summary.SUMMARY_STATE_FILE
+    state_file.write_text(json.dumps({'version': -1, 'totals': {}, 'files': {}}))
+    with SummaryState(tmp_path) as state:
+        assert not state.loaded
+        state.sync()
+        assert state.totals['total'] == 1
+
+
+def test_add_result_appends_one_log_line_without_rewriting_the_snapshot(tmp_path):
+    for name in 'abc':
+        write_result(tmp_path, name, 'passed', total=90)
+    with SummaryState(tmp_path) as state:
+        state.sync()
+    state_file = tmp_path / generate_summary.SUMMARY_STATE_FILE
+    log_file = tmp_path / generate_summary.SUMMARY_LOG_FILE
+    snapshot = state_file.read_bytes()
+    assert log_file.read_text() == ''
+
+    changed = write_result(tmp_path, 'b', 'failed', total=5)
+    added = write_result(tmp_path, 'd', 'failed', language='gradle')
+    for result_file in (changed, added):
+        with SummaryState(tmp_path) as state:
+            state.add_result(result_file)
+    assert state_file.read_bytes() == snapshot
+    assert [json.loads(line)['file'] for line in log_file.read_text().splitlines()] == [
+        str(changed.relative_to(tmp_path)), str(added.relative_to(tmp_path))]
+
+    with SummaryState(tmp_path) as state:
+        categorized = state.categorize()
+    assert categorized == rebuilt(tmp_path)
+
+
+def test_log_is_compacted_into_the_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(generate_summary, 'SUMMARY_LOG_MIN_ENTRIES', 2)
+    first = write_result(tmp_path, 'a', 'passed', total=90)
+    with SummaryState(tmp_path) as state:
+        state.sync()
+    log_file = tmp_path / generate_summary.SUMMARY_LOG_FILE
+    for total in (10, 200, 30):
+        write_result(tmp_path, 'a', 'failed', total=total)
+        with SummaryState(tmp_path) as state:
+            state.add_result(first)
+    # Two changes stay in the log; the third one folds them all into the snapshot
+    assert log_file.read_text() == ''
+    with SummaryState(tmp_path) as state:
+        assert state.totals['score_sum'] == 30
+        categorized = state.categorize()
+    assert categorized == rebuilt(tmp_path)
+
+
+def test_interrupted_log_append_is_ignored(tmp_path):
+    write_result(tmp_path, 'a', 'passed', total=90)
+    with SummaryState(tmp_path) as state:
+        state.sync()
+    second = write_result(tmp_path, 'b', 'failed', total=20)
+    with SummaryState(tmp_path) as state:
+        state.add_result(second)
+    log_file = tmp_path / generate_summary.SUMMARY_LOG_FILE
+    with open(log_file, 'a') as f:
+        f.write('{"file": "cut sh')
+    with SummaryState(tmp_path) as state:
+        assert state.totals['total'] == 2
+        assert state.totals['by_status'] == {'passed': 1, 'failed': 1, 'pending': 0}
@@ -0,0 +1,61 @@
+"""Tests for copying shard results in merge-shards.py"""
+
+import json
+
+from conftest import load_script
+from result_loader import load_result, load_validation_sidecar, write_validation_sidecar
+from transcript_extractor import extract_transcript, load_extract, save_extract
+
+merge_shards = load_script('merge-shards')
+
+
+def make_shard_result(model_dir):
+    workspace = model_dir / '.workspace-github-actions-cloud-4242'
+    workspace.mkdir(parents=True)
+    (workspace / 'agent-output.txt').write_text('🔧 Using skill: project-detection\nWhich key?\n')
+    save_extract(extract_transcript(workspace / 'agent-output.txt'), workspace / 'transcript.json')
+    result_file = workspace / 'result.json'
+    result_file.write_text(json.dumps({
+        'scenario': 'github-actions-cloud', 'language': 'maven', 'status': 'success',
+        'execution': {
+            'workspace': str(workspace),
+            'agent_output': str(workspace / 'agent-output.txt'),
+            'transcript_extract': str(workspace / 'transcript.json'),
+        },
+    }))
+    write_validation_sidecar(result_file, {'scores': {'total': 70}, 'status': 'FAILED'})
+    return result_file
+
+
+def test_merged_workspace_paths_point_at_the_merged_copy(tmp_path):
+    make_shard_result(tmp_path / 'shard-1' / 'model')
+    output_dir = tmp_path / 'merged' / 'model'
+    assert merge_shards.merge_model_dir(tmp_path / 'shard-1' / 'model', output_dir) == ['maven/github-actions-cloud']
+
+    merged_workspace = output_dir / '.workspace-github-actions-cloud-4242'
+    result = load_result(merged_workspace / 'result.json')
+    assert result['execution'] == {
+        'workspace': str(merged_workspace.resolve()),
+        'agent_output': str(merged_workspace.resolve() / 'agent-output.txt'),
+        'transcript_extract': str(merged_workspace.resolve() / 'transcript.json'),
+    }
+    # The copied validation still applies to the rewritten result
+    assert result['status'] == 'failed' and result['scores'] == {'total': 70}
+    document = load_extract(merged_workspace / 'transcript.json')
+    assert document['source'] == str(merged_workspace.resolve() / 'agent-output.txt')
+
+
+def test_paths_outside_the_workspace_are_kept(tmp_path):
+    result_file = make_shard_result(tmp_path / 'shard-1' / 'model')
+    result = json.loads(result_file.read_text())
+    result['execution']['agent_output'] = '/elsewhere/agent-output.txt'
+    result_file.write_text(json.dumps(result))
+    output_dir = tmp_path / 'merged' / 'model'
+    merge_shards.merge_model_dir(tmp_path / 'shard-1' / 'model', output_dir)
+
+    merged = output_dir / '.workspace-github-actions-cloud-4242' / 'result.json'
+    execution = json.loads(merged.read_text())['execution']
+    assert execution['agent_output'] == '/elsewhere/agent-output.txt'
+    assert execution['workspace'] == str(merged.parent.resolve())
+    # The source sidecar was stale (the result was rewritten after it), so it stays stale
+    assert load_validation_sidecar(merged) is None
@@ -0,0 +1,90 @@
+"""Tests for the result file helpers in result_loader.py"""
+
+import json
+import os
+
+import pytest
+
+import result_loader
+from result_loader import load_result_fields, report_status
+
+
+def write_result(tmp_path, text):
+    result_file = tmp_path / 'result.json'
+    result_file.write_text(text)
+    return result_file
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 64, 1 << 20])
+def test_projection_matches_full_decode(tmp_path, monkeypatch, chunk_size):
+    monkeypatch.setattr(result_loader, 'PROJECTION_CHUNK_SIZE', chunk_size)
+    result = {
+        'files_created': {'a.yml': 'say "hi" \\' * 5, 'b\\"c': ['}', ']', '{', '"']},
+        'scenario': 'quote "inside" and \\\\ backslashes \\',
+        'execution': {'duration_seconds': 12.5, 'nested': [[], {}, [1, {'x': '"}'}]]},
+        'status': 'passed',
+        'timestamp': None,
+        'flags': [True, False, -1e-3],
+    }
+    result_file = write_result(tmp_path, json.dumps(result, indent=2))
+    fields = ('scenario', 'execution', 'status', 'timestamp', 'flags', 'missing')
+    assert load_result_fields(result_file, fields) == {key: result[key] for key in fields if key in result}
+
+
+@pytest.mark.parametrize('chunk_size', [1, 4, 1 << 20])
+def test_escaped_quote_before_key_does_not_end_string(tmp_path, monkeypatch, chunk_size):
+    monkeypatch.setattr(result_loader, 'PROJECTION_CHUNK_SIZE', chunk_size)
+    # A skipped value that looks like it ends the object if the escaped quotes are missed
+    text = '{"log": "\\", \\"status\\": \\"failed\\"}\\\\", "status": "passed"}'
+    result_file = write_result(tmp_path, text)
+    assert load_result_fields(result_file, ('status',)) == {'status': 'passed'}
+
+
+def test_empty_object(tmp_path):
+    result_file = write_result(tmp_path, ' { } ')
+    assert load_result_fields(result_file, ('status',)) == {}
+
+
+@pytest.mark.parametrize('text', ['{"status": "passed"', '{"status" "passed"}', '{"log": "open', '[1, 2]'])
+def test_malformed_json_raises(tmp_path, text):
+    result_file = write_result(tmp_path, text)
+    with pytest.raises(ValueError):
+        load_result_fields(result_file, ('status',))
+
+
+def test_sidecar_overrides_projected_fields(tmp_path):
+    result_file = write_result(tmp_path, json.dumps({'status': 'success', 'scenario': 's'}))
+    result_loader.write_validation_sidecar(result_file, {'scores': {'total': 80}, 'status': 'FAILED'})
+    assert load_result_fields(result_file, ('status', 'scenario', 'scores')) == {
+        'status': 'failed', 'scenario': 's', 'scores': {'total': 80}}
+
+
+def test_sidecar_of_rewritten_result_is_ignored(tmp_path):
+    result_file = write_result(tmp_path, json.dumps({'status': 'success'}))
+    result_loader.write_validation_sidecar(result_file, {'scores': {'total': 80}, 'status': 'PASSED'})
+    assert result_loader.load_validation_sidecar(result_file)['status'] == 'passed'
+
+    # A re-run writing a result of the same size
+    st = result_file.stat()
+    result_file.write_text(json.dumps({'status': 'timeout'}))
+    os.utime(result_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1000))
+    assert result_file.stat().st_size == st.st_size
+    assert result_loader.load_validation_sidecar(result_file) is None
+    assert load_result_fields(result_file, ('status',)) == {'status': 'timeout'}
+
+
+def test_unchanged_sidecar_is_not_rewritten(tmp_path):
+    result_file = write_result(tmp_path, json.dumps({'status': 'success'}))
+    validation = {'scores': {'total': 80}, 'status': 'PASSED'}
+    result_loader.write_validation_sidecar(result_file, validation)
+    signature = result_loader.result_signature(result_file)
+    result_loader.write_validation_sidecar(result_file, validation)
+    assert result_loader.result_signature(result_file) == signature
+
+
+@pytest.mark.parametrize('status, expected', [
+    ('passed', 'passed'), ('failed', 'failed'), ('success', 'pending'), ('timeout', 'pending'), (None, 'pending'),
+])
+def test_report_status(status, expected):
+    assert report_status(status) == expected
+
@@ -0,0 +1,54 @@
+"""Tests for the duration-balanced sharding in schedule-scenarios.py"""
+
+import argparse
+from pathlib import Path
+
+import pytest
+
+from conftest import load_script
+
+schedule_scenarios = load_script('schedule-scenarios')
+
+
+def planned(estimates):
+    files = [Path(f'scenarios/{key}.yaml') for key in estimates]
+    return schedule_scenarios.schedule(files, {schedule_scenarios.scenario_key(path): value
+                                               for path, value in zip(files, estimates.values())})
+
+
+def test_schedule_is_longest_first_and_stable():
+    plan = planned({'maven/a': 10.0, 'gradle/b': 30.0, 'maven/c': 10.0, 'dotnet/d': 20.0})
+    assert [schedule_scenarios.scenario_key(path) for _, path in plan] == ['gradle/b', 'dotnet/d', 'maven/a', 'maven/c']
+
+
+def test_shards_partition_scenarios_with_lpt_balance():
+    plan = planned({'maven/a': 7.0, 'maven/b': 6.0, 'maven/c': 5.0, 'maven/d': 4.0, 'maven/e': 3.0, 'maven/f': 2.0})
+    shards = [schedule_scenarios.shard(plan, index, 3) for index in (1, 2, 3)]
+    keys = [[schedule_scenarios.scenario_key(path) for _, path in part] for part in shards]
+    # Longest first onto the least loaded shard: 7+2, 6+3, 5+4
+    assert keys == [['maven/a', 'maven/f'], ['maven/b', 'maven/e'], ['maven/c', 'maven/d']]
+    assert sorted(key for part in keys for key in part) == sorted(f'maven/{c}' for c in 'abcdef')
+
+
+def test_shard_assignment_ignores_input_order():
+    estimates = {'maven/a': 5.0, 'gradle/b': 5.0, 'dotnet/c': 5.0, 'maven/d': 1.0}
+    plan = planned(estimates)
+    for index in (1, 2):
+        assert schedule_scenarios.shard(plan, index, 2) == schedule_scenarios.shard(list(reversed(plan)), index, 2)
+
+
+def test_more_shards_than_scenarios():
+    plan = planned({'maven/a': 1.0})
+    assert schedule_scenarios.shard(plan, 1, 3) == plan
+    assert schedule_scenarios.shard(plan, 3, 3) == []
+
+
+@pytest.mark.parametrize('spec, expected', [('1/1', (1, 1)), ('2/4', (2, 4))])
+def test_parse_shard(spec, expected):
+    assert schedule_scenarios.parse_shard(spec) == expected
+
+
+@pytest.mark.parametrize('spec', ['0/2', '3/2', '1/0', 'x/2', '1'])
+def test_parse_shard_rejects_invalid_specs(spec):
+    with pytest.raises(argparse.ArgumentTypeError):
+        schedule_scenarios.parse_shard(spec)
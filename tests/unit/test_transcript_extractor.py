@@ -0,0 +1,149 @@
+"""Tests for transcript_extractor.py"""
+
+import pytest
+
+import transcript_extractor
+from transcript_extractor import NO_SKILL, extract_transcript, scan_transcript, skill_timeline
+
+TRANSCRIPT = """# Session
+<sub>⏱️ 0s</sub>
+Looking at the repo
+<sub>⏱️ 10s</sub>
+🔧 Using skill: project-detection
+found maven
+<sub>⏱️ 25s</sub>
+🔧 Using skill: project-detection
+still detecting
+<sub>⏱️ 40s</sub>
+🔧 Using skill: pipeline-creation
+writing the pipeline
+<sub>⏱️ 1m 40s</sub>
+done
+"""
+
+
+def stamp(seconds, offset, kind='elapsed'):
+    return {'kind': kind, 'seconds': seconds, 'line': 0, 'offset': offset}
+
+
+def mention(skill, offset, source='announcement'):
+    return {'skill': skill, 'source': source, 'line': 0, 'offset': offset}
+
+
+def document(stamps, mentions, size=1000):
+    return {'size': size, 'timestamps': stamps, 'skills': {'mentions': mentions}}
+
+
+def test_timeline_of_extracted_transcript(tmp_path):
+    transcript = tmp_path / 'session.md'
+    transcript.write_text(TRANSCRIPT)
+    timeline = skill_timeline(extract_transcript(transcript), total_tokens=1000)
+
+    assert timeline['clock'] == 'elapsed'
+    assert timeline['total_seconds'] == 100.0
+    segments = timeline['segments']
+    # Repeated announcements of the same skill stay one segment
+    assert [(s['skill'], s['start_seconds'], s['seconds']) for s in segments] == [
+        (NO_SKILL, 0.0, 10.0), ('project-detection', 10.0, 30.0), ('pipeline-creation', 40.0, 60.0)]
+    assert sum(s['bytes'] for s in segments) == len(TRANSCRIPT.encode())
+    assert abs(sum(s['tokens'] for s in segments) - 1000) <= len(segments)
+
+
+def test_no_agent_segment_when_first_skill_precedes_first_timestamp():
+    doc = document([stamp(5.0, 100), stamp(65.0, 900)], [mention('project-detection', 50)])
+    timeline = skill_timeline(doc)
+    assert [(s['skill'], s['seconds'], s['tokens']) for s in timeline['segments']] == [('project-detection', 60.0, None)]
+
+
+def test_file_reads_are_used_without_announcements():
+    doc = document([stamp(0.0, 0), stamp(10.0, 400), stamp(30.0, 800)],
+                   [mention('prerequisites-gathering', 300, 'file'), mention('scanner-cli', 700, 'file')])
+    segments = skill_timeline(doc)['segments']
+    assert [(s['skill'], s['seconds']) for s in segments] == [
+        (NO_SKILL, 0.0), ('prerequisites-gathering', 10.0), ('scanner-cli', 20.0)]
+
+
+def test_elapsed_markers_win_over_clock_times():
+    doc = document([stamp(1000.0, 0, 'clock'), stamp(0.0, 10), stamp(1e6, 500, 'clock'), stamp(8.0, 900)],
+                   [mention('devops-setup-instructions', 5)])
+    timeline = skill_timeline(doc)
+    assert timeline['clock'] == 'elapsed'
+    assert timeline['total_seconds'] == 8.0
+
+
+def test_too_few_timestamps():
+    assert skill_timeline(document([stamp(3.0, 10)], [mention('project-detection', 5)])) is None
+    assert skill_timeline(document([], [])) is None
+
+
+SCANNED = """🔧 Using skill: project-detection
+Which SonarQube instance do you use?
+## Platform OUTPUT CONTRACT
+platform: github-actions
+
+Do you use a monorepo?
+🔧 Using skill: prerequisites-gathering
+What is your project key?
+And your organization?
+🔧 Using skill: project-detection
+see https://docs.sonarsource.com/?q=1
+## Scanner Output Contract
+scanner: maven
+no question here"""
+
+SCAN_FIELDS = ('size', 'platform_contract', 'scanner_contract', 'batched_questions')
+
+
+@pytest.mark.parametrize('chunk_size', [1, 40, 1 << 20])
+def test_scan_agrees_with_full_extraction(tmp_path, monkeypatch, chunk_size):
+    monkeypatch.setattr(transcript_extractor, 'TRANSCRIPT_CHUNK_SIZE', chunk_size)
+    transcript = tmp_path / 'agent-output.txt'
+    transcript.write_text(SCANNED)
+    full = extract_transcript(transcript)
+    scan = scan_transcript(transcript)
+
+    assert {key: scan[key] for key in SCAN_FIELDS} == {key: full[key] for key in SCAN_FIELDS}
+    assert scan['skills']['announced'] == full['skills']['announced'] == ['project-detection', 'prerequisites-gathering']
+    assert scan['contract_types'] == ['platform', 'scanner']
+    assert scan['question_lines'] == sum(block['count'] for block in full['questions']) == 5
+    assert scan['question_blocks'] == len(full['questions']) == 4
+
+
+def test_scan_of_sequential_questions(tmp_path):
+    transcript = tmp_path / 'agent-output.txt'
+    transcript.write_text('Which instance?\nok\nWhich key?\n')
+    scan = scan_transcript(transcript)
+    assert (scan['question_lines'], scan['question_blocks'], scan['batched_questions']) == (2, 2, False)
+    assert scan['contract_types'] == []
+
+
+def test_scan_of_missing_and_empty_transcripts(tmp_path):
+    assert scan_transcript(tmp_path / 'missing.txt') is None
+    empty = tmp_path / 'empty.txt'
+    empty.write_text('')
+    scan = scan_transcript(empty)
+    assert scan['size'] == 0 and scan['skills']['announced'] == [] and not scan['batched_questions']
+
+
+def test_scan_memory_is_bounded_by_chunk_size(tmp_path):
+    """Six chunks of question lines: peak memory stays within a few chunks and the scan does not grow"""
+    import tracemalloc
+
+    line = b'Which SonarQube instance and project key do you use? ' + b'x' * 64 + b'\n'
+    transcript = tmp_path / 'agent-output.txt'
+    with open(transcript, 'wb') as f:
+        for _ in range(6):
+            f.write(line * (transcript_extractor.TRANSCRIPT_CHUNK_SIZE // len(line)))
+    small = tmp_path / 'small.txt'
+    small.write_bytes(line * 10)
+
+    tracemalloc.start()
+    try:
+        scan = scan_transcript(transcript)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < 4 * transcript_extractor.TRANSCRIPT_CHUNK_SIZE
+    assert scan['question_blocks'] == 1 and scan['batched_questions']
+    assert set(scan) == set(scan_transcript(small))
+    assert len(repr(scan)) - len(repr(scan_transcript(small))) < 100